@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+Measures how many request contexts per second can be copied, elevated,
+serialized for RPC and checked against policy, and how much memory is held
+by what each operation returns, using a context with a Keystone sized service
+catalog.
+"""
+import sys
+import time
+
+from oslo_config import cfg
+
+from designate import context
+from designate import policy
+from designate import rpc
+
+
+cfg.CONF.register_cli_opts([
+    cfg.IntOpt("iterations", default=10000,
+               help="Times to run each operation."),
+    cfg.IntOpt("services", default=20,
+               help="Services in the catalog of the context."),
+])
+
+
+def _catalog(services):
+    return [{
+        'type': 'service-%d' % i,
+        'name': 'service-%d' % i,
+        'endpoints': [{
+            'region': 'region-%d' % r,
+            'publicURL': 'http://public-%d.example.com:%d/v2' % (r, i),
+            'internalURL': 'http://internal-%d.example.com:%d/v2' % (r, i),
+            'adminURL': 'http://admin-%d.example.com:%d/v2' % (r, i),
+        } for r in range(3)],
+    } for i in range(services)]
+
+
+def _allocated(func, iterations):
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [func() for _ in range(iterations)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    del results
+
+    return (sum(s.size_diff for s in stats) / iterations,
+            sum(s.count_diff for s in stats) / float(iterations))
+
+
+def _run(name, func, iterations):
+    start = time.time()
+    for _ in range(iterations):
+        func()
+    elapsed = time.time() - start
+
+    allocated = _allocated(func, min(iterations, 1000))
+    if allocated is None:
+        print("%-20s %10.0f/s" % (name, iterations / elapsed))
+    else:
+        print("%-20s %10.0f/s %10.0f bytes %8.1f blocks held each" %
+              ((name, iterations / elapsed) + allocated))
+
+
+if __name__ == '__main__':
+    cfg.CONF(sys.argv[1:], project="designate")
+    policy.init()
+
+    ctxt = context.DesignateContext(
+        user='12345', tenant='54321', roles=['member'],
+        service_catalog=_catalog(cfg.CONF.services))
+    serializer = rpc.RequestContextSerializer(None)
+
+    iterations = cfg.CONF.iterations
+
+    _run('deepcopy', ctxt.deepcopy, iterations)
+    _run('elevated', ctxt.elevated, iterations)
+    _run('to_dict', ctxt.to_dict, iterations)
+    _run('serialize_context',
+         lambda: serializer.serialize_context(ctxt), iterations)
+    _run('policy check',
+         lambda: policy.check('get_domain', ctxt, {'tenant_id': '54321'}),
+         iterations)
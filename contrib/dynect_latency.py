@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+Times creating and deleting zones through the DynECT backend against a local
+fake DynECT server with simulated API latency and job durations.
+"""
+import sys
+import time
+import uuid
+
+import eventlet
+eventlet.monkey_patch()
+
+from oslo_config import cfg  # noqa
+from oslo_log import log as logging  # noqa
+
+from designate import objects  # noqa
+from designate import utils  # noqa
+from designate.backend import impl_dynect  # noqa
+from designate.tests.test_backend import fake_dynect  # noqa
+
+
+cfg.CONF.register_cli_opts([
+    cfg.IntOpt("zones", default=50, help="Zones to create and delete."),
+    cfg.FloatOpt("latency", default=0.05,
+                 help="Seconds the fake server takes to answer a request."),
+    cfg.FloatOpt("job-duration", default=0.5,
+                 help="Seconds the fake server takes to complete a job."),
+])
+
+LOG = logging.getLogger(__name__)
+
+
+def _time(func, *args):
+    start = time.time()
+    results = func(*args)
+    errors = [r for r in results if r is not None]
+    return time.time() - start, errors
+
+
+if __name__ == '__main__':
+    logging.register_options(cfg.CONF)
+    utils.register_plugin_opts()
+    cfg.CONF(sys.argv[1:], project="designate")
+    logging.setup(cfg.CONF, "designate")
+
+    server = fake_dynect.FakeDynECTServer(
+        cfg.CONF.latency, cfg.CONF.job_duration)
+    server.start()
+
+    target = objects.PoolTarget.from_dict({
+        'id': str(uuid.uuid4()),
+        'type': 'dynect',
+        'masters': [{'host': '192.0.2.1', 'port': 53}],
+        'options': [
+            {'key': 'username', 'value': 'example'},
+            {'key': 'password', 'value': 'secret'},
+            {'key': 'customer_name', 'value': 'customer'},
+            {'key': 'endpoint', 'value': server.endpoint}],
+    })
+    backend = impl_dynect.DynECTBackend(target)
+
+    domains = [objects.Domain(id=str(uuid.uuid4()),
+                              name='zone%d.example.com.' % i)
+               for i in range(cfg.CONF.zones)]
+
+    for action, func in [('create', backend.create_domains),
+                         ('delete', backend.delete_domains)]:
+        elapsed, errors = _time(func, None, domains)
+        print("%s %d zones: %.2fs (%.1f zones/s), %d errors, "
+              "%d jobs in flight at most" %
+              (action, len(domains), elapsed, len(domains) / elapsed,
+               len(errors), server.max_jobs_in_flight))
+
+    backend.stop()
+    print("logins: %d, logouts: %d, job polls: %d" %
+          (server.logins, server.logouts, server.polls))
+
+    server.stop()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+Measures how many pages of recordsets per second the v2 API adapters can
+render, using the compiled render plans and, for comparison, the previous
+rendering that re-read MODIFICATIONS and looked up adapters for every field
+of every object. Both must give the same output.
+"""
+import datetime
+import sys
+import time
+
+from oslo_config import cfg
+
+from designate import objects
+from designate.objects import adapters
+from designate.objects.adapters.api_v2 import base as api_v2_base
+
+
+cfg.CONF.register_cli_opts([
+    cfg.IntOpt("iterations", default=20,
+               help="Times to render the page."),
+    cfg.IntOpt("recordsets", default=1000,
+               help="Recordsets in the page."),
+    cfg.IntOpt("records", default=2,
+               help="Records in each recordset."),
+])
+
+ZONE_ID = 'a86dba58-0043-4cc6-a1bb-69d5e86f3ca3'
+
+
+class FakeRequest(object):
+    def __init__(self, path, GET=None):
+        self.path = path
+        self.GET = GET or {}
+        self.environ = {}
+        self.host_url = 'http://example.com:9001'
+
+
+def _recordsets(count, records):
+    now = datetime.datetime(2015, 1, 1, 12, 0, 0)
+
+    return objects.RecordSetList(objects=[objects.RecordSet(
+        id='0f3c5cd6-8b5b-4a6b-a1c6-%012d' % i,
+        domain_id=ZONE_ID,
+        name='host-%d.example.com.' % i,
+        type='A',
+        ttl=3600,
+        description=None,
+        status='ACTIVE',
+        action='NONE',
+        version=1,
+        created_at=now,
+        updated_at=None,
+        records=objects.RecordList(objects=[
+            objects.Record(data='192.0.%d.%d' % (i % 256, r))
+            for r in range(records)])) for i in range(count)])
+
+
+def _render(recordsets):
+    # The link prefixes are cached on the request, so each render gets a new
+    # one as an API request would
+    request = FakeRequest('/v2/zones/%s/recordsets' % ZONE_ID)
+    return adapters.DesignateAdapter.render(
+        'API_v2', recordsets, request=request)
+
+
+# The rendering the render plans replaced, kept here to compare against
+def _uncompiled_render(cls, format_, object, *args, **kwargs):
+    if isinstance(object, objects.ListObjectMixin):
+        return cls.get_object_adapter(
+            format_, object)._render_list(object, *args, **kwargs)
+    else:
+        return cls.get_object_adapter(
+            format_, object)._render_object(object, *args, **kwargs)
+
+
+def _uncompiled_render_object(cls, object, *args, **kwargs):
+    r_obj = {}
+    for key, value in cls.MODIFICATIONS['fields'].items():
+        field_props = cls.MODIFICATIONS['fields'][key]
+        if field_props.get('rename', False):
+            obj = getattr(object, field_props.get('rename'))
+            obj_key = field_props.get('rename')
+        else:
+            obj = getattr(object, key, None)
+            obj_key = key
+        if object.FIELDS.get(obj_key, {}).get('relation'):
+            r_obj[key] = cls.get_object_adapter(
+                cls.ADAPTER_FORMAT,
+                object.FIELDS[obj_key].get('relation_cls')).render(
+                    cls.ADAPTER_FORMAT, obj, *args, **kwargs)
+        else:
+            r_obj[key] = obj
+    return r_obj
+
+
+def _uncompiled_render_list(cls, list_object, *args, **kwargs):
+    r_list = []
+    for object in list_object:
+        r_list.append(cls.get_object_adapter(
+            cls.ADAPTER_FORMAT,
+            object).render(cls.ADAPTER_FORMAT, object, *args, **kwargs))
+    return {cls.MODIFICATIONS['options']['collection_name']: r_list}
+
+
+def _uncompiled_get_resource_links(cls, object, request):
+    return {'self': '%s%s/%s' % (cls._get_base_uri(request),
+                                 cls._get_path(request), object.id)}
+
+
+UNCOMPILED = [
+    (adapters.DesignateAdapter, 'render', _uncompiled_render),
+    (adapters.DesignateAdapter, '_render_object', _uncompiled_render_object),
+    (adapters.DesignateAdapter, '_render_list', _uncompiled_render_list),
+    (api_v2_base.APIv2Adapter, '_get_resource_links',
+     _uncompiled_get_resource_links),
+]
+
+
+def _uncompiled(func):
+    def wrapper():
+        saved = [(cls, name, cls.__dict__[name])
+                 for cls, name, _ in UNCOMPILED]
+        for cls, name, replacement in UNCOMPILED:
+            setattr(cls, name, classmethod(replacement))
+        try:
+            return func()
+        finally:
+            for cls, name, original in saved:
+                setattr(cls, name, original)
+
+    return wrapper
+
+
+def _run(name, func, iterations):
+    start = time.time()
+    for _ in range(iterations):
+        func()
+    elapsed = time.time() - start
+
+    print("%-20s %10.1f/s %10.2f ms each" %
+          (name, iterations / elapsed, elapsed * 1000 / iterations))
+
+
+if __name__ == '__main__':
+    cfg.CONF(sys.argv[1:], project="designate")
+
+    recordsets = _recordsets(cfg.CONF.recordsets, cfg.CONF.records)
+    uncompiled = _uncompiled(lambda: _render(recordsets))
+
+    if _render(recordsets) != uncompiled():
+        sys.exit("Render plans give different output to the previous"
+                 " rendering")
+
+    iterations = cfg.CONF.iterations
+
+    _run('uncompiled', uncompiled, iterations)
+    _run('render plans', lambda: _render(recordsets), iterations)
@@ -41,8 +41,11 @@ OPTS = [
     cfg.StrOpt('transfer-source', default=None,
                help='An IP address to be used to fetch zones transferred in'),
     cfg.FloatOpt('notify-delay', default=0.0,
-               help='Delay after a NOTIFY arrives for a zone that the Agent '
-               'will pause and drop subsequent NOTIFYs for that zone'),
+               help='Delay after a NOTIFY arrives for a zone before the Agent '
+               'transfers it, dropping subsequent NOTIFYs for that zone'),
+    cfg.IntOpt('serial-cache-ttl', default=300,
+               help='How long the Agent trusts its cached zone serials before '
+               'checking them against the backend again, in seconds'),
 ]
 
 cfg.CONF.register_opts(OPTS, group='service:agent')
@@ -13,18 +13,26 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import socket
+import time
+
 import dns
+import dns.exception
 import dns.opcode
+import dns.query
 import dns.rcode
+import dns.rdatatype
 import dns.message
 import dns.flags
 import dns.opcode
+import eventlet
 from oslo_config import cfg
 from oslo_log import log as logging
 
 from designate import utils
 from designate import dnsutils
 from designate.backend import agent_backend
+from designate.i18n import _LE
 from designate.i18n import _LW
 from designate.i18n import _LI
 
@@ -58,9 +66,20 @@ class RequestHandler(object):
 
         self.allow_notify = CONF['service:agent'].allow_notify
         self.transfer_source = CONF['service:agent'].transfer_source
+        self.notify_delay = CONF['service:agent'].notify_delay
         backend_driver = cfg.CONF['service:agent'].backend_driver
         self.backend = agent_backend.get_backend(backend_driver, self)
 
+        # Zones with a transfer queued or running, mapped to whether another
+        # NOTIFY has arrived since that transfer started.
+        self._transfers = {}
+
+        # Zone name to the serial on the backend, and when it was last
+        # checked against the backend.
+        self.serial_cache_ttl = CONF['service:agent'].serial_cache_ttl
+        self._serials = {}
+        self._load_serials()
+
     def __call__(self, request):
         """
         :param request: DNS Request Message
@@ -91,6 +110,44 @@ class RequestHandler(object):
         yield response
         raise StopIteration
 
+    def _load_serials(self):
+        serials = self.backend.find_domain_serials()
+
+        LOG.info(_LI("Loaded %(count)d zone serials from the backend") %
+                 {'count': len(serials)})
+
+        for domain_name, serial in serials.items():
+            self._cache_serial(domain_name, serial)
+
+    def _find_domain_serial(self, domain_name):
+        """
+        Find the serial of a zone on the backend, trusting the cached serial
+        for up to serial_cache_ttl seconds.
+        """
+        cached = self._serials.get(domain_name)
+        if cached is not None and \
+                time.time() - cached[1] < self.serial_cache_ttl:
+            return cached[0]
+
+        serial = self.backend.find_domain_serial(domain_name)
+        self._cache_serial(domain_name, serial)
+
+        return serial
+
+    def _cache_serial(self, domain_name, serial):
+        if serial is None:
+            self._serials.pop(domain_name, None)
+        else:
+            self._serials[domain_name] = (serial, time.time())
+
+    @staticmethod
+    def _zone_serial(zone):
+        rdataset = zone.get_rdataset(zone.origin, dns.rdatatype.SOA)
+        if rdataset is None:
+            return None
+
+        return rdataset[0].serial
+
     def _handle_query_error(self, request, rcode):
         """
         Construct an error response with the rcode passed in.
@@ -114,7 +171,7 @@ class RequestHandler(object):
             response.set_rcode(dns.rcode.from_text("REFUSED"))
             return response
 
-        serial = self.backend.find_domain_serial(domain_name)
+        serial = self._find_domain_serial(domain_name)
 
         if serial is not None:
             LOG.warn(_LW("Not creating %(name)s, zone already exists") %
@@ -130,6 +187,7 @@ class RequestHandler(object):
             zone = dnsutils.do_axfr(domain_name, self.masters,
                 source=self.transfer_source)
             self.backend.create_domain(zone)
+            self._cache_serial(domain_name, self._zone_serial(zone))
         except Exception:
             response.set_rcode(dns.rcode.from_text("SERVFAIL"))
             return response
@@ -158,7 +216,7 @@ class RequestHandler(object):
             response.set_rcode(dns.rcode.from_text("REFUSED"))
             return response
 
-        serial = self.backend.find_domain_serial(domain_name)
+        serial = self._find_domain_serial(domain_name)
 
         if serial is None:
             LOG.warn(_LW("Refusing NOTIFY for %(name)s, doesn't exist") %
@@ -169,27 +227,98 @@ class RequestHandler(object):
         LOG.debug("Received %(verb)s for %(name)s from %(host)s" %
                  {'verb': "NOTIFY", 'name': domain_name, 'host': requester})
 
-        # According to RFC we should query the server that sent the NOTIFY
-        # TODO(Tim): Reenable this when it makes more sense
-        # resolver = dns.resolver.Resolver()
-        # resolver.nameservers = [requester]
-        # This assumes that the Master is running on port 53
-        # soa_answer = resolver.query(domain_name, 'SOA')
-        # Check that the serial is < serial above
+        if domain_name in self._transfers:
+            # Rather than starting another transfer, have the one in flight
+            # check the serial again once it's done.
+            LOG.debug("Transfer for %s already in progress" % domain_name)
+            self._transfers[domain_name] = True
 
-        try:
-            zone = dnsutils.do_axfr(domain_name, self.masters,
-                source=self.transfer_source)
-            self.backend.update_domain(zone)
-        except Exception:
-            response.set_rcode(dns.rcode.from_text("SERVFAIL"))
-            return response
+        elif self.notify_delay > 0:
+            # Wait out the delay before transferring, so any NOTIFYs which
+            # arrive in the meantime are picked up by the same transfer.
+            self._transfers[domain_name] = False
+            eventlet.spawn_after(self.notify_delay, self._deferred_transfer,
+                                 domain_name, serial)
+
+        else:
+            self._transfers[domain_name] = False
+            try:
+                self._transfer(domain_name, serial)
+            except Exception:
+                response.set_rcode(dns.rcode.from_text("SERVFAIL"))
+                return response
 
         # Provide an authoritative answer
         response.flags |= dns.flags.AA
 
         return response
 
+    def _transfer(self, domain_name, serial):
+        """
+        Transfer a zone in from the masters, unless they have no newer
+        serial, repeating if more NOTIFYs arrive while transferring.
+
+        :param domain_name: The name of the zone to transfer.
+        :param serial: The serial of the zone on the backend.
+        """
+        try:
+            while True:
+                self._transfers[domain_name] = False
+
+                master_serial = self._get_master_serial(domain_name)
+
+                # TODO(Tim): Account for serial number wrap around.
+                if master_serial is not None and serial is not None and \
+                        master_serial <= serial:
+                    LOG.debug("Not transferring %(name)s, serial %(serial)s "
+                              "is up to date" %
+                              {'name': domain_name, 'serial': serial})
+                else:
+                    zone = dnsutils.do_axfr(domain_name, self.masters,
+                        source=self.transfer_source)
+                    self.backend.update_domain(zone)
+
+                    serial = self._zone_serial(zone)
+                    self._cache_serial(domain_name, serial)
+
+                if not self._transfers[domain_name]:
+                    break
+        finally:
+            del self._transfers[domain_name]
+
+    def _deferred_transfer(self, domain_name, serial):
+        try:
+            self._transfer(domain_name, serial)
+        except Exception:
+            LOG.exception(_LE("Failed to transfer %(name)s") %
+                          {'name': domain_name})
+
+    def _get_master_serial(self, domain_name):
+        """
+        Ask the masters for the serial of a zone.
+
+        :return: The serial, or None if no master answered.
+        """
+        query = dns.message.make_query(domain_name, dns.rdatatype.SOA)
+
+        for master in self.masters:
+            try:
+                response = dns.query.udp(
+                    query, master['ip'], port=master['port'], timeout=1,
+                    source=self.transfer_source)
+            except (dns.exception.DNSException, socket.error):
+                LOG.debug("Failed to get the serial of %(name)s from "
+                          "%(ip)s:%(port)s" % {'name': domain_name,
+                                               'ip': master['ip'],
+                                               'port': master['port']})
+                continue
+
+            for rrset in response.answer:
+                if rrset.rdtype == dns.rdatatype.SOA:
+                    return rrset[0].serial
+
+        return None
+
     def _handle_delete(self, request):
         """
         Constructs the response to a DELETE and acts accordingly on it.
@@ -209,7 +338,7 @@ class RequestHandler(object):
             response.set_rcode(dns.rcode.from_text("REFUSED"))
             return response
 
-        serial = self.backend.find_domain_serial(domain_name)
+        serial = self._find_domain_serial(domain_name)
 
         if serial is None:
             LOG.warn(_LW("Not deleting %(name)s, zone doesn't exist") %
@@ -227,6 +356,7 @@ class RequestHandler(object):
         # Call into the backend to Delete
         try:
             self.backend.delete_domain(domain_name)
+            self._cache_serial(domain_name, None)
         except Exception:
             response.set_rcode(dns.rcode.from_text("SERVFAIL"))
             return response
@@ -22,7 +22,8 @@ cfg.CONF.register_group(cfg.OptGroup(
 
 cfg.CONF.register_opts([
     cfg.IntOpt('workers', default=None,
-               help='Number of api worker processes to spawn'),
+               help='Number of api worker processes to spawn, defaults to '
+                    'one per CPU'),
     cfg.IntOpt('threads', default=1000,
                help='Number of api greenthreads to spawn'),
     cfg.BoolOpt('enable-host-header', default=False,
@@ -40,6 +41,21 @@ cfg.CONF.register_opts([
     cfg.BoolOpt('enable-api-v1', default=True),
     cfg.BoolOpt('enable-api-v2', default=False),
     cfg.BoolOpt('enable-api-admin', default=False),
+    cfg.IntOpt('stream-page-size', default=100,
+               help='Large collection listings are streamed to the client, '
+                    'reading this many items from storage at a time. 0 '
+                    'disables streaming'),
+    cfg.StrOpt('export-cache-dir', default=None,
+               help='Directory to keep zone exports in, gzip compressed, '
+                    'so they are only fetched from the zone manager once '
+                    'for each version of a zone. Not set disables the '
+                    'cache'),
+    cfg.IntOpt('graceful-shutdown-timeout', default=30,
+               help='Seconds a stopping api worker waits for the requests '
+                    'it is handling to finish'),
+    cfg.IntOpt('metrics-interval', default=60,
+               help='Seconds between each api worker logging its request '
+                    'counts. 0 disables'),
     cfg.IntOpt('max_header_line', default=16384,
                help="Maximum line size of message headers to be accepted. "
                     "max_header_line may need to be increased when using "
@@ -13,6 +13,8 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import zlib
+
 import flask
 import webob.dec
 from oslo_config import cfg
@@ -27,6 +29,7 @@ from designate import exceptions
 from designate import notifications
 from designate import context
 from designate import objects
+from designate import utils
 from designate.objects.adapters import DesignateAdapter
 from designate.i18n import _LI
 from designate.i18n import _LW
@@ -50,7 +53,14 @@ cfg.CONF.register_opts([
                default=None,
                help="A scheme that will be used to override "
                     "the request protocol scheme, even if it was "
-                    "set by an SSL terminating proxy.")
+                    "set by an SSL terminating proxy."),
+    cfg.IntOpt('compression-min-size', default=1024,
+               help='Responses smaller than this many bytes are not '
+                    'compressed. Responses of unknown length, such as '
+                    'streamed listings, are always compressed'),
+    cfg.IntOpt('compression-level', default=6,
+               help='zlib compression level, from 1 (fastest) to 9 '
+                    '(smallest)'),
 ], group='service:api')
 
 
@@ -388,3 +398,94 @@ class SSLMiddleware(base.Middleware):
             self.secure_proxy_ssl_header, request.environ['wsgi.url_scheme'])
         if self.override:
             request.environ['wsgi.url_scheme'] = self.override
+
+
+class CompressionMiddleware(base.Middleware):
+    """
+    Compresses responses with gzip or deflate, when the client accepts one
+    of them and the response is large enough to be worth it.
+
+    Responses of unknown length are compressed as they are sent, so streamed
+    responses stay streamed.
+    """
+    ENCODINGS = ['gzip', 'deflate']
+    COMPRESSIBLE_TYPES = ('application/json', 'text/')
+
+    def __init__(self, application):
+        super(CompressionMiddleware, self).__init__(application)
+
+        LOG.info(_LI('Starting designate compression middleware'))
+
+        self.min_size = cfg.CONF['service:api'].compression_min_size
+        self.level = cfg.CONF['service:api'].compression_level
+
+    @webob.dec.wsgify
+    def __call__(self, request):
+        response = request.get_response(self.application)
+
+        encoding = utils.get_accepted_encoding(
+            request.headers.get('Accept-Encoding'), self.ENCODINGS)
+
+        if encoding and self._compressible(request, response):
+            self._compress(response, encoding)
+
+        return response
+
+    def _compressible(self, request, response):
+        if request.method == 'HEAD' or response.status_int in (204, 206, 304):
+            return False
+
+        if response.content_encoding:
+            return False
+
+        if 'no-transform' in response.headers.get('Cache-Control', ''):
+            return False
+
+        content_type = response.content_type or ''
+        if not content_type.startswith(self.COMPRESSIBLE_TYPES):
+            return False
+
+        length = response.content_length
+        return length is None or length >= self.min_size
+
+    def _compressor(self, encoding):
+        # gzip is deflate with a gzip rather than a zlib header and trailer
+        wbits = 16 + zlib.MAX_WBITS if encoding == 'gzip' else zlib.MAX_WBITS
+
+        return zlib.compressobj(self.level, zlib.DEFLATED, wbits)
+
+    def _compress(self, response, encoding):
+        length = response.content_length
+
+        if length is None:
+            response.app_iter = self._compress_iter(
+                response.app_iter, self._compressor(encoding))
+        else:
+            compressor = self._compressor(encoding)
+            response.body = (compressor.compress(response.body) +
+                             compressor.flush())
+
+        response.content_encoding = encoding
+
+        vary = response.headers.get('Vary')
+        if not vary:
+            response.headers['Vary'] = 'Accept-Encoding'
+        elif 'accept-encoding' not in vary.lower():
+            response.headers['Vary'] = '%s, Accept-Encoding' % vary
+
+        # The compressed body is only equivalent to the uncompressed one
+        etag = response.headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            response.headers['ETag'] = 'W/%s' % etag
+
+    def _compress_iter(self, app_iter, compressor):
+        try:
+            for chunk in app_iter:
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+
+            yield compressor.flush()
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
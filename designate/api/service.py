@@ -19,8 +19,11 @@ from paste import deploy
 
 from designate.i18n import _LI
 from designate import exceptions
+from designate import rpc
 from designate import utils
 from designate import service
+from designate.central import rpcapi as central_rpcapi
+from designate.zone_manager import rpcapi as zone_manager_rpcapi
 
 
 LOG = logging.getLogger(__name__)
@@ -34,6 +37,15 @@ class Service(service.WSGIService, service.Service):
     def service_name(self):
         return 'api'
 
+    def start(self):
+        # Each worker talks to central over a transport of its own, rather
+        # than the connections of the process it was forked from.
+        if rpc.init_for_process(cfg.CONF):
+            central_rpcapi.CentralAPI.reset_instance()
+            zone_manager_rpcapi.ZoneManagerAPI.reset_instance()
+
+        super(Service, self).start()
+
     @property
     def _wsgi_application(self):
         api_paste_config = cfg.CONF['service:api'].api_paste_config
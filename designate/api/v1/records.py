@@ -14,6 +14,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import flask
+from oslo_config import cfg
 from oslo_log import log as logging
 
 from designate.central import rpcapi as central_rpcapi
@@ -92,9 +93,12 @@ def _format_record_v1(record, recordset):
     return record
 
 
-def _fetch_domain_recordsets(context, domain_id):
+def _fetch_domain_recordsets(context, domain_id, recordset_ids=None):
     criterion = {'domain_id': domain_id}
 
+    if recordset_ids is not None:
+        criterion['id'] = list(recordset_ids)
+
     central_api = central_rpcapi.CentralAPI.get_instance()
     recordsets = central_api.find_recordsets(context, criterion)
 
@@ -154,17 +158,55 @@ def get_records(domain_id):
     #       return an empty records array instead of a domain not found
     central_api.get_domain(context, domain_id)
 
-    records = central_api.find_records(context, {'domain_id': domain_id})
+    page_size = cfg.CONF['service:api'].stream_page_size
+    criterion = {'domain_id': domain_id}
+
+    if not page_size:
+        records = central_api.find_records(context, criterion)
+
+        recordsets = _fetch_domain_recordsets(context, domain_id)
+
+        def _inner(record):
+            recordset = recordsets[record['recordset_id']]
+            return _format_record_v1(record, recordset)
+
+        records = [_inner(r) for r in records]
+
+        return flask.jsonify(records_schema.filter({'records': records}))
+
+    # Read the first page now, so errors are returned before the response
+    # is started
+    records = central_api.find_records(
+        context, criterion, limit=page_size)
+
+    def _stream(records):
+        yield '{"records": ['
+
+        count = 0
+        while records:
+            # Only the recordsets of the records in this page are needed
+            recordsets = _fetch_domain_recordsets(
+                context, domain_id, set(r['recordset_id'] for r in records))
+
+            for record in records:
+                record = _format_record_v1(
+                    record, recordsets[record['recordset_id']])
+
+                yield ((', ' if count else '') +
+                       flask.json.dumps(record_schema.filter(record)))
+                count += 1
 
-    recordsets = _fetch_domain_recordsets(context, domain_id)
+            if len(records) < page_size:
+                break
 
-    def _inner(record):
-        recordset = recordsets[record['recordset_id']]
-        return _format_record_v1(record, recordset)
+            records = central_api.find_records(
+                context, criterion, marker=records[-1]['id'],
+                limit=page_size)
 
-    records = [_inner(r) for r in records]
+        yield ']}'
 
-    return flask.jsonify(records_schema.filter({'records': records}))
+    return flask.Response(flask.stream_with_context(_stream(records)),
+                          mimetype='application/json')
 
 
 @blueprint.route('/domains/<uuid:domain_id>/records/<uuid:record_id>',
@@ -37,6 +37,9 @@ class RecordSetsController(rest.RestController):
         request = pecan.request
         context = request.environ['context']
 
+        if self._domain_not_modified(context, zone_id):
+            return pecan.response
+
         return DesignateAdapter.render(
             'API_v2',
             self.central_api.get_recordset(
@@ -52,7 +55,8 @@ class RecordSetsController(rest.RestController):
 
         # NOTE: We need to ensure the domain actually exists, otherwise we may
         #       return deleted recordsets instead of a domain not found
-        self.central_api.get_domain(context, zone_id)
+        if self._domain_not_modified(context, zone_id):
+            return pecan.response
 
         # Extract the pagination params
         marker, limit, sort_key, sort_dir = utils.get_paging_params(
@@ -70,37 +74,52 @@ class RecordSetsController(rest.RestController):
         data = criterion.pop('data', None)
         status = criterion.pop('status', None)
 
-        # Retrieve recordsets
-        recordsets = self.central_api.find_recordsets(
-            context, criterion, marker, limit, sort_key, sort_dir)
-
         # 'data' filter param: only return recordsets with matching data
+        recordset_with_data_ids = None
         if data:
             records = self.central_api.find_records(
                 context, criterion={'data': data, 'domain_id': zone_id})
             recordset_with_data_ids = set(record.recordset_id
                                           for record in records)
 
-            new_rsets = RecordSetList()
+        def _filter(recordsets):
+            if recordset_with_data_ids is not None:
+                new_rsets = RecordSetList()
+
+                for recordset in recordsets:
+                    if recordset.id in recordset_with_data_ids:
+                        new_rsets.append(recordset)
+
+                recordsets = new_rsets
+                recordsets.total_count = len(recordset_with_data_ids)
 
-            for recordset in recordsets:
-                if recordset.id in recordset_with_data_ids:
-                    new_rsets.append(recordset)
+            # 'status' filter param: only return recordsets with matching
+            # status
+            if status:
+                new_rsets = RecordSetList()
 
-            recordsets = new_rsets
-            recordsets.total_count = len(recordset_with_data_ids)
+                for recordset in recordsets:
+                    if recordset.status == status:
+                        new_rsets.append(recordset)
 
-        # 'status' filter param: only return recordsets with matching status
-        if status:
-            new_rsets = RecordSetList()
+                recordsets = new_rsets
 
-            for recordset in recordsets:
-                if recordset.status == status:
-                    new_rsets.append(recordset)
+            return recordsets
 
-            recordsets = new_rsets
+        if self._should_stream(limit):
+            pages = self._find_pages(
+                self.central_api.find_recordsets, context, criterion,
+                marker, limit, sort_key, sort_dir)
 
-        return DesignateAdapter.render('API_v2', recordsets, request=request)
+            return self._render_stream(
+                RecordSetList, (_filter(page) for page in pages), request)
+
+        # Retrieve recordsets
+        recordsets = self.central_api.find_recordsets(
+            context, criterion, marker, limit, sort_key, sort_dir)
+
+        return DesignateAdapter.render(
+            'API_v2', _filter(recordsets), request=request)
 
     @pecan.expose(template='json:', content_type='application/json')
     @utils.validate_uuid('zone_id')
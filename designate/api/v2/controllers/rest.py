@@ -29,10 +29,12 @@ import inspect
 import pecan
 import pecan.rest
 import pecan.routing
+from oslo_config import cfg
 from oslo_log import log as logging
 
 from designate import exceptions
 from designate.central import rpcapi as central_rpcapi
+from designate.objects.adapters.api_v2.base import APIv2Adapter
 from designate.zone_manager import rpcapi as zone_manager_rpcapi
 from designate.i18n import _
 
@@ -72,6 +74,91 @@ class RestController(pecan.rest.RestController):
         else:
             return criterion
 
+    def _should_stream(self, limit):
+        """
+        Check if a listing of up to limit items is large enough to be read
+        and sent in pages, rather than rendered in one go.
+        """
+        page_size = cfg.CONF['service:api'].stream_page_size
+
+        return bool(page_size) and (limit is None or int(limit) > page_size)
+
+    def _find_pages(self, find, context, criterion, marker, limit,
+                    sort_key, sort_dir):
+        """
+        Read up to limit items from the find method, a page at a time.
+
+        The first page is read before returning, so errors such as an
+        invalid marker are raised before the response is started.
+        """
+        page_size = cfg.CONF['service:api'].stream_page_size
+        limit = int(limit) if limit is not None else None
+
+        def _page_limit(read):
+            if limit is None:
+                return page_size
+            return min(page_size, limit - read)
+
+        def _pages(page, page_limit):
+            read = 0
+            while True:
+                yield page
+
+                read += len(page)
+                if len(page) < page_limit or read == limit:
+                    return
+
+                page_limit = _page_limit(read)
+                page = find(context, criterion, page[-1].id, page_limit,
+                            sort_key, sort_dir)
+
+        page_limit = _page_limit(0)
+        return _pages(find(context, criterion, marker, page_limit,
+                           sort_key, sort_dir), page_limit)
+
+    def _render_stream(self, list_cls, pages, request):
+        response = pecan.response
+        response.content_type = 'application/json'
+        response.app_iter = APIv2Adapter.render_stream(
+            list_cls, pages, request=request)
+
+        return response
+
+    def _domain_etag(self, context, zone_id):
+        """
+        Set an ETag derived from the zone's serial and version, which change
+        whenever the zone or its recordsets do, on the response and return
+        it. Raises DomainNotFound if the zone does not exist.
+        """
+        # NOTE: This is looked up before the zone or recordsets are read, so
+        #       a change in between gives a stale ETag, which only costs the
+        #       client a full response next time.
+        domain = self.central_api.get_domain_version(context, zone_id)
+        etag = '%s-%s' % (domain.serial, domain.version)
+
+        pecan.response.etag = (etag, False)
+
+        return etag
+
+    def _domain_not_modified(self, context, zone_id):
+        """
+        Set the zone's ETag on the response.
+
+        Returns True, with the response made a 304 Not Modified, if the
+        request's If-None-Match matches it. Raises DomainNotFound if the zone
+        does not exist.
+        """
+        request = pecan.request
+        response = pecan.response
+
+        etag = self._domain_etag(context, zone_id)
+
+        if etag in request.if_none_match:
+            response.status_int = 304
+            return True
+
+        return False
+
     def _handle_post(self, method, remainder):
         '''
         Routes ``POST`` actions to the appropriate controller.
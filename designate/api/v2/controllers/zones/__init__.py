@@ -47,6 +47,9 @@ class ZonesController(rest.RestController):
         request = pecan.request
         context = request.environ['context']
 
+        if self._domain_not_modified(context, zone_id):
+            return pecan.response
+
         return DesignateAdapter.render(
             'API_v2',
             self.central_api.get_domain(context, zone_id),
@@ -67,6 +70,13 @@ class ZonesController(rest.RestController):
         criterion = self._apply_filter_params(
             params, accepted_filters, {})
 
+        if self._should_stream(limit):
+            pages = self._find_pages(
+                self.central_api.find_domains, context, criterion,
+                marker, limit, sort_key, sort_dir)
+
+            return self._render_stream(objects.DomainList, pages, request)
+
         return DesignateAdapter.render(
             'API_v2',
             self.central_api.find_domains(
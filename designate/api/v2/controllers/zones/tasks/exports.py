@@ -13,10 +13,16 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import base64
+import os
+
 import pecan
+from oslo_config import cfg
 from oslo_log import log as logging
 
+from designate import blob_store
 from designate import exceptions
+from designate import exportcache
 from designate import policy
 from designate import utils
 from designate.api.v2.controllers import rest
@@ -32,18 +38,139 @@ class ZoneExportController(rest.RestController):
     @pecan.expose(template=None, content_type='text/dns')
     @utils.validate_uuid('export_id')
     def get_all(self, export_id):
-        context = pecan.request.environ['context']
+        request = pecan.request
+        response = pecan.response
+        context = request.environ['context']
         policy.check('zone_export', context)
 
         export = self.central_api.get_zone_export(context, export_id)
 
-        if export.location and export.location.startswith('designate://'):
-            return self.zone_manager_api.\
-                render_zone(context, export['domain_id'])
-        else:
+        if export.location and export.location.startswith('blob://'):
+            return self._get_blob(context, export)
+
+        if not (export.location and
+                export.location.startswith('designate://')):
             msg = 'Zone can not be exported synchronously'
             raise exceptions.BadRequest(msg)
 
+        zone_id = export['domain_id']
+
+        etag = self._domain_etag(context, zone_id)
+        if etag in request.if_none_match:
+            response.status_int = 304
+            return response
+
+        # Exports come gzip compressed, so clients accepting gzip get them as
+        # they are.
+        response.content_type = 'text/dns'
+        response.headers['Vary'] = 'Accept-Encoding'
+
+        accept_encoding = request.headers.get('Accept-Encoding')
+        gzip_accepted = utils.get_accepted_encoding(accept_encoding, ['gzip'])
+
+        cache_dir = cfg.CONF['service:api'].export_cache_dir
+        if cache_dir:
+            cache = exportcache.ExportCache(cache_dir)
+
+            f = cache.open(zone_id, etag)
+            if f is None:
+                cache.store(zone_id, etag,
+                            self._export_chunks(context, zone_id),
+                            compressed=True)
+                f = cache.open(zone_id, etag)
+
+            # NOTE: A newer version of the zone, stored in the meantime,
+            #       replaces this one, in which case it is not served from
+            #       the cache.
+            if f is not None:
+                chunks = exportcache.iter_file(f)
+                if gzip_accepted:
+                    response.app_iter = chunks
+                    response.content_encoding = 'gzip'
+                    response.content_length = os.fstat(f.fileno()).st_size
+                else:
+                    response.app_iter = exportcache.decompress(chunks)
+
+                return response
+
+        chunks = self._export_chunks(context, zone_id)
+        if gzip_accepted:
+            response.app_iter = chunks
+            response.content_encoding = 'gzip'
+        else:
+            response.app_iter = exportcache.decompress(chunks)
+
+        return response
+
+    @property
+    @utils.cache_result
+    def blob_store(self):
+        return blob_store.get_blob_store(cfg.CONF.blob_store_driver)
+
+    def _get_blob(self, context, export):
+        """
+        Serve an export rendered into the blob store, supporting Range
+        requests so interrupted downloads can be resumed.
+        """
+        if export.status != 'COMPLETE':
+            raise exceptions.BadRequest(
+                'Zone export is %s, not COMPLETE' % export.status)
+
+        response = pecan.response
+        key = export.location.split('://', 1)[1]
+
+        response.content_type = 'text/dns'
+        response.app_iter = BlobAppIter(self.blob_store, context, key)
+        response.content_length = self.blob_store.get_size(context, key)
+
+        # The blob never changes, so the export's id identifies it for
+        # If-Range. Compressing it would change what byte ranges refer to.
+        response.etag = export.id
+        response.accept_ranges = 'bytes'
+        response.cache_control = 'no-transform'
+        response.conditional_response = True
+
+        return response
+
+    def _export_chunks(self, context, zone_id):
+        """
+        Have the zone manager render the zone, and return an iterator over
+        the gzip compressed export, read from it a chunk at a time.
+        """
+        location = self.zone_manager_api.export_zone(context, zone_id)
+
+        def _chunks(offset):
+            while True:
+                chunk = base64.b64decode(
+                    self.zone_manager_api.get_zone_export_chunk(
+                        context, zone_id, location['serial'], offset,
+                        location['host']))
+
+                if not chunk:
+                    return
+
+                offset += len(chunk)
+                yield chunk
+
+        return _chunks(0)
+
+
+class BlobAppIter(object):
+    """
+    Iterates over a blob, and lets WebOb read just the range of it a Range
+    request asks for.
+    """
+    def __init__(self, store, context, key):
+        self.store = store
+        self.context = context
+        self.key = key
+
+    def __iter__(self):
+        return self.store.read(self.context, self.key)
+
+    def app_iter_range(self, start, stop):
+        return self.store.read(self.context, self.key, start, stop)
+
 
 class ZoneExportCreateController(rest.RestController):
 
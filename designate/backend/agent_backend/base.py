@@ -42,6 +42,15 @@ class AgentBackend(DriverPlugin):
     def find_domain_serial(self, domain_name):
         """Find a DNS Domain"""
 
+    def find_domain_serials(self):
+        """
+        Find the serial of every DNS domain at once, for backends able to
+        list them cheaply.
+
+        :return: A dict of domain name to serial.
+        """
+        return {}
+
     @abc.abstractmethod
     def create_domain(self, domain):
         """Create a DNS domain"""
@@ -13,23 +13,77 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import hashlib
 import os
+import socket
+import stat
+import tempfile
 
 import dns
+import dns.rdatatype
 import dns.resolver
+import six
 from oslo_concurrency import lockutils
 from oslo_config import cfg
 from oslo_log import log as logging
 
 from designate.backend.agent_backend import base
+from designate.backend import rndc
 from designate import exceptions
 from designate import utils
 from designate.i18n import _LI
+from designate.i18n import _LW
 
 LOG = logging.getLogger(__name__)
 CFG_GROUP = 'backend:agent:bind9'
 
 
+class HashingWriter(object):
+    """
+    A file-like object passing writes through to a file, while keeping a
+    running hash of everything written.
+    """
+    def __init__(self, f):
+        self.f = f
+        self.hash = hashlib.sha256()
+
+    def write(self, data):
+        if isinstance(data, six.text_type):
+            data = data.encode('utf-8')
+
+        self.hash.update(data)
+        self.f.write(data)
+
+    def hexdigest(self):
+        return self.hash.hexdigest()
+
+
+def _read_serial(path):
+    """Read the serial from the SOA record of a zone file"""
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+
+                # <name> <ttl> IN SOA <mname> <rname> <serial> ...
+                if 'SOA' in fields[:4]:
+                    return int(fields[fields.index('SOA') + 3])
+    except (IOError, ValueError, IndexError):
+        LOG.debug('Failed to read the serial from %s' % path)
+
+    return None
+
+
+def _hash_file(path, chunk_size=65536):
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
 class Bind9Backend(base.AgentBackend):
     __plugin_name__ = 'bind9'
 
@@ -47,6 +101,14 @@ class Bind9Backend(base.AgentBackend):
             cfg.StrOpt('rndc-config-file', default=None,
                        help='RNDC Config File'),
             cfg.StrOpt('rndc-key-file', default=None, help='RNDC Key File'),
+            cfg.BoolOpt('rndc-native', default=False,
+                        help='Talk to the RNDC control channel directly over '
+                             'persistent connections, rather than running '
+                             'the rndc command'),
+            cfg.IntOpt('rndc-pool-size', default=4,
+                       help='Number of RNDC connections to keep open'),
+            cfg.IntOpt('rndc-timeout', default=10,
+                       help='RNDC connection timeout, in seconds'),
             cfg.StrOpt('zone-file-path', default='$state_path/zones',
                        help='Path where zone files are stored'),
             cfg.StrOpt('query-destination', default='127.0.0.1',
@@ -55,9 +117,47 @@ class Bind9Backend(base.AgentBackend):
 
         return [(group, opts)]
 
+    def __init__(self, agent_service):
+        super(Bind9Backend, self).__init__(agent_service)
+
+        self.rndc_native = cfg.CONF[CFG_GROUP].rndc_native
+        self._rndc_client = None
+
+        # Domain name to the (serial, digest) of the last zone file written
+        self._zone_files = {}
+
     def start(self):
         LOG.info(_LI("Started bind9 backend"))
 
+    def stop(self):
+        if self._rndc_client is not None:
+            self._rndc_client.close()
+
+        super(Bind9Backend, self).stop()
+
+    @property
+    def rndc_client(self):
+        """
+        The native control channel client, or None when it is disabled or no
+        rndc key could be found.
+        """
+        if self._rndc_client is None and self.rndc_native:
+            key = rndc.load_key(cfg.CONF[CFG_GROUP].rndc_key_file,
+                                cfg.CONF[CFG_GROUP].rndc_config_file)
+            if key is None:
+                LOG.warn(_LW("No rndc key found, falling back to the rndc "
+                             "command"))
+                self.rndc_native = False
+                return None
+
+            self._rndc_client = rndc.RndcClient(
+                cfg.CONF[CFG_GROUP].rndc_host,
+                cfg.CONF[CFG_GROUP].rndc_port, key[0], key[1],
+                pool_size=cfg.CONF[CFG_GROUP].rndc_pool_size,
+                timeout=cfg.CONF[CFG_GROUP].rndc_timeout)
+
+        return self._rndc_client
+
     def find_domain_serial(self, domain_name):
         LOG.debug("Finding %s" % domain_name)
         resolver = dns.resolver.Resolver()
@@ -68,6 +168,28 @@ class Bind9Backend(base.AgentBackend):
             return None
         return rdata.serial
 
+    def find_domain_serials(self):
+        """
+        Read the serial of every zone from the zone files we have written,
+        rather than querying BIND for each zone in turn.
+        """
+        zone_path = cfg.CONF[CFG_GROUP].zone_file_path
+        serials = {}
+
+        if not os.path.isdir(zone_path):
+            return serials
+
+        for filename in os.listdir(zone_path):
+            # Skips any temporary files left behind, as well as the rest
+            if not filename.endswith('.zone') or filename.startswith('.'):
+                continue
+
+            serial = _read_serial(os.path.join(zone_path, filename))
+            if serial is not None:
+                serials['%s.' % filename[:-len('.zone')]] = serial
+
+        return serials
+
     def create_domain(self, domain):
         LOG.debug("Creating %s" % domain.origin.to_text())
         self._sync_domain(domain, new_domain_flag=True)
@@ -79,11 +201,12 @@ class Bind9Backend(base.AgentBackend):
     def delete_domain(self, domain_name):
         LOG.debug('Delete Domain: %s' % domain_name)
 
-        rndc_op = 'delzone'
         # RNDC doesn't like the trailing dot on the domain name
-        rndc_call = self._rndc_base() + [rndc_op, domain_name.rstrip('.')]
+        rndc_op = ['delzone', domain_name.rstrip('.')]
+
+        self._execute_rndc(rndc_op)
 
-        utils.execute(*rndc_call)
+        self._zone_files.pop(domain_name.rstrip('.'), None)
 
     def _rndc_base(self):
         rndc_call = [
@@ -120,9 +243,21 @@ class Bind9Backend(base.AgentBackend):
             output_path = os.path.join(zone_path,
                                        '%s.zone' % domain_name)
 
-            domain.to_file(output_path, relativize=False)
+            serial = self._get_serial(domain)
+            last = self._zone_files.get(domain_name)
 
-            rndc_call = self._rndc_base()
+            # The same serial means the same zone, so there is no need to
+            # even render it.
+            if not new_domain_flag and last is not None and \
+                    serial is not None and last[0] == serial and \
+                    os.path.exists(output_path):
+                LOG.debug('Domain %s is already at serial %s, skipping',
+                          domain_name, serial)
+                return
+
+            changed, digest = self._write_zone_file(
+                domain, output_path, last[1] if last else None)
+            self._zone_files[domain_name] = (serial, digest)
 
             if new_domain_flag:
                 rndc_op = [
@@ -130,17 +265,81 @@ class Bind9Backend(base.AgentBackend):
                     '%s { type master; file "%s"; };' % (domain_name,
                                                          output_path),
                 ]
-                rndc_call.extend(rndc_op)
+            elif changed:
+                rndc_op = ['reload', domain_name]
             else:
-                rndc_op = 'reload'
-                rndc_call.extend([rndc_op])
-                rndc_call.extend([domain_name])
+                LOG.debug('Zone file for %s is unchanged, skipping reload',
+                          domain_name)
+                return
+
+            self._execute_rndc(rndc_op)
 
-            LOG.debug('Calling RNDC with: %s' % " ".join(rndc_call))
-            self._execute_rndc(rndc_call)
+    @staticmethod
+    def _get_serial(domain):
+        rdataset = domain.get_rdataset(domain.origin, dns.rdatatype.SOA)
+        if rdataset is None:
+            return None
+
+        return rdataset[0].serial
+
+    @staticmethod
+    def _write_zone_file(domain, output_path, last_digest=None):
+        """
+        Stream the zone into a temporary file alongside ``output_path``, and
+        rename it into place if it differs from the existing zone file.
+
+        ``last_digest`` is the digest of the zone file as it was last written,
+        if known, saving reading the existing file back in.
+
+        :return: A tuple of whether the zone file was changed, and the digest
+                 of its contents.
+        """
+        directory, filename = os.path.split(output_path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory,
+                                        prefix='.%s.' % filename)
 
-    def _execute_rndc(self, rndc_call):
         try:
+            with os.fdopen(fd, 'wb') as f:
+                writer = HashingWriter(f)
+                domain.to_file(writer, relativize=False)
+
+            digest = writer.hexdigest()
+
+            if os.path.exists(output_path):
+                if last_digest is None:
+                    last_digest = _hash_file(output_path)
+
+                if digest == last_digest:
+                    os.unlink(tmp_path)
+                    return False, digest
+
+                mode = stat.S_IMODE(os.stat(output_path).st_mode)
+            else:
+                mode = 0o644
+
+            # BIND needs to be able to read the file, which mkstemp creates
+            # readable by us alone.
+            os.chmod(tmp_path, mode)
+            os.rename(tmp_path, output_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        return True, digest
+
+    def _execute_rndc(self, rndc_op):
+        if self.rndc_client is not None:
+            try:
+                LOG.debug('Sending RNDC command: %s' % " ".join(rndc_op))
+                return self.rndc_client.call(" ".join(rndc_op))
+            except (socket.error, exceptions.RndcProtocolError) as e:
+                LOG.warn(_LW("Failed to reach rndc, falling back to the rndc "
+                             "command: %s") % e)
+
+        try:
+            rndc_call = self._rndc_base()
+            rndc_call.extend(rndc_op)
             LOG.debug('Executing RNDC call: %s' % " ".join(rndc_call))
             utils.execute(*rndc_call)
         except utils.processutils.ProcessExecutionError as e:
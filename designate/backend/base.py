@@ -97,6 +97,47 @@ class Backend(DriverPlugin):
         :param domain: the DNS domain.
         """
 
+    def create_domains(self, context, domains):
+        """
+        Create many DNS domains.
+
+        Backends able to write many domains at once should override this, by
+        default the domains are created one at a time.
+
+        :param context: Security context information.
+        :param domains: the DNS domains.
+        :return: A list holding None for each domain created, or the
+                 exception raised while creating it.
+        """
+        return self._each_domain(self.create_domain, context, domains)
+
+    def delete_domains(self, context, domains):
+        """
+        Delete many DNS domains.
+
+        Backends able to remove many domains at once should override this, by
+        default the domains are deleted one at a time.
+
+        :param context: Security context information.
+        :param domains: the DNS domains.
+        :return: A list holding None for each domain deleted, or the
+                 exception raised while deleting it.
+        """
+        return self._each_domain(self.delete_domain, context, domains)
+
+    @staticmethod
+    def _each_domain(func, context, domains):
+        results = []
+
+        for domain in domains:
+            try:
+                func(context, domain)
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+
+        return results
+
     def ping(self, context):
         """Ping the Backend service"""
 
@@ -0,0 +1,128 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import time
+
+import eventlet
+from eventlet import event
+from oslo_log import log as logging
+
+from designate.i18n import _LE
+from designate.i18n import _LI
+
+LOG = logging.getLogger(__name__)
+
+REPORT_INTERVAL = 60
+
+
+class BatchQueue(object):
+    """
+    Groups items submitted by many greenthreads into batches.
+
+    Each caller blocks on its own item while the items queued within
+    ``window`` seconds of each other are handed to ``execute`` together. The
+    ``execute`` callable returns one result per item, with failures given as
+    exception instances, and each result is passed back to the greenthread
+    which submitted that item.
+
+    While batches are being run, the queue's stats are logged under ``name``
+    at most every ``report_interval`` seconds.
+    """
+    def __init__(self, execute, window=0.1, batch_size=100, name='batch',
+                 report_interval=REPORT_INTERVAL):
+        self.execute = execute
+        self.window = window
+        self.batch_size = batch_size
+        self.name = name
+        self.report_interval = report_interval
+
+        self.stats = {
+            'batches': 0,
+            'items': 0,
+            'last_batch_size': 0,
+            'max_batch_size': 0,
+        }
+
+        self._pending = []
+        self._flusher = None
+        self._reported_at = time.time()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['depth'] = len(self)
+        return stats
+
+    def submit(self, item):
+        done = event.Event()
+        self._pending.append((item, done))
+
+        if self._flusher is None:
+            self._flusher = eventlet.spawn(self._flush)
+
+        result = done.wait()
+        if isinstance(result, Exception):
+            raise result
+
+        return result
+
+    def _flush(self):
+        try:
+            while self._pending:
+                if len(self._pending) < self.batch_size:
+                    # Give other callers a chance to join this batch
+                    eventlet.sleep(self.window)
+
+                batch = self._pending[:self.batch_size]
+                self._pending = self._pending[self.batch_size:]
+
+                self._run(batch)
+        finally:
+            self._flusher = None
+
+    def _run(self, batch):
+        items = [item for item, _ in batch]
+
+        try:
+            results = self.execute(items)
+        except Exception as e:
+            LOG.exception(_LE("Failed to run a batch of %d items"),
+                          len(items))
+            results = [e] * len(items)
+
+        self.stats['batches'] += 1
+        self.stats['items'] += len(items)
+        self.stats['last_batch_size'] = len(items)
+        self.stats['max_batch_size'] = max(
+            self.stats['max_batch_size'], len(items))
+
+        LOG.debug('Ran a batch of %(size)d items, %(depth)d still queued',
+                  {'size': len(items), 'depth': len(self)})
+
+        for (_, done), result in zip(batch, results):
+            done.send(result)
+
+        if time.time() - self._reported_at >= self.report_interval:
+            self._report()
+
+    def _report(self):
+        self._reported_at = time.time()
+
+        stats = self.get_stats()
+        stats['name'] = self.name
+        LOG.info(_LI("%(name)s queue: %(items)d items in %(batches)d "
+                     "batches, %(depth)d queued, last batch of "
+                     "%(last_batch_size)d, largest batch of "
+                     "%(max_batch_size)d"), stats)
@@ -23,6 +23,8 @@ from suds.transport.https import HttpAuthenticated
 from designate import exceptions
 from designate import utils
 from designate.backend import base
+from designate.backend import batch
+from designate.i18n import _LW
 
 
 LOG = logging.getLogger(__name__)
@@ -182,6 +184,12 @@ class EnhancedDNSClient(object):
             self.client.service.deleteZones(zoneNames=zoneNames)
         except Exception as e:
             if 'Could not retrive object ID for zone' in str(e):
+                if len(zoneNames) > 1:
+                    # We can't tell which of the zones was already purged,
+                    # nor whether the others were deleted.
+                    raise EnhancedDNSException(
+                        'Akamai Communication Failure: %s' % e)
+
                 # The zone has already been purged, ignore and move on
                 pass
             elif 'The following zones are still delegated to Akamai' in str(e):
@@ -242,17 +250,116 @@ class AkamaiBackend(base.Backend):
 
         self.client = EnhancedDNSClient(self.username, self.password)
 
+        # Zone changes queued within batch_window seconds of each other are
+        # sent together, a window of 0 sends every change on its own.
+        self.batch_window = float(self.options.get('batch_window', 0.1))
+        self.batch_size = int(self.options.get('batch_size', 100))
+
+        self._set_queue = None
+        self._delete_queue = None
+
         for m in self.masters:
             if m.port != 53:
                 raise exceptions.ConfigurationError(
                     "Akamai only supports mDNS instances on port 53")
 
+    @property
+    def set_queue(self):
+        if self._set_queue is None and self.batch_window > 0:
+            self._set_queue = batch.BatchQueue(
+                self._set_zones, window=self.batch_window,
+                batch_size=self.batch_size, name='Akamai setZones')
+
+        return self._set_queue
+
+    @property
+    def delete_queue(self):
+        if self._delete_queue is None and self.batch_window > 0:
+            self._delete_queue = batch.BatchQueue(
+                self._delete_zones, window=self.batch_window,
+                batch_size=self.batch_size, name='Akamai deleteZones')
+
+        return self._delete_queue
+
     def create_domain(self, context, domain):
         """Create a DNS domain"""
         zone = build_zone(self.client, self.target, domain)
 
-        self.client.setZone(zone=zone)
+        if self.set_queue is not None:
+            self.set_queue.submit(zone)
+        else:
+            self.client.setZone(zone=zone)
 
     def delete_domain(self, context, domain):
         """Delete a DNS domain"""
-        self.client.deleteZone(zoneName=domain['name'])
+        if self.delete_queue is not None:
+            self.delete_queue.submit(domain['name'])
+        else:
+            self.client.deleteZone(zoneName=domain['name'])
+
+    def create_domains(self, context, domains):
+        """Create many DNS domains, batch_size at a time"""
+        zones = [build_zone(self.client, self.target, domain)
+                 for domain in domains]
+
+        return self._each_chunk(self._set_zones, zones)
+
+    def delete_domains(self, context, domains):
+        """Delete many DNS domains, batch_size at a time"""
+        return self._each_chunk(
+            self._delete_zones, [domain['name'] for domain in domains])
+
+    def _each_chunk(self, func, items):
+        results = []
+
+        for i in range(0, len(items), self.batch_size):
+            chunk = items[i:i + self.batch_size]
+            try:
+                results.extend(func(chunk))
+            except Exception as e:
+                results.extend([e] * len(chunk))
+
+        return results
+
+    def _set_zones(self, zones):
+        return self._execute_batch(
+            lambda zones: self.client.setZones(zones=zones), zones,
+            lambda zone: zone.zoneName)
+
+    def _delete_zones(self, zone_names):
+        return self._execute_batch(
+            lambda zone_names: self.client.deleteZones(zoneNames=zone_names),
+            zone_names, lambda zone_name: zone_name)
+
+    def _execute_batch(self, func, items, describe):
+        """
+        Sends the items in one call, returning a result per item.
+
+        Akamai rejects the whole call when any one zone in it fails, so a
+        failed batch is retried a zone at a time to find out which zones the
+        error belongs to.
+        """
+        try:
+            func(items)
+            return [None] * len(items)
+        except exceptions.ConfigurationError:
+            # Bad credentials fail every zone alike, don't retry each one
+            raise
+        except Exception as e:
+            if len(items) == 1:
+                return [e]
+
+            LOG.warn(_LW("Batch of %(count)d zones failed, retrying them one "
+                         "at a time: %(err)s") % {'count': len(items),
+                                                 'err': e})
+
+        results = []
+        for item in items:
+            try:
+                func([item])
+                results.append(None)
+            except Exception as e:
+                LOG.debug('Zone %s failed: %s', describe(item), e)
+                results.append(e)
+
+        return results
@@ -14,13 +14,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import random
+import socket
 
 import six
 from oslo_log import log as logging
+from oslo_utils import strutils
 
 from designate import exceptions
 from designate import utils
 from designate.backend import base
+from designate.backend import rndc
+from designate.i18n import _LW
 
 
 LOG = logging.getLogger(__name__)
@@ -41,6 +45,51 @@ class Bind9Backend(base.Backend):
         self.rndc_port = int(self.options.get('rndc_port', 953))
         self.rndc_config_file = self.options.get('rndc_config_file')
         self.rndc_key_file = self.options.get('rndc_key_file')
+        self.rndc_native = strutils.bool_from_string(
+            self.options.get('rndc_native', False))
+        self.rndc_pool_size = int(self.options.get('rndc_pool_size', 4))
+        self.rndc_timeout = int(self.options.get('rndc_timeout', 10))
+        self.rndc_batch_window = float(
+            self.options.get('rndc_batch_window', 0))
+        self.rndc_batch_size = int(self.options.get('rndc_batch_size', 100))
+
+        self._rndc_client = None
+        self._rndc_queue = None
+
+    @property
+    def rndc_client(self):
+        """
+        The native control channel client, or None when it is disabled or no
+        rndc key could be found.
+        """
+        if self._rndc_client is None and self.rndc_native:
+            key = rndc.load_key(self.rndc_key_file, self.rndc_config_file)
+            if key is None:
+                LOG.warn(_LW("No rndc key found for %(host)s:%(port)s, "
+                             "falling back to the rndc command") %
+                         {'host': self.rndc_host, 'port': self.rndc_port})
+                self.rndc_native = False
+                return None
+
+            self._rndc_client = rndc.RndcClient(
+                self.rndc_host, self.rndc_port, key[0], key[1],
+                pool_size=self.rndc_pool_size, timeout=self.rndc_timeout)
+
+        return self._rndc_client
+
+    @property
+    def rndc_queue(self):
+        """
+        The queue batching up addzone/delzone commands, or None when
+        batching is disabled.
+        """
+        if self._rndc_queue is None and self.rndc_batch_window > 0:
+            self._rndc_queue = rndc.RndcCommandQueue(
+                self._execute_rndc_many, window=self.rndc_batch_window,
+                batch_size=self.rndc_batch_size,
+                name='rndc %s:%s' % (self.rndc_host, self.rndc_port))
+
+        return self._rndc_queue
 
     def create_domain(self, context, domain):
         LOG.debug('Create Domain')
@@ -103,6 +152,42 @@ class Bind9Backend(base.Backend):
         return rndc_call
 
     def _execute_rndc(self, rndc_op):
+        if self.rndc_queue is not None:
+            return self.rndc_queue.submit(rndc_op)
+
+        result = self._execute_rndc_many([rndc_op])[0]
+        if isinstance(result, Exception):
+            raise result
+
+        return result
+
+    def _execute_rndc_many(self, rndc_ops):
+        """
+        Run several rndc operations, returning the output or the
+        exceptions.Backend raised for each one.
+        """
+        if self.rndc_client is not None:
+            commands = [" ".join(rndc_op) for rndc_op in rndc_ops]
+            try:
+                LOG.debug('Sending RNDC commands: %s' % commands)
+                return self.rndc_client.call_many(
+                    commands, return_exceptions=True)
+            except (socket.error, exceptions.RndcProtocolError) as e:
+                LOG.warn(_LW("Failed to reach rndc on %(host)s:%(port)s, "
+                             "falling back to the rndc command: %(err)s") %
+                         {'host': self.rndc_host, 'port': self.rndc_port,
+                          'err': e})
+
+        results = []
+        for rndc_op in rndc_ops:
+            try:
+                results.append(self._execute_rndc_command(rndc_op))
+            except exceptions.Backend as e:
+                results.append(e)
+
+        return results
+
+    def _execute_rndc_command(self, rndc_op):
         try:
             rndc_call = self._rndc_base()
             rndc_call.extend(rndc_op)
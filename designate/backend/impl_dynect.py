@@ -16,7 +16,8 @@
 import json
 import time
 
-from eventlet import Timeout
+import eventlet
+from eventlet import pools
 from oslo_config import cfg
 from oslo_log import log as logging
 import requests
@@ -32,6 +33,7 @@ from designate.i18n import _LW
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 CFG_GROUP = 'backend:dynect'
+DEFAULT_ENDPOINT = 'https://api.dynect.net:443'
 
 
 class DynClientError(exceptions.Backend):
@@ -100,10 +102,11 @@ class DynClient(object):
     https://help.dynect.net/rest/
     """
     def __init__(self, customer_name, user_name, password,
-                 endpoint="https://api.dynect.net:443",
+                 endpoint=DEFAULT_ENDPOINT,
                  api_version='3.5.6', headers=None, verify=True, retries=1,
                  timeout=10, timings=False, pool_maxsize=10,
-                 pool_connections=10):
+                 pool_connections=10, job_timeout=30, poll_interval=0.5,
+                 poll_max_interval=5):
         self.customer_name = customer_name
         self.user_name = user_name
         self.password = password
@@ -114,6 +117,10 @@ class DynClient(object):
         self.timings = timings
         self.timeout = timeout
 
+        self.job_timeout = job_timeout
+        self.poll_interval = poll_interval
+        self.poll_max_interval = poll_max_interval
+
         self.authing = False
         self.token = None
 
@@ -188,6 +195,10 @@ class DynClient(object):
         if self.timeout is not None:
             kwargs.setdefault("timeout", self.timeout)
 
+        # NOTE: Async jobs answer with a 307 to the job, which we poll
+        # ourselves rather than replaying the original request against it.
+        kwargs.setdefault("allow_redirects", False)
+
         data = kwargs.get('data')
         if data is not None:
             kwargs['data'] = data.copy()
@@ -223,24 +234,33 @@ class DynClient(object):
         """
         The API might return a job nr in the response in case of a async
         response: https://github.com/fog/fog/issues/575
+
+        The job is polled with an exponential backoff, sleeping only the
+        calling greenthread, so any number of jobs can be polled at once.
         """
-        status = response.status
+        url = response.headers.get('Location')
+        interval = self.poll_interval
+        deadline = time.time() + self.job_timeout
 
-        timeout = Timeout(CONF[CFG_GROUP].job_timeout)
-        try:
-            while status == 307:
-                time.sleep(1)
-                url = response.headers.get('Location')
-                LOG.debug("Polling %s" % url)
-
-                polled_response = self.get(url)
-                status = response.status
-        except Timeout as t:
-            if t == timeout:
+        while response.status_code == 307 or self._job_incomplete(response):
+            if time.time() + interval > deadline:
                 raise DynTimeoutError('Timeout reached when pulling job.')
-        finally:
-            timeout.cancel()
-        return polled_response
+
+            eventlet.sleep(interval)
+            interval = min(interval * 2, self.poll_max_interval)
+
+            LOG.debug("Polling %s" % url)
+            response = self._request('GET', url)
+            url = response.headers.get('Location', url)
+
+        return response
+
+    @staticmethod
+    def _job_incomplete(response):
+        try:
+            return response.json().get('status') == 'incomplete'
+        except ValueError:
+            return False
 
     def request(self, method, url, retries=2, **kwargs):
         if self.token is None and not self.authing:
@@ -268,9 +288,11 @@ class DynClient(object):
             'user_name': self.user_name,
             'password': self.password
         }
-        response = self.post('/Session', data=data)
+        try:
+            response = self.post('/Session', data=data)
+        finally:
+            self.authing = False
         self.token = response['data']['token']
-        self.authing = False
 
     def logout(self):
         self.delete('/Session')
@@ -297,6 +319,33 @@ class DynClient(object):
         return response
 
 
+class DynClientPool(pools.Pool):
+    """
+    A pool of long lived DynECT sessions.
+
+    Clients log in on first use and stay logged in between operations, an
+    expired session is logged back in by the client when the API rejects its
+    token.
+    """
+    def __init__(self, create, max_size=10):
+        self._create = create
+        super(DynClientPool, self).__init__(max_size=max_size)
+
+    def create(self):
+        return self._create()
+
+    def close(self):
+        while self.free_items:
+            client = self.free_items.popleft()
+            if client.token is None:
+                continue
+
+            try:
+                client.logout()
+            except (DynClientError, requests.RequestException) as e:
+                LOG.warn(_LW("Failed to log out of DynECT session: %s") % e)
+
+
 class DynECTBackend(base.Backend):
     """
     Support for DynECT as a secondary DNS.
@@ -318,6 +367,16 @@ class DynECTBackend(base.Backend):
                        default=10),
             cfg.BoolOpt('timings', help="Measure requests timings.",
                         default=False),
+            cfg.FloatOpt('job_poll_interval', default=0.5,
+                         help="Seconds to wait before first polling a job, "
+                              "doubled after each poll."),
+            cfg.FloatOpt('job_poll_max_interval', default=5,
+                         help="Maximum seconds to wait between polls of a "
+                              "job."),
+            cfg.IntOpt('client_pool_size', default=10,
+                       help="Number of logged in API sessions kept per "
+                            "target, and so the number of operations run "
+                            "concurrently against it."),
         ]
 
         return [(group, opts)]
@@ -330,6 +389,10 @@ class DynECTBackend(base.Backend):
         self.password = self.options.get('password')
         self.contact_nickname = self.options.get('contact_nickname', None)
         self.tsig_key_name = self.options.get('tsig_key_name', None)
+        self.endpoint = self.options.get('endpoint', DEFAULT_ENDPOINT)
+
+        self.client_pool = DynClientPool(
+            self.get_client, CONF[CFG_GROUP].client_pool_size)
 
         for m in self.masters:
             if m.port != 53:
@@ -341,8 +404,17 @@ class DynECTBackend(base.Backend):
             customer_name=self.customer_name,
             user_name=self.username,
             password=self.password,
+            endpoint=self.endpoint,
             timeout=CONF[CFG_GROUP].timeout,
-            timings=CONF[CFG_GROUP].timings)
+            timings=CONF[CFG_GROUP].timings,
+            pool_maxsize=CONF[CFG_GROUP].client_pool_size,
+            job_timeout=CONF[CFG_GROUP].job_timeout,
+            poll_interval=CONF[CFG_GROUP].job_poll_interval,
+            poll_max_interval=CONF[CFG_GROUP].job_poll_max_interval)
+
+    def stop(self):
+        self.client_pool.close()
+        super(DynECTBackend, self).stop()
 
     def create_domain(self, context, domain):
         LOG.info(_LI('Creating domain %(d_id)s / %(d_name)s') %
@@ -359,40 +431,54 @@ class DynECTBackend(base.Backend):
         if self.tsig_key_name is not None:
             data['tsig_key_name'] = self.tsig_key_name
 
-        client = self.get_client()
-
-        try:
-            client.post(url, data=data)
-        except DynClientError as e:
-            for emsg in e.msgs:
-                if emsg['ERR_CD'] == 'TARGET_EXISTS':
-                    msg = _LI("Domain already exists, updating existing "
-                              "domain instead %s")
-                    LOG.info(msg % domain['name'])
-                    client.put(url, data=data)
-                    break
-            else:
-                raise e
-
-        client.put(url, data={'activate': True})
-        client.logout()
+        with self.client_pool.item() as client:
+            try:
+                client.post(url, data=data)
+            except DynClientError as e:
+                for emsg in e.msgs:
+                    if emsg['ERR_CD'] == 'TARGET_EXISTS':
+                        msg = _LI("Domain already exists, updating existing "
+                                  "domain instead %s")
+                        LOG.info(msg % domain['name'])
+                        client.put(url, data=data)
+                        break
+                else:
+                    raise e
+
+            client.put(url, data={'activate': True})
 
     def delete_domain(self, context, domain):
         LOG.info(_LI('Deleting domain %(d_id)s / %(d_name)s') %
                  {'d_id': domain['id'], 'd_name': domain['name']})
         url = '/Zone/%s' % domain['name'].rstrip('.')
-        client = self.get_client()
-        try:
-            client.delete(url)
-        except DynClientError as e:
-            if e.http_status == 404:
-                LOG.warn(_LW("Attempt to delete %(d_id)s / %(d_name)s "
-                             "caused 404, ignoring.") %
-                         {'d_id': domain['id'], 'd_name': domain['name']})
-                pass
-            else:
-                raise
-        client.logout()
+        with self.client_pool.item() as client:
+            try:
+                client.delete(url)
+            except DynClientError as e:
+                if e.http_status == 404:
+                    LOG.warn(_LW("Attempt to delete %(d_id)s / %(d_name)s "
+                                 "caused 404, ignoring.") %
+                             {'d_id': domain['id'], 'd_name': domain['name']})
+                    pass
+                else:
+                    raise
+
+    def create_domains(self, context, domains):
+        return self._each_domain_concurrently(
+            self.create_domain, context, domains)
+
+    def delete_domains(self, context, domains):
+        return self._each_domain_concurrently(
+            self.delete_domain, context, domains)
+
+    def _each_domain_concurrently(self, func, context, domains):
+        # Operations spend most of their time waiting on DynECT jobs, so run
+        # one per pooled session and let their jobs be polled side by side.
+        def _run(domain):
+            return self._each_domain(func, context, [domain])[0]
+
+        pool = eventlet.GreenPool(self.client_pool.max_size)
+        return list(pool.imap(_run, domains))
 
     def create_recordset(self, context, domain, recordset):
         LOG.debug('Discarding create_recordset call, not-applicable')
@@ -25,12 +25,15 @@ from sqlalchemy.sql import select
 
 from designate import exceptions
 from designate.i18n import _LC
+from designate.i18n import _LW
 from designate.backend import base
 from designate.backend.impl_powerdns import tables
 from designate.sqlalchemy import session
 
 LOG = logging.getLogger(__name__)
 
+ENGINE_OPTIONS = ('max_pool_size', 'max_overflow', 'pool_timeout')
+
 
 def _map_col(keys, col):
     return dict([(keys[i], col[i]) for i in range(len(keys))])
@@ -64,6 +67,13 @@ class PowerDNSBackend(base.Backend):
         }
 
         self.connection = self.options.get('connection', default_connection)
+        self.bulk_size = int(self.options.get('bulk_size', 500))
+
+        # Targets may tune their own engine pool, recovery of a large pool
+        # keeps many connections busy at once.
+        self.engine_options = dict(
+            (name, int(self.options[name])) for name in ENGINE_OPTIONS
+            if self.options.get(name) is not None)
 
     @property
     def session(self):
@@ -73,7 +83,8 @@ class PowerDNSBackend(base.Backend):
         #       leads to bad things happening.
         if not hasattr(self.local_store, 'session'):
             self.local_store.session = session.get_session(
-                self.name, self.connection, self.target.id)
+                self.name, self.connection, self.target.id,
+                engine_options=self.engine_options)
 
         return self.local_store.session
 
@@ -118,34 +129,115 @@ class PowerDNSBackend(base.Backend):
         if resultproxy.rowcount != 1:
             raise exc_notfound()
 
+    def _create_many(self, table, values):
+        dialect = self.session.get_bind().dialect
+
+        if dialect.supports_multivalues_insert:
+            # A single INSERT ... VALUES (...), (...) statement
+            self.session.execute(table.insert().values(values))
+        else:
+            self.session.execute(table.insert(), values)
+
+    def _delete_many(self, table, ids, id_col):
+        """
+        Delete every row with an ID in ``ids`` in one statement.
+
+        :return: The IDs which were deleted, or None if the dialect can't
+                 return them.
+        """
+        dialect = self.session.get_bind().dialect
+        query = table.delete().where(id_col.in_(ids))
+
+        if dialect.implicit_returning:
+            resultproxy = self.session.execute(query.returning(id_col))
+            return set(row[0] for row in resultproxy)
+
+        resultproxy = self.session.execute(query)
+        if resultproxy.rowcount != len(ids):
+            LOG.critical(_LC('Attempted to delete %d domains which are not '
+                             'present in the backend.') %
+                         (len(ids) - resultproxy.rowcount))
+
+        return None
+
+    def _domain_values(self, context, domain):
+        def _parse_master(master):
+            return '%s:%d' % (master.host, master.port)
+        masters = six.moves.map(_parse_master, self.masters)
+
+        return {
+            'designate_id': domain['id'],
+            'name': domain['name'].rstrip('.'),
+            'master': ','.join(masters),
+            'type': 'SLAVE',
+            'account': context.tenant
+        }
+
+    def _notify(self, context, domain):
+        self.mdns_api.notify_zone_changed(
+            context, domain, self.host, self.port, self.timeout,
+            self.retry_interval, self.max_retries, self.delay)
+
     # Domain Methods
     def create_domain(self, context, domain):
         try:
             self.session.begin()
 
-            def _parse_master(master):
-                return '%s:%d' % (master.host, master.port)
-            masters = six.moves.map(_parse_master, self.masters)
+            self._create(tables.domains, self._domain_values(context, domain))
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self.session.rollback()
+        else:
+            self.session.commit()
+
+        self._notify(context, domain)
+
+    def create_domains(self, context, domains):
+        results = []
+
+        for start in range(0, len(domains), self.bulk_size):
+            batch = domains[start:start + self.bulk_size]
+
+            try:
+                self._create_domains(context, batch)
+                results.extend([None] * len(batch))
+            except Exception as e:
+                # One bad domain fails the whole statement, so fall back to
+                # creating them one at a time to find out which.
+                LOG.warn(_LW('Failed to create %(count)d domains in bulk, '
+                             'retrying them one at a time: %(err)s') %
+                         {'count': len(batch), 'err': e})
+                results.extend(self._each_domain(
+                    self.create_domain, context, batch))
+                continue
+
+            for domain in batch:
+                self._notify(context, domain)
+
+        return results
+
+    def _create_domains(self, context, domains):
+        try:
+            self.session.begin()
+
+            # Domains left over from an earlier, partially successful
+            # attempt are already done.
+            query = select([tables.domains.c.designate_id])\
+                .where(tables.domains.c.designate_id.in_(
+                    [domain['id'] for domain in domains]))
+            existing = set(row[0] for row in self.session.execute(query))
 
-            domain_values = {
-                'designate_id': domain['id'],
-                'name': domain['name'].rstrip('.'),
-                'master': ','.join(masters),
-                'type': 'SLAVE',
-                'account': context.tenant
-            }
+            values = [self._domain_values(context, domain)
+                      for domain in domains if domain['id'] not in existing]
 
-            self._create(tables.domains, domain_values)
+            if values:
+                self._create_many(tables.domains, values)
         except Exception:
             with excutils.save_and_reraise_exception():
                 self.session.rollback()
         else:
             self.session.commit()
 
-        self.mdns_api.notify_zone_changed(
-            context, domain, self.host, self.port, self.timeout,
-            self.retry_interval, self.max_retries, self.delay)
-
     def delete_domain(self, context, domain):
         # TODO(kiall): We should make this match create_domain with regard to
         #              transactions.
@@ -163,3 +255,28 @@ class PowerDNSBackend(base.Backend):
         self._delete(tables.domains, domain['id'],
                      exceptions.DomainNotFound,
                      id_col=tables.domains.c.designate_id)
+
+    def delete_domains(self, context, domains):
+        results = []
+
+        for start in range(0, len(domains), self.bulk_size):
+            batch = domains[start:start + self.bulk_size]
+            ids = [domain['id'] for domain in batch]
+
+            try:
+                deleted = self._delete_many(
+                    tables.domains, ids, tables.domains.c.designate_id)
+            except Exception as e:
+                results.extend([e] * len(batch))
+                continue
+
+            if deleted is not None:
+                for domain_id in set(ids) - deleted:
+                    # If the Domain is already gone, that's ok.
+                    LOG.critical(_LC('Attempted to delete a domain which is '
+                                     'not present in the backend. ID: %s') %
+                                 domain_id)
+
+            results.extend([None] * len(batch))
+
+        return results
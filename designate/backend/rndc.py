@@ -0,0 +1,393 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+A client for the BIND9 control channel, the protocol spoken by ``rndc``.
+
+Messages are nested tables of binary values, signed with an HMAC of the
+shared rndc key. A connection is authenticated once, by fetching a nonce with
+a ``null`` command, and after that carries any number of commands. Keeping
+connections open avoids forking ``rndc`` and repeating that handshake for
+every single command.
+"""
+import base64
+import collections
+import hashlib
+import hmac
+import random
+import re
+import socket
+import struct
+import time
+
+import six
+from eventlet import semaphore
+from oslo_log import log as logging
+
+from designate import exceptions
+from designate.backend import batch
+
+LOG = logging.getLogger(__name__)
+
+MESSAGE_VERSION = 1
+
+TYPE_BINARY = 1
+TYPE_TABLE = 2
+
+ALGORITHMS = {
+    'md5': 157,
+    'sha1': 161,
+    'sha224': 162,
+    'sha256': 163,
+    'sha384': 164,
+    'sha512': 165,
+}
+
+KEY_RE = re.compile(
+    r'key\s+"?(?P<name>[^"\s{]+)"?\s*\{(?P<body>[^}]*)\}', re.DOTALL)
+ALGORITHM_RE = re.compile(r'algorithm\s+"?(?P<algorithm>[\w-]+)"?\s*;')
+SECRET_RE = re.compile(r'secret\s+"(?P<secret>[^"]+)"\s*;')
+DEFAULT_KEY_RE = re.compile(r'default-key\s+"?(?P<name>[^"\s;]+)"?\s*;')
+
+
+def load_key(key_file=None, config_file=None):
+    """
+    Find the rndc key the same way ``rndc`` does, from the key file if one
+    is given, and otherwise from the default key of the rndc config file.
+
+    :return: A tuple of the algorithm and base64 encoded secret, or None when
+             no usable key is found.
+    """
+    for path in (key_file, config_file):
+        if not path:
+            continue
+
+        with open(path) as f:
+            text = f.read()
+
+        default = DEFAULT_KEY_RE.search(text)
+        for match in KEY_RE.finditer(text):
+            if default and match.group('name') != default.group('name'):
+                continue
+
+            algorithm = ALGORITHM_RE.search(match.group('body'))
+            secret = SECRET_RE.search(match.group('body'))
+            if algorithm and secret:
+                return algorithm.group('algorithm'), secret.group('secret')
+
+    return None
+
+
+def serialize(table):
+    """Serialize an ordered table of strings, bytes and nested tables"""
+    data = b''
+
+    for key, value in table.items():
+        data += struct.pack('B', len(key)) + key.encode('ascii')
+
+        if isinstance(value, dict):
+            value = serialize(value)
+            data += struct.pack('>BI', TYPE_TABLE, len(value)) + value
+        else:
+            if isinstance(value, six.text_type):
+                value = value.encode('utf-8')
+            data += struct.pack('>BI', TYPE_BINARY, len(value)) + bytes(value)
+
+    return data
+
+
+def parse(data):
+    """Parse a serialized table back into an OrderedDict"""
+    data = bytearray(data)
+    table = collections.OrderedDict()
+    pos = 0
+
+    while pos < len(data):
+        length = data[pos]
+        key = bytes(data[pos + 1:pos + 1 + length]).decode('ascii')
+        pos += 1 + length
+
+        value_type, value_length = struct.unpack(
+            '>BI', bytes(data[pos:pos + 5]))
+        pos += 5
+        value = bytes(data[pos:pos + value_length])
+        pos += value_length
+
+        if value_type == TYPE_TABLE:
+            value = parse(value)
+        elif value_type != TYPE_BINARY:
+            raise exceptions.RndcProtocolError(
+                'Unsupported rndc value type %d' % value_type)
+
+        table[key] = value
+
+    return table
+
+
+class RndcConnection(object):
+    """A single authenticated control channel connection"""
+
+    def __init__(self, host, port, algorithm, secret, timeout=10):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+        algorithm = algorithm.lower()
+        if algorithm.startswith('hmac-'):
+            algorithm = algorithm[5:]
+
+        if algorithm not in ALGORITHMS:
+            raise exceptions.ConfigurationError(
+                'Unsupported rndc key algorithm: %s' % algorithm)
+
+        self.algorithm = algorithm
+        self.digest = getattr(hashlib, algorithm)
+        self.secret = base64.b64decode(secret)
+
+        self._serial = random.randint(0, 1 << 24)
+        self._nonce = None
+        self._sock = None
+
+    def connect(self):
+        self._sock = socket.create_connection(
+            (self.host, self.port), self.timeout)
+        self._nonce = None
+
+        # The server hands out the nonce which every later command on this
+        # connection must carry.
+        response = self.call_many(['null'], check=False)[0]
+        self._nonce = response['_ctrl'].get('_nonce')
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def call_many(self, commands, check=True):
+        """
+        Send every command before reading any responses, and return the
+        ``_data`` table of each response in order.
+        """
+        if self._sock is None:
+            self.connect()
+
+        serials = []
+        messages = []
+        for command in commands:
+            serial, message = self._build(command)
+            serials.append(serial)
+            messages.append(message)
+
+        try:
+            self._sock.sendall(b''.join(messages))
+            responses = [self._read() for _ in commands]
+        except Exception:
+            self.close()
+            raise
+
+        for serial, response in zip(serials, responses):
+            if response['_ctrl'].get('_ser') != serial:
+                self.close()
+                raise exceptions.RndcProtocolError(
+                    'Out of order rndc response from %s:%s' %
+                    (self.host, self.port))
+
+        if not check:
+            return responses
+
+        return [response['_data'] for response in responses]
+
+    def _sign(self, table):
+        mac = hmac.new(self.secret, serialize(table), self.digest)
+        return base64.b64encode(mac.digest())
+
+    def _build(self, command):
+        self._serial += 1
+        serial = str(self._serial).encode('ascii')
+        now = int(time.time())
+
+        ctrl = collections.OrderedDict()
+        ctrl['_ser'] = serial
+        ctrl['_tim'] = str(now)
+        ctrl['_exp'] = str(now + 60)
+        if self._nonce is not None:
+            ctrl['_nonce'] = self._nonce
+
+        data = collections.OrderedDict()
+        data['type'] = command
+
+        table = collections.OrderedDict()
+        table['_ctrl'] = ctrl
+        table['_data'] = data
+
+        signature = self._sign(table)
+
+        auth = collections.OrderedDict()
+        if self.algorithm == 'md5':
+            auth['hmd5'] = struct.pack('22s', signature)
+        else:
+            auth['hsha'] = struct.pack(
+                'B88s', ALGORITHMS[self.algorithm], signature)
+
+        message = collections.OrderedDict()
+        message['_auth'] = auth
+        message.update(table)
+
+        body = serialize(message)
+        return serial, struct.pack('>II', len(body) + 4, MESSAGE_VERSION) + \
+            body
+
+    def _recv(self, length):
+        data = b''
+        while len(data) < length:
+            chunk = self._sock.recv(length - len(data))
+            if not chunk:
+                raise exceptions.RndcProtocolError(
+                    'Connection to %s:%s closed by the server' %
+                    (self.host, self.port))
+            data += chunk
+        return data
+
+    def _read(self):
+        length, version = struct.unpack('>II', self._recv(8))
+        if version != MESSAGE_VERSION:
+            raise exceptions.RndcProtocolError(
+                'Unsupported rndc message version %d' % version)
+
+        response = parse(self._recv(length - 4))
+        self._verify(response)
+
+        return response
+
+    def _verify(self, response):
+        auth = response.pop('_auth', {})
+
+        if self.algorithm == 'md5':
+            signature = auth.get('hmd5', b'')
+        else:
+            signature = auth.get('hsha', b'')[1:]
+
+        signature = signature.rstrip(b'\0').rstrip(b'=')
+        expected = self._sign(response).rstrip(b'=')
+
+        if not hmac.compare_digest(signature, expected):
+            raise exceptions.RndcProtocolError(
+                'Bad signature on rndc response from %s:%s' %
+                (self.host, self.port))
+
+        if self._nonce is not None and \
+                response['_ctrl'].get('_nonce') != self._nonce:
+            raise exceptions.RndcProtocolError(
+                'Bad nonce on rndc response from %s:%s' %
+                (self.host, self.port))
+
+
+class RndcClient(object):
+    """
+    Runs rndc commands over a small pool of persistent connections to one
+    server.
+    """
+    def __init__(self, host, port, algorithm, secret, pool_size=4,
+                 timeout=10):
+        self.host = host
+        self.port = port
+        self.algorithm = algorithm
+        self.secret = secret
+        self.timeout = timeout
+
+        self._idle = []
+        self._semaphore = semaphore.Semaphore(pool_size)
+
+    def call(self, command):
+        """
+        Run a single command.
+
+        :return: The text output of the command.
+        :raises: exceptions.Backend if the server reports a failure, or
+                 exceptions.RndcProtocolError / socket.error if the server
+                 could not be talked to.
+        """
+        return self.call_many([command])[0]
+
+    def call_many(self, commands, return_exceptions=False):
+        """
+        Pipeline several commands over one connection.
+
+        The commands are all run, even when some fail. The first failure is
+        raised once every response has been read, unless
+        ``return_exceptions`` is set, in which case each failure is returned
+        in place of the output of its command.
+        """
+        with self._semaphore:
+            connection = self._idle.pop() if self._idle else None
+
+            try:
+                if connection is None:
+                    connection = self._new_connection()
+                    responses = connection.call_many(commands)
+                else:
+                    try:
+                        responses = connection.call_many(commands)
+                    except (socket.error, exceptions.RndcProtocolError):
+                        # The server may well have dropped an idle
+                        # connection, so give a fresh one a try.
+                        LOG.debug('Reconnecting to rndc on %s:%s',
+                                  self.host, self.port)
+                        connection = self._new_connection()
+                        responses = connection.call_many(commands)
+            except Exception:
+                if connection is not None:
+                    connection.close()
+                raise
+
+            self._idle.append(connection)
+
+        results = self._results(commands, responses)
+
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+
+        return results
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+    def _new_connection(self):
+        connection = RndcConnection(self.host, self.port, self.algorithm,
+                                    self.secret, timeout=self.timeout)
+        connection.connect()
+        return connection
+
+    def _results(self, commands, responses):
+        results = []
+
+        for command, data in zip(commands, responses):
+            if data.get('result', b'0') != b'0':
+                error = data.get('err') or data.get('text') or b''
+                LOG.debug('RNDC call failure: %s: %s', command, error)
+                results.append(exceptions.Backend(
+                    "rndc: '%s' failed: %s" % (
+                        command.split(' ', 1)[0],
+                        error.decode('utf-8', 'replace'))))
+            else:
+                results.append(
+                    data.get('text', b'').decode('utf-8', 'replace'))
+
+        return results
+
+
+class RndcCommandQueue(batch.BatchQueue):
+    """Groups rndc commands submitted by many greenthreads into batches."""
@@ -0,0 +1,33 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from designate.blob_store.base import BlobStore
+
+LOG = logging.getLogger(__name__)
+
+cfg.CONF.register_opts([
+    cfg.StrOpt('blob-store-driver', default='filesystem',
+               help='The blob store driver to keep large zone exports in'),
+])
+
+
+def get_blob_store(blob_store_driver):
+    """Return the blob store instance from the provided driver name"""
+    LOG.debug("Loading blob store driver: %s" % blob_store_driver)
+
+    cls = BlobStore.get_driver(blob_store_driver)
+
+    return cls()
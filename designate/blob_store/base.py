@@ -0,0 +1,69 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import abc
+
+import six
+
+from designate.plugin import DriverPlugin
+
+
+@six.add_metaclass(abc.ABCMeta)
+class BlobStore(DriverPlugin):
+
+    """Base class for blob store plugins"""
+    __plugin_ns__ = 'designate.blob_store'
+    __plugin_type__ = 'blob_store'
+
+    @abc.abstractmethod
+    def create(self, context, key, chunks):
+        """
+        Store a blob, replacing any stored under the same key. Readers never
+        see a partially written blob.
+
+        :param context: Security context information
+        :param key: Key to store the blob under, a relative path like name
+        :param chunks: Iterable of byte strings making up the blob
+        """
+
+    @abc.abstractmethod
+    def get_size(self, context, key):
+        """
+        Get the size of a blob in bytes.
+
+        :param context: Security context information
+        :param key: Key of the blob
+        :raises BlobNotFound: If there is no blob stored under the key
+        """
+
+    @abc.abstractmethod
+    def read(self, context, key, start=0, stop=None):
+        """
+        Read a blob, or a range of it, in chunks.
+
+        :param context: Security context information
+        :param key: Key of the blob
+        :param start: Offset of the first byte to read
+        :param stop: Offset to stop reading at, None reads to the end
+        :return: An iterator of byte strings
+        :raises BlobNotFound: If there is no blob stored under the key
+        """
+
+    @abc.abstractmethod
+    def delete(self, context, key):
+        """
+        Delete a blob, if there is one stored under the key.
+
+        :param context: Security context information
+        :param key: Key of the blob
+        """
@@ -0,0 +1,124 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import errno
+import os
+import tempfile
+
+from oslo_config import cfg
+
+from designate import exceptions
+from designate.blob_store import base
+
+cfg.CONF.register_group(cfg.OptGroup(
+    name='blob_store:filesystem',
+    title="Configuration for the filesystem Blob Store"
+))
+
+cfg.CONF.register_opts([
+    cfg.StrOpt('path', default='$state_path/blobs',
+               help='Directory to keep blobs in. For the API to serve blobs '
+                    'written by other services, this has to be shared '
+                    'between their hosts'),
+], group='blob_store:filesystem')
+
+CHUNK_SIZE = 65536
+
+
+class FilesystemBlobStore(base.BlobStore):
+    __plugin_name__ = 'filesystem'
+
+    def __init__(self):
+        super(FilesystemBlobStore, self).__init__()
+
+        self.path = os.path.normpath(
+            cfg.CONF['blob_store:filesystem'].path)
+
+    def _path(self, key):
+        path = os.path.normpath(os.path.join(self.path, key))
+
+        if not path.startswith(os.path.join(self.path, '')):
+            raise exceptions.BadRequest('Invalid blob key %s' % key)
+
+        return path
+
+    def _open(self, key):
+        try:
+            return open(self._path(key), 'rb')
+        except IOError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            raise exceptions.BlobNotFound('Blob %s not found' % key)
+
+    def create(self, context, key, chunks):
+        path = self._path(key)
+        directory = os.path.dirname(path)
+
+        try:
+            os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+
+            os.rename(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def get_size(self, context, key):
+        try:
+            return os.path.getsize(self._path(key))
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            raise exceptions.BlobNotFound('Blob %s not found' % key)
+
+    def read(self, context, key, start=0, stop=None):
+        # Open the blob straight away, so a missing one is noticed before
+        # it is read from.
+        f = self._open(key)
+
+        def _read():
+            try:
+                f.seek(start)
+                remaining = None if stop is None else stop - start
+
+                while remaining is None or remaining > 0:
+                    size = CHUNK_SIZE
+                    if remaining is not None:
+                        size = min(size, remaining)
+
+                    chunk = f.read(size)
+                    if not chunk:
+                        return
+
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                    yield chunk
+            finally:
+                f.close()
+
+        return _read()
+
+    def delete(self, context, key):
+        try:
+            os.unlink(self._path(key))
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
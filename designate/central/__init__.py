@@ -39,6 +39,12 @@ cfg.CONF.register_opts([
                default="00000000-0000-0000-0000-000000000000",
                help="The Tenant ID that will own any managed resources."),
     cfg.IntOpt('min_ttl', default=None, help="Minimum TTL allowed"),
+    cfg.IntOpt('import_batch_size', default=1000,
+               help="Number of records inserted at once when importing a "
+                    "zonefile"),
+    cfg.IntOpt('import_progress_interval', default=10,
+               help="Seconds between progress updates to a running zone "
+                    "import"),
     # TODO(betsy): Move to Pool Service once that is written
     cfg.StrOpt('default_pool_id',
                default='794ccc2c-d751-44fe-b57f-8894c9f5c842',
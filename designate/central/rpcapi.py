@@ -52,14 +52,16 @@ class CentralAPI(object):
         5.3 - Add Zone Export method
         5.4 - Add asynchronous Zone Export methods
         5.5 - Add deleted zone purging task
+        5.6 - Add update_managed_records
+        5.7 - Add get_domain_version
     """
-    RPC_API_VERSION = '5.5'
+    RPC_API_VERSION = '5.7'
 
     def __init__(self, topic=None):
         topic = topic if topic else cfg.CONF.central_topic
 
         target = messaging.Target(topic=topic, version=self.RPC_API_VERSION)
-        self.client = rpc.get_client(target, version_cap='5.5')
+        self.client = rpc.get_client(target, version_cap='5.7')
 
     @classmethod
     def get_instance(cls):
@@ -75,6 +77,15 @@ class CentralAPI(object):
             CENTRAL_API = cls()
         return CENTRAL_API
 
+    @classmethod
+    def reset_instance(cls):
+        """
+        Drop the shared instance, so the next one is created on the current
+        transport.
+        """
+        global CENTRAL_API
+        CENTRAL_API = None
+
     # Misc Methods
     def get_absolute_limits(self, context):
         LOG.info(_LI("get_absolute_limits: "
@@ -152,6 +163,12 @@ class CentralAPI(object):
         LOG.info(_LI("get_domain: Calling central's get_domain."))
         return self.client.call(context, 'get_domain', domain_id=domain_id)
 
+    def get_domain_version(self, context, domain_id):
+        LOG.info(_LI("get_domain_version: "
+                     "Calling central's get_domain_version."))
+        cctxt = self.client.prepare(version='5.7')
+        return cctxt.call(context, 'get_domain_version', domain_id=domain_id)
+
     def get_domain_servers(self, context, domain_id):
         LOG.info(_LI("get_domain_servers: "
                      "Calling central's get_domain_servers."))
@@ -307,6 +324,15 @@ class CentralAPI(object):
                                 record_id=record_id,
                                 increment_serial=increment_serial)
 
+    def update_managed_records(self, context, domain_id, recordsets,
+                               criteria):
+        LOG.info(_LI("update_managed_records: Calling central's "
+                     "update_managed_records."))
+        cctxt = self.client.prepare(version='5.6')
+        return cctxt.call(context, 'update_managed_records',
+                          domain_id=domain_id, recordsets=recordsets,
+                          criteria=criteria)
+
     def count_records(self, context, criterion=None):
         LOG.info(_LI("count_records: Calling central's count_records."))
         return self.client.call(context, 'count_records', criterion=criterion)
@@ -18,6 +18,7 @@ import re
 import collections
 import copy
 import functools
+import hashlib
 import threading
 import itertools
 import string
@@ -25,7 +26,7 @@ import random
 import time
 
 import six
-from eventlet import tpool
+import eventlet
 from dns import zone as dnszone
 from dns import exception as dnsexception
 from oslo_config import cfg
@@ -35,6 +36,7 @@ from oslo_utils import excutils
 from oslo_concurrency import lockutils
 from oslo_db import exception as db_exception
 
+from designate.i18n import _LE
 from designate.i18n import _LI
 from designate.i18n import _LC
 from designate.i18n import _LW
@@ -259,8 +261,68 @@ def notification(notification_type):
     return outer
 
 
+class ZoneImportProgress(object):
+    """
+    Reports how far through its zonefile a zone import is.
+
+    The import runs in a single transaction, so progress is written to the
+    ZoneImport from a greenthread of its own, with its own database session,
+    at most every import_progress_interval seconds. Nothing is reported when
+    the storage can't take that write until the import's transaction ends.
+    """
+    def __init__(self, storage, context, zone_import, total_lines):
+        self.storage = storage
+        self.context = context
+        self.zone_import = zone_import
+        self.total_lines = total_lines
+        self.interval = cfg.CONF['service:central'].import_progress_interval
+        self.enabled = storage.concurrent_writes()
+
+        self._reported_at = time.time()
+        self._reporter = None
+
+    def __deepcopy__(self, memo):
+        # The transaction's retry decorator deep copies its arguments, but
+        # progress must still be reported to the same ZoneImport
+        return self
+
+    def update(self, line_number):
+        if not self.enabled:
+            return
+
+        if self._reporter is not None and not self._reporter.dead:
+            return
+
+        if time.time() - self._reported_at < self.interval:
+            return
+
+        self._reported_at = time.time()
+        self._reporter = eventlet.spawn(self._report, line_number)
+
+    def _report(self, line_number):
+        # Storage refreshes the object it updates from the database, so the
+        # progress goes through an object of its own, leaving the caller's
+        # ZoneImport free to take the result of the import.
+        zone_import = objects.ZoneImport(
+            id=self.zone_import.id,
+            tenant_id=self.zone_import.tenant_id,
+            message='Imported %(line)d of %(total)d lines' % {
+                'line': line_number, 'total': self.total_lines})
+        zone_import.obj_reset_changes(['id', 'tenant_id'])
+
+        try:
+            self.storage.update_zone_import(self.context, zone_import)
+        except Exception:
+            LOG.warning(_LW('Failed to update the progress of zone import '
+                            '%(id)s'), {'id': self.zone_import.id})
+
+    def wait(self):
+        if self._reporter is not None:
+            self._reporter.wait()
+
+
 class Service(service.RPCService, service.Service):
-    RPC_API_VERSION = '5.5'
+    RPC_API_VERSION = '5.7'
 
     target = messaging.Target(version=RPC_API_VERSION)
 
@@ -276,6 +338,9 @@ class Service(service.RPCService, service.Service):
 
         self.network_api = network_api.get_network_api(cfg.CONF.network_api)
 
+        # Reverse zone name -> id, saving a lookup on every FloatingIP PTR set
+        self._reverse_zone_ids = {}
+
     @property
     def service_name(self):
         return 'central'
@@ -791,6 +856,17 @@ class Service(service.RPCService, service.Service):
     @notification('dns.domain.create')
     @synchronized_domain(new_domain=True)
     def create_domain(self, context, domain):
+        subdomains = self._prepare_create_domain(context, domain)
+
+        domain = self._create_domain_in_storage(context, domain)
+
+        return self._finish_create_domain(context, domain, subdomains)
+
+    def _prepare_create_domain(self, context, domain):
+        """
+        Validate a new domain and fill in its defaults, returning any
+        existing subdomains of it.
+        """
         # TODO(kiall): Refactor this method into *MUCH* smaller chunks.
         # Default to creating in the current users tenant
         if domain.tenant_id is None:
@@ -858,8 +934,9 @@ class Service(service.RPCService, service.Service):
         if domain.type == 'SECONDARY' and domain.serial is None:
             domain.serial = 1
 
-        domain = self._create_domain_in_storage(context, domain)
+        return subdomains
 
+    def _finish_create_domain(self, context, domain, subdomains):
         self.pool_manager_api.create_domain(context, domain)
 
         if domain.type == 'SECONDARY':
@@ -912,6 +989,22 @@ class Service(service.RPCService, service.Service):
 
         return domain
 
+    def get_domain_version(self, context, domain_id):
+        """
+        Get a Domain with only its serial and version loaded, which together
+        change whenever the Domain or any of its RecordSets change.
+        """
+        domain = self.storage.get_domain_version(context, domain_id)
+
+        target = {
+            'domain_id': domain_id,
+            'domain_name': domain.name,
+            'tenant_id': domain.tenant_id
+        }
+        policy.check('get_domain', context, target)
+
+        return domain
+
     def get_domain_servers(self, context, domain_id=None, criterion=None):
 
         if domain_id is None:
@@ -1036,6 +1129,8 @@ class Service(service.RPCService, service.Service):
             raise exceptions.DomainHasSubdomain('Please delete any subdomains '
                                                 'before deleting this domain')
 
+        self._reverse_zone_ids.pop(domain.name, None)
+
         if hasattr(context, 'abandon') and context.abandon:
             LOG.info(_LW("Abandoning zone '%(zone)s'") % {'zone': domain.name})
             domain = self.storage.delete_domain(context, domain.id)
@@ -1628,6 +1723,120 @@ class Service(service.RPCService, service.Service):
 
         return (record, domain)
 
+    @notification('dns.domain.update')
+    @synchronized_domain()
+    def update_managed_records(self, context, domain_id, recordsets,
+                               criteria):
+        """
+        Create and delete many records in a domain at once, incrementing the
+        domain's serial and updating the pool once for the whole lot.
+
+        :param recordsets: RecordSetList of the records to create, grouped by
+                           name and type. Missing recordsets are created,
+                           records already present are left alone.
+        :param criteria: A list of criterion, records matching any of them are
+                         deleted before any records are created.
+        """
+        domain = self.storage.get_domain(context, domain_id)
+
+        # Don't allow updates to zones that are being deleted
+        if domain.action == 'DELETE':
+            raise exceptions.BadRequest('Can not update a deleting zone')
+
+        target = {
+            'domain_id': domain_id,
+            'domain_name': domain.name,
+            'domain_type': domain.type,
+            'tenant_id': domain.tenant_id
+        }
+
+        policy.check('create_record', context, target)
+        policy.check('delete_record', context, target)
+
+        domain, changes = self._update_managed_records_in_storage(
+            context, domain, recordsets, criteria)
+
+        # Only queued now the transaction has been committed, so nothing is
+        # sent for a rolled back or retried attempt.
+        for notification_type, record in changes:
+            self._queue_notification(context, notification_type, record)
+
+        if changes:
+            self.pool_manager_api.update_domain(context, domain)
+
+        return domain
+
+    @transaction
+    def _update_managed_records_in_storage(self, context, domain, recordsets,
+                                           criteria):
+        """
+        :return: The domain, and a list of (notification type, record) for
+                 every record changed.
+        """
+        changes = []
+
+        deleted = {}
+        for criterion in criteria:
+            criterion = dict(criterion, domain_id=domain.id)
+            for record in self.storage.find_records(context, criterion):
+                if record.action != 'DELETE':
+                    deleted[record.id] = record
+
+        if not deleted and not any(rs.records for rs in recordsets):
+            return domain, changes
+
+        domain = self._update_domain_in_storage(context, domain)
+
+        for record in deleted.values():
+            record, domain = self._delete_record_in_storage(
+                context, domain, record, increment_serial=False)
+            changes.append(('dns.record.delete', record))
+
+        for recordset in recordsets:
+            records = recordset.records
+
+            try:
+                existing = self.storage.find_recordset(context, {
+                    'domain_id': domain.id,
+                    'name': recordset.name,
+                    'type': recordset.type,
+                })
+            except exceptions.RecordSetNotFound:
+                recordset.records = objects.RecordList()
+                existing, domain = self._create_recordset_in_storage(
+                    context, domain, recordset, increment_serial=False)
+
+            present = dict((r.data, r) for r in existing.records)
+
+            for record in records:
+                current = present.get(record.data)
+
+                if current is None:
+                    record, domain = self._create_record_in_storage(
+                        context, domain, existing, record,
+                        increment_serial=False)
+                    changes.append(('dns.record.create', record))
+
+                elif current.action == 'DELETE':
+                    # Deleted then created again, take the record back
+                    # rather than clash with its hash.
+                    for field in record.obj_what_changed():
+                        setattr(current, field, record[field])
+                    current.action = 'UPDATE'
+                    current.status = 'PENDING'
+                    current.serial = domain.serial
+                    record = self.storage.update_record(context, current)
+                    changes.append(('dns.record.update', record))
+
+        return domain, changes
+
+    @staticmethod
+    def _queue_notification(context, notification_type, result):
+        # Used by methods wrapped by @notification for the notifications of
+        # the many objects they change, emitted along with their own.
+        NOTIFICATION_BUFFER.queue.appendleft(
+            (context, notification_type, result))
+
     def count_records(self, context, criterion=None):
         if criterion is None:
             criterion = {}
@@ -1728,13 +1937,21 @@ class Service(service.RPCService, service.Service):
         elevated_context.all_tenants = True
         elevated_context.edit_managed_records = True
 
-        criterion = {
-            'managed': True,
-            'managed_resource_type': 'ptr:floatingip',
-        }
+        # NOTE: Only the records for this tenant's FIP addresses matter, any
+        # tenant's record for one of those addresses is looked up so a stale
+        # one can be invalidated.
+        addresses = [fip['address'] for fip in fips.values()]
+
+        records = {}
+        if addresses:
+            criterion = {
+                'managed': True,
+                'managed_resource_type': 'ptr:floatingip',
+                'managed_extra': addresses,
+            }
 
-        records = self.find_records(elevated_context, criterion)
-        records = dict([(r['managed_extra'], r) for r in records])
+            records = self.find_records(elevated_context, criterion)
+            records = dict([(r['managed_extra'], r) for r in records])
 
         invalid = []
         data = {}
@@ -1784,6 +2001,30 @@ class Service(service.RPCService, service.Service):
         elevated_context = context.elevated()
         elevated_context.all_tenants = True
 
+        recordsets = dict(recordsets or {})
+        domains = {}
+
+        # Load all the recordsets and zones needed in one query each, rather
+        # than one or two per FIP.
+        recordset_ids = set(
+            record['recordset_id'] for _, record in data.values()
+            if record and record['recordset_id'] not in recordsets)
+
+        if recordset_ids:
+            recordsets.update(
+                (rs.id, rs) for rs in self.storage.find_recordsets(
+                    elevated_context, {'id': list(recordset_ids)}))
+
+        domain_ids = set(
+            record['domain_id'] for _, record in data.values()
+            if record and record['recordset_id'] in recordsets and
+            recordsets[record['recordset_id']]['ttl'] is None)
+
+        if domain_ids:
+            domains.update(
+                (d.id, d) for d in self.storage.find_domains_summary(
+                    elevated_context, {'id': list(domain_ids)}))
+
         fips = objects.FloatingIPList()
         for key, value in data.items():
             fip, record = value
@@ -1805,19 +2046,18 @@ class Service(service.RPCService, service.Service):
                 fip_ptr['action'] = record.action
                 fip_ptr['status'] = record.status
 
-                # We can have a recordset dict passed in
-                if (recordsets is not None and
-                        record['recordset_id'] in recordsets):
-                    recordset = recordsets[record['recordset_id']]
-                else:
+                recordset = recordsets.get(record['recordset_id'])
+                if recordset is None:
                     recordset = self.storage.get_recordset(
                         elevated_context, record['recordset_id'])
 
                 if recordset['ttl'] is not None:
                     fip_ptr['ttl'] = recordset['ttl']
                 else:
-                    zone = self.get_domain(
-                        elevated_context, record['domain_id'])
+                    zone = domains.get(record['domain_id'])
+                    if zone is None:
+                        zone = self.get_domain(
+                            elevated_context, record['domain_id'])
                     fip_ptr['ttl'] = zone['ttl']
 
                 fip_ptr['ptrdname'] = record['data']
@@ -1902,6 +2142,30 @@ class Service(service.RPCService, service.Service):
 
         zone_name = self.network_api.address_zone(fip['address'])
 
+        try:
+            return self._set_floatingip_record(
+                context, elevated_context, region, floatingip_id, fip,
+                zone_name, values)
+        except exceptions.DomainNotFound:
+            # NOTE: The cached reverse zone may have been deleted through
+            # another central, look it up again.
+            if self._reverse_zone_ids.pop(zone_name, None) is None:
+                raise
+
+            return self._set_floatingip_record(
+                context, elevated_context, region, floatingip_id, fip,
+                zone_name, values)
+
+    def _get_reverse_zone_id(self, elevated_context, region, floatingip_id,
+                             fip, zone_name):
+        """
+        Get the id of the reverse zone for a FloatingIP, creating the zone
+        if needs be.
+        """
+        zone_id = self._reverse_zone_ids.get(zone_name)
+        if zone_id is not None:
+            return zone_id
+
         # NOTE: Find existing zone or create it..
         try:
             zone = self.storage.find_domain(
@@ -1927,6 +2191,14 @@ class Service(service.RPCService, service.Service):
             zone = self.create_domain(
                 elevated_context, objects.Domain(**zone_values))
 
+        self._reverse_zone_ids[zone_name] = zone['id']
+        return zone['id']
+
+    def _set_floatingip_record(self, context, elevated_context, region,
+                               floatingip_id, fip, zone_name, values):
+        zone_id = self._get_reverse_zone_id(
+            elevated_context, region, floatingip_id, fip, zone_name)
+
         record_name = self.network_api.address_name(fip['address'])
 
         recordset_values = {
@@ -1943,7 +2215,7 @@ class Service(service.RPCService, service.Service):
             recordset.name = recordset_values['name']
             recordset.type = recordset_values['type']
             recordset.ttl = recordset_values['ttl']
-            recordset.domain_id = zone['id']
+            recordset.domain_id = zone_id
             recordset = self.update_recordset(
                 elevated_context,
                 recordset=recordset)
@@ -1960,7 +2232,7 @@ class Service(service.RPCService, service.Service):
         except exceptions.RecordSetNotFound:
             recordset = self.create_recordset(
                 elevated_context,
-                domain_id=zone['id'],
+                domain_id=zone_id,
                 recordset=objects.RecordSet(**recordset_values))
 
         record_values = {
@@ -1976,7 +2248,7 @@ class Service(service.RPCService, service.Service):
 
         record = self.create_record(
             elevated_context,
-            domain_id=zone['id'],
+            domain_id=zone_id,
             recordset_id=recordset['id'],
             record=objects.Record(**record_values))
 
@@ -2539,67 +2811,206 @@ class Service(service.RPCService, service.Service):
         return created_zone_import
 
     def _import_zone(self, context, zone_import, request_body):
+        progress = ZoneImportProgress(
+            self.storage, context, zone_import, request_body.count('\n') + 1)
 
-        def _import(self, context, zone_import, request_body):
-            # Dnspython needs a str instead of a unicode object
-            if six.PY2:
-                request_body = str(request_body)
-            domain = None
+        try:
             try:
-                dnspython_zone = dnszone.from_text(
-                    request_body,
-                    # Don't relativize, or we end up with '@' record names.
-                    relativize=False,
-                    # Dont check origin, we allow missing NS records
-                    # (missing SOA records are taken care of in _create_zone).
-                    check_origin=False)
-                domain = dnsutils.from_dnspython_zone(dnspython_zone)
-                domain.type = 'PRIMARY'
-
-                for rrset in list(domain.recordsets):
-                    if rrset.type in ('NS', 'SOA'):
-                        domain.recordsets.remove(rrset)
-
-            except dnszone.UnknownOrigin:
-                zone_import.message = ('The $ORIGIN statement is required and'
-                                      ' must be the first statement in the'
-                                      ' zonefile.')
-                zone_import.status = 'ERROR'
-            except dnsexception.SyntaxError:
-                zone_import.message = 'Malformed zonefile.'
-                zone_import.status = 'ERROR'
-            except exceptions.BadRequest:
-                zone_import.message = 'An SOA record is required.'
-                zone_import.status = 'ERROR'
-            except Exception:
-                zone_import.message = 'An undefined error occured.'
-                zone_import.status = 'ERROR'
+                # Passed by keyword, so the new domain lock is taken as it is
+                # by create_domain, rather than one named after the zonefile
+                zone = self._create_domain_from_zonefile(
+                    context, request_body=request_body, progress=progress)
+            finally:
+                # Don't let a progress update land on top of the result
+                progress.wait()
+        except dnszone.UnknownOrigin:
+            zone_import.message = ('The $ORIGIN statement is required and'
+                                  ' must be the first statement in the'
+                                  ' zonefile.')
+            zone_import.status = 'ERROR'
+        except dnsexception.SyntaxError:
+            zone_import.message = 'Malformed zonefile.'
+            zone_import.status = 'ERROR'
+        except dnszone.NoSOA:
+            zone_import.message = 'An SOA record is required.'
+            zone_import.status = 'ERROR'
+        except exceptions.DuplicateDomain:
+            zone_import.status = 'ERROR'
+            zone_import.message = 'Duplicate zone.'
+        except exceptions.InvalidTTL as e:
+            zone_import.status = 'ERROR'
+            zone_import.message = e.message
+        except Exception:
+            LOG.exception(_LE('Failed to import zone'))
+            zone_import.message = 'An undefined error occured.'
+            zone_import.status = 'ERROR'
+        else:
+            zone_import.status = 'COMPLETE'
+            zone_import.domain_id = zone.id
+            zone_import.message = '%(name)s imported' % {'name': zone.name}
 
-            return domain, zone_import
+        self.update_zone_import(context, zone_import)
 
-        # Execute the import in a real Python thread
-        domain, zone_import = tpool.execute(_import, self, context,
-            zone_import, request_body)
+    @notification('dns.domain.create')
+    @synchronized_domain(new_domain=True)
+    def _create_domain_from_zonefile(self, context, request_body, progress):
+        domain, subdomains = self._import_domain_in_storage(
+            context, request_body, progress)
 
-        # If the zone import was valid, create the domain
-        if zone_import.status != 'ERROR':
-            try:
-                zone = self.create_domain(context, domain)
-                zone_import.status = 'COMPLETE'
-                zone_import.domain_id = zone.id
-                zone_import.message = '%(name)s imported' % {'name':
-                                                             zone.name}
-            except exceptions.DuplicateDomain:
-                zone_import.status = 'ERROR'
-                zone_import.message = 'Duplicate zone.'
-            except exceptions.InvalidTTL as e:
-                zone_import.status = 'ERROR'
-                zone_import.message = e.message
-            except Exception:
-                zone_import.message = 'An undefined error occured.'
-                zone_import.status = 'ERROR'
+        return self._finish_create_domain(context, domain, subdomains)
 
-        self.update_zone_import(context, zone_import)
+    @transaction
+    def _import_domain_in_storage(self, context, request_body, progress):
+        reader = dnsutils.ZoneFileReader(request_body)
+        records = iter(reader)
+
+        # The domain is created from the SOA, so any records ahead of it in
+        # the zonefile are held back until it has been read.
+        held = []
+        domain = None
+
+        for record in records:
+            name, ttl, rdtype, rdata = record
+            if rdtype == 'SOA' and name == reader.origin.to_text():
+                domain = dnsutils.from_dnspython_soa(name, ttl, rdata)
+                break
+            held.append(record)
+
+        if domain is None:
+            raise dnszone.NoSOA()
+
+        domain.type = 'PRIMARY'
+
+        subdomains = self._prepare_create_domain(context, domain)
+        domain = self._create_domain_in_storage(context, domain)
+
+        self._import_recordsets(
+            context, domain, itertools.chain(held, records), reader,
+            progress)
+
+        return domain, subdomains
+
+    def _import_recordsets(self, context, domain, records, reader, progress):
+        """
+        Insert the records read from a zonefile in multi-row batches,
+        validating each batch as a whole instead of querying the database
+        for every recordset as _create_recordset_in_storage does.
+        """
+        batch_size = cfg.CONF['service:central'].import_batch_size
+
+        # Records of a recordset may be spread across the zonefile, so every
+        # recordset seen so far is kept as (name, type) -> [id, ttl, the
+        # RecordSet while it is still to be inserted].
+        recordsets = {}
+        cname_names = set()
+        other_names = set()
+        record_hashes = set()
+        valid_ttls = set()
+        ttl_updates = {}
+
+        recordset_count = self.storage.count_recordsets(
+            context, {'domain_id': domain.id})
+
+        new_recordsets = []
+        new_records = []
+
+        def check_ttl(ttl):
+            if ttl and ttl not in valid_ttls:
+                self._is_valid_ttl(context, ttl)
+                valid_ttls.add(ttl)
+
+        def flush():
+            # As with _enforce_recordset_quota, the quota is checked against
+            # the count before the last recordset is created.
+            self.quota.limit_check(context, domain.tenant_id,
+                                   domain_recordsets=recordset_count - 1)
+
+            self.storage.create_recordsets(context, domain.id, new_recordsets)
+            self.storage.create_records(context, domain.id, new_records)
+
+            for recordset in new_recordsets:
+                recordsets[(recordset.name, recordset.type)][2] = None
+
+            del new_recordsets[:]
+            del new_records[:]
+
+            progress.update(reader.line_number)
+
+            # This allows eventlet to yield, as importing a large zonefile
+            # can be very long-lived.
+            time.sleep(0)
+
+        for name, ttl, rdtype, rdata in records:
+            if rdtype in ('NS', 'SOA'):
+                continue
+
+            entry = recordsets.get((name, rdtype))
+
+            if entry is None:
+                self._is_valid_recordset_name(context, domain, name)
+                check_ttl(ttl)
+
+                # CNAME's must not be at the apex, or share a name with
+                # other recordsets.
+                if rdtype == 'CNAME':
+                    if name == domain.name:
+                        raise exceptions.InvalidRecordSetLocation(
+                            'CNAME recordsets may not be created at the '
+                            'zone apex')
+                    conflict = name in other_names
+                    cname_names.add(name)
+                else:
+                    conflict = name in cname_names
+                    other_names.add(name)
+
+                if conflict:
+                    raise exceptions.InvalidRecordSetLocation(
+                        'CNAME recordsets may not share a name with any '
+                        'other records')
+
+                recordset = objects.RecordSet(
+                    id=utils.generate_uuid(), name=name, type=rdtype,
+                    ttl=ttl or None)
+                entry = recordsets[(name, rdtype)] = [
+                    recordset.id, ttl, recordset]
+
+                new_recordsets.append(recordset)
+                recordset_count += 1
+
+            elif ttl < entry[1]:
+                # Like dnspython, a recordset takes the lowest TTL of its
+                # records.
+                check_ttl(ttl)
+                entry[1] = ttl
+
+                if entry[2] is not None:
+                    entry[2].ttl = ttl or None
+                else:
+                    ttl_updates[entry[0]] = ttl
+
+            data = rdata.to_text()
+
+            # Skip duplicate records, by the same hash storage uses to keep
+            # records unique.
+            record_hash = hashlib.md5(
+                ("%s:%s" % (entry[0], data)).encode('utf-8')).digest()
+            if record_hash in record_hashes:
+                continue
+            record_hashes.add(record_hash)
+
+            new_records.append(objects.Record(
+                data=data, recordset_id=entry[0], action='CREATE',
+                status='PENDING', serial=domain.serial))
+
+            if len(new_records) >= batch_size:
+                flush()
+
+        flush()
+
+        for recordset_id, ttl in ttl_updates.items():
+            recordset = self.storage.get_recordset(context, recordset_id)
+            recordset.ttl = ttl or None
+            self.storage.update_recordset(context, recordset)
 
     def find_zone_imports(self, context, criterion=None, marker=None,
                   limit=None, sort_key=None, sort_dir=None):
@@ -2702,4 +3113,10 @@ class Service(service.RPCService, service.Service):
 
         zone_export = self.storage.delete_zone_export(context, zone_export_id)
 
+        # Large exports are kept in the blob store, which is left to the zone
+        # manager to clean up.
+        if zone_export.location and zone_export.location.startswith('blob://'):
+            self.zone_manager_api.delete_export_blob(
+                context, zone_export.location)
+
         return zone_export
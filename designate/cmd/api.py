@@ -15,6 +15,7 @@
 # under the License.
 import sys
 
+from oslo_concurrency import processutils
 from oslo_config import cfg
 from oslo_log import log as logging
 
@@ -37,5 +38,6 @@ def main():
     hookpoints.log_hook_setup()
 
     server = api_service.Service(threads=CONF['service:api'].threads)
-    service.serve(server, workers=CONF['service:api'].workers)
+    workers = CONF['service:api'].workers or processutils.get_worker_count()
+    service.serve(server, workers=workers)
     service.wait()
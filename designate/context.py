@@ -31,6 +31,8 @@ class DesignateContext(context.RequestContext):
     _abandon = None
     original_tenant = None
     _edit_managed_records = False
+    _policy_values = None
+    _policy_decisions = None
 
     def __init__(self, auth_token=None, user=None, tenant=None, domain=None,
                  user_domain=None, project_domain=None, is_admin=False,
@@ -66,10 +68,29 @@ class DesignateContext(context.RequestContext):
         self.abandon = abandon
         self.edit_managed_records = edit_managed_records
 
+    def __setattr__(self, name, value):
+        # Any change to the context invalidates its memoized policy values,
+        # and the decisions made with them
+        self.__dict__['_policy_values'] = None
+        self.__dict__['_policy_decisions'] = None
+        super(DesignateContext, self).__setattr__(name, value)
+
     def deepcopy(self):
-        d = self.to_dict()
+        """
+        Return a copy of this context, which can be changed without changing
+        this one.
 
-        return self.from_dict(d)
+        Only the list of roles is copied, everything else, such as the
+        service catalog, is never changed in place so is shared.
+        """
+        context = copy.copy(self)
+        context.roles = list(self.roles)
+
+        # Keep the behaviour of the copy replacing this one as the current
+        # context, as it did when it was built through the constructor.
+        context.update_store()
+
+        return context
 
     def to_dict(self):
         d = super(DesignateContext, self).to_dict()
@@ -93,7 +114,7 @@ class DesignateContext(context.RequestContext):
         d.update({
             'user_identity': user_idt,
             'original_tenant': self.original_tenant,
-            'roles': self.roles,
+            'roles': list(self.roles),
             'service_catalog': self.service_catalog,
             'all_tenants': self.all_tenants,
             'abandon': self.abandon,
@@ -101,7 +122,34 @@ class DesignateContext(context.RequestContext):
             'tsigkey_id': self.tsigkey_id
         })
 
-        return copy.deepcopy(d)
+        return d
+
+    def to_policy_values(self):
+        """
+        Return the credentials policy checks are made against.
+
+        These are built once and reused until the context is changed, so the
+        dict returned must not be modified.
+        """
+        values = self._policy_values
+
+        # Roles can be changed in place, without going through __setattr__
+        if values is None or values['roles'] != self.roles:
+            values = self.to_dict()
+            self.__dict__['_policy_values'] = values
+            self.__dict__['_policy_decisions'] = {}
+
+        return values
+
+    @property
+    def policy_decisions(self):
+        """
+        Policy decisions made with the current policy values, kept by
+        designate.policy.check.
+        """
+        self.to_policy_values()
+
+        return self._policy_decisions
 
     @classmethod
     def from_dict(cls, values):
@@ -22,6 +22,11 @@ from threading import Lock
 import six
 import dns
 import dns.exception
+import dns.name
+import dns.rdata
+import dns.rdataclass
+import dns.tokenizer
+import dns.ttl
 import dns.zone
 import eventlet
 from dns import rdatatype
@@ -236,7 +241,13 @@ class ZoneLock(object):
 
 
 class LimitNotifyMiddleware(DNSMiddleware):
-    """Middleware that rate limits NOTIFYs to the Agent"""
+    """
+    Middleware that rate limits NOTIFYs to the Agent.
+
+    The first NOTIFY for a zone is passed on, and the Agent defers the
+    transfer it triggers by the delay. Any more NOTIFYs for the zone within
+    the delay are answered here, as that transfer will pick their changes up.
+    """
 
     def __init__(self, application):
         super(LimitNotifyMiddleware, self).__init__(application)
@@ -252,8 +263,7 @@ class LimitNotifyMiddleware(DNSMiddleware):
         zone_name = request.question[0].name.to_text()
 
         if self.locker.acquire(zone_name):
-            time.sleep(self.delay)
-            self.locker.release(zone_name)
+            # The lock is left to expire after the delay
             return None
         else:
             LOG.debug('Threw away NOTIFY for %(zone)s, already '
@@ -270,22 +280,168 @@ def from_dnspython_zone(dnspython_zone):
     soa = dnspython_zone.get_rdataset(dnspython_zone.origin, 'SOA')
     if soa is None:
         raise exceptions.BadRequest('An SOA record is required')
-    email = soa[0].rname.to_text().rstrip('.')
+
+    zone = from_dnspython_soa(dnspython_zone.origin.to_text(), soa.ttl, soa[0])
+
+    rrsets = dnspyrecords_to_recordsetlist(dnspython_zone.nodes)
+    zone.recordsets = rrsets
+    return zone
+
+
+def from_dnspython_soa(name, ttl, soa):
+    email = soa.rname.to_text().rstrip('.')
     email = email.replace('.', '@', 1)
     values = {
-        'name': dnspython_zone.origin.to_text(),
+        'name': name,
         'email': email,
-        'ttl': soa.ttl,
-        'serial': soa[0].serial,
-        'retry': soa[0].retry,
-        'expire': soa[0].expire
+        'ttl': ttl,
+        'serial': soa.serial,
+        'retry': soa.retry,
+        'expire': soa.expire
     }
 
-    zone = objects.Domain(**values)
+    return objects.Domain(**values)
 
-    rrsets = dnspyrecords_to_recordsetlist(dnspython_zone.nodes)
-    zone.recordsets = rrsets
-    return zone
+
+class ZoneFileReader(object):
+    """
+    Reads the records of a zonefile one at a time, as (name, ttl, type,
+    rdata) tuples with absolute names, rather than building a dnspython Zone
+    of the whole file like dns.zone.from_text.
+
+    As with from_text(relativize=False, check_origin=False), the origin of
+    the zone is set by the first $ORIGIN statement, and records which are
+    not within the zone are skipped.
+    """
+    def __init__(self, text):
+        # Dnspython needs a str instead of a unicode object
+        if six.PY2:
+            text = str(text)
+
+        self.tok = dns.tokenizer.Tokenizer(text)
+        self.origin = None
+        self._current_origin = None
+        self._last_name = None
+        self._ttl = 0
+
+    @property
+    def line_number(self):
+        return self.tok.where()[1]
+
+    def __iter__(self):
+        try:
+            while True:
+                token = self.tok.get(True, True)
+                if token.is_eof():
+                    break
+                elif token.is_eol():
+                    continue
+                elif token.is_comment():
+                    self.tok.get_eol()
+                    continue
+                elif token.value[0] == '$':
+                    self._directive(token.value.upper())
+                    continue
+
+                self.tok.unget(token)
+                record = self._rr_line()
+                if record is not None:
+                    yield record
+
+        except dns.exception.SyntaxError as e:
+            filename, line_number = self.tok.where()
+            raise dns.exception.SyntaxError(
+                "%s:%d: %s" % (filename, line_number, e))
+
+    def _directive(self, directive):
+        if directive == '$TTL':
+            token = self.tok.get()
+            if not token.is_identifier():
+                raise dns.exception.SyntaxError("bad $TTL")
+            self._ttl = dns.ttl.from_text(token.value)
+            self.tok.get_eol()
+
+        elif directive == '$ORIGIN':
+            self._current_origin = self.tok.get_name()
+            self.tok.get_eol()
+            if self.origin is None:
+                self.origin = self._current_origin
+                self._last_name = self._current_origin
+
+        else:
+            raise dns.exception.SyntaxError(
+                "Unknown master file directive '%s'" % directive)
+
+    def _get_identifier(self):
+        token = self.tok.get()
+        if not token.is_identifier():
+            raise dns.exception.SyntaxError()
+        return token
+
+    def _rr_line(self):
+        if self._current_origin is None:
+            raise dns.zone.UnknownOrigin()
+
+        # Name, or the name of the last record when the line is indented
+        token = self.tok.get(want_leading=True)
+        if not token.is_whitespace():
+            self._last_name = dns.name.from_text(
+                token.value, self._current_origin)
+        else:
+            token = self.tok.get()
+            if token.is_eol_or_eof():
+                return None
+            self.tok.unget(token)
+
+        name = self._last_name
+        if not name.is_subdomain(self.origin):
+            while not self.tok.get().is_eol_or_eof():
+                pass
+            return None
+
+        token = self._get_identifier()
+
+        # TTL
+        try:
+            ttl = dns.ttl.from_text(token.value)
+            token = self._get_identifier()
+        except dns.ttl.BadTTL:
+            # Records without a TTL take the $TTL, if there is one
+            ttl = self._ttl
+
+        # Class
+        try:
+            rdclass = dns.rdataclass.from_text(token.value)
+            token = self._get_identifier()
+        except dns.exception.SyntaxError:
+            raise
+        except Exception:
+            rdclass = dns.rdataclass.IN
+
+        if rdclass != dns.rdataclass.IN:
+            raise dns.exception.SyntaxError("RR class is not zone's class")
+
+        # Type
+        try:
+            rdtype = rdatatype.from_text(token.value)
+        except Exception:
+            raise dns.exception.SyntaxError(
+                "unknown rdatatype '%s'" % token.value)
+
+        try:
+            rdata = dns.rdata.from_text(
+                rdclass, rdtype, self.tok, self._current_origin, False)
+        except dns.exception.SyntaxError:
+            raise
+        except Exception as e:
+            # As in dnspython, anything which goes wrong parsing the rdata
+            # is a syntax error in the zonefile
+            raise dns.exception.SyntaxError(
+                "caught exception %s: %s" % (type(e).__name__, e))
+
+        rdata.choose_relativity(self.origin, False)
+
+        return (name.to_text(), ttl, rdatatype.to_text(rdtype), rdata)
 
 
 def dnspyrecords_to_recordsetlist(dnspython_records):
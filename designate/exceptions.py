@@ -62,6 +62,10 @@ class NSD4SlaveBackendError(Backend):
     pass
 
 
+class RndcProtocolError(Backend):
+    pass
+
+
 class NotImplemented(Base, NotImplementedError):
     pass
 
@@ -390,6 +394,10 @@ class ZoneExportNotFound(NotFound):
     error_type = 'zone_export_not_found'
 
 
+class BlobNotFound(NotFound):
+    error_type = 'blob_not_found'
+
+
 class LastServerDeleteNotAllowed(BadRequest):
     error_type = 'last_server_delete_not_allowed'
 
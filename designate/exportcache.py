@@ -0,0 +1,117 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import errno
+import glob
+import gzip
+import os
+import tempfile
+import zlib
+
+CHUNK_SIZE = 65536
+
+
+class ExportCache(object):
+    """
+    Keeps rendered zone exports gzip compressed on local disk.
+
+    Exports are keyed by the zone and a key which changes whenever the zone
+    does, so a stored export is never stale, and storing a new one for a
+    zone removes the ones before it.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, zone_id, key):
+        return os.path.join(self.directory, '%s-%s.gz' % (zone_id, key))
+
+    def open(self, zone_id, key):
+        """Open a stored export, or return None if there is none"""
+        try:
+            return open(self._path(zone_id, key), 'rb')
+        except IOError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return None
+
+    def store(self, zone_id, key, chunks, compressed=False):
+        """
+        Compress and store an export, given as an iterable of byte strings,
+        and return the path it was stored at. Chunks which are already gzip
+        compressed are stored as they are.
+        """
+        try:
+            os.makedirs(self.directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+        path = self._path(zone_id, key)
+
+        # Write to a temporary file first, so readers only ever see a
+        # complete export.
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.directory, prefix='.%s-' % zone_id)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if compressed:
+                    for chunk in chunks:
+                        f.write(chunk)
+                else:
+                    with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+                        for chunk in chunks:
+                            gz.write(chunk)
+
+            os.rename(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+        self._prune(zone_id, path)
+
+        return path
+
+    def _prune(self, zone_id, keep):
+        for path in glob.glob(os.path.join(self.directory, '%s-*.gz' %
+                                           zone_id)):
+            if path == keep:
+                continue
+
+            try:
+                os.unlink(path)
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    raise
+
+
+def iter_file(f, chunk_size=CHUNK_SIZE):
+    """Read a file in chunks, closing it once done"""
+    try:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            yield chunk
+    finally:
+        f.close()
+
+
+def decompress(chunks):
+    """Decompress gzip compressed chunks as they are read"""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+
+    data = decompressor.flush()
+    if data:
+        yield data
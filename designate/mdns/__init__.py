@@ -44,6 +44,20 @@ OPTS = [
                help='The storage driver to use'),
     cfg.IntOpt('max-message-size', default=65535,
                help='Maximum message size to emit'),
+    cfg.BoolOpt('poll-batching', default=False,
+                help='Batch SOA serial polling per nameserver, rather than '
+                     'polling each zone in its own greenthread'),
+    cfg.IntOpt('poll-batch-size', default=1000,
+               help='Maximum number of SOA queries sent to a nameserver in '
+                    'one polling cycle'),
+    cfg.FloatOpt('poll-tick', default=1.0,
+                 help='The time between batched polling cycles'),
+    cfg.BoolOpt('notify-batching', default=False,
+                help='Send NOTIFYs through a multiplexed dispatcher, with one '
+                     'UDP socket per destination'),
+    cfg.IntOpt('notify-rate-limit', default=0,
+               help='Maximum number of NOTIFYs sent to each destination per '
+                    'second when NOTIFYs are batched. Use 0 for no limit'),
 ]
 
 cfg.CONF.register_opts(OPTS, group='service:mdns')
@@ -0,0 +1,329 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import collections
+import random
+import socket
+import time
+
+import dns
+import dns.exception
+import dns.flags
+import dns.inet
+import dns.message
+import dns.opcode
+import dns.rcode
+import dns.rdatatype
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from designate.i18n import _LE
+from designate.i18n import _LI
+from designate.i18n import _LW
+from designate.mdns import poller
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+REPORT_INTERVAL = 60
+
+
+class PendingNotify(object):
+    """A NOTIFY for a single zone which has not been acknowledged yet"""
+
+    __slots__ = ('domain', 'timeout', 'retry_interval', 'max_retries',
+                 'attempts', 'message', 'done')
+
+    def __init__(self, domain, timeout, retry_interval, max_retries):
+        self.domain = domain
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.max_retries = max_retries
+        self.attempts = 0
+        self.message = None
+        self.done = False
+
+
+class DestinationNotifier(object):
+    """
+    Sends NOTIFYs to a single destination.
+
+    All NOTIFYs share one UDP socket, with responses matched back to the
+    in-flight message by ID on a dedicated receiving greenthread. Sends and
+    retransmits which come due in the same tick go out together, limited to
+    ``rate`` messages per second.
+    """
+    def __init__(self, host, port, rate=0, tick=1.0):
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.tick = tick
+
+        self.stats = {
+            'sent': 0,
+            'retransmitted': 0,
+            'acknowledged': 0,
+            'failed': 0,
+            'timed_out': 0,
+        }
+
+        self._sock = None
+        self._wheel = poller.TimerWheel(tick=tick)
+        self._outbound = collections.deque()
+        self._inflight = {}
+        self._zones = {}
+        self._tokens = rate
+        self._last_refill = time.time()
+
+    def __len__(self):
+        return len(self._zones)
+
+    @property
+    def sock(self):
+        if self._sock is None:
+            family = dns.inet.af_for_address(self.host)
+            self._sock = socket.socket(family, socket.SOCK_DGRAM)
+            self._sock.connect((self.host, self.port))
+        return self._sock
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def add(self, domain, timeout, retry_interval, max_retries, delay):
+        # A NOTIFY only says "go check the SOA", so an older unacknowledged
+        # NOTIFY for the same zone is made redundant by this one.
+        existing = self._zones.get(domain.name)
+        if existing is not None:
+            self._finish(existing)
+
+        pending = PendingNotify(domain, timeout, retry_interval, max_retries)
+        self._zones[domain.name] = pending
+        self._wheel.schedule(pending, delay)
+
+    def run_once(self):
+        """
+        Queue everything which is due a (re)transmit, and send as much of the
+        queue as the rate limit allows.
+        """
+        for pending in self._wheel.pop_due():
+            if pending.done:
+                continue
+
+            if pending.attempts >= pending.max_retries:
+                self.stats['timed_out'] += 1
+                LOG.warn(_LW("Giving up sending NOTIFY for '%(zone)s' to "
+                             "'%(host)s:%(port)s' after %(attempts)d "
+                             "attempts") %
+                         {'zone': pending.domain.name, 'host': self.host,
+                          'port': self.port, 'attempts': pending.attempts})
+                self._finish(pending)
+                continue
+
+            self._outbound.append(pending)
+
+        sent = 0
+        while self._outbound and self._take_token():
+            pending = self._outbound.popleft()
+            if pending.done:
+                continue
+
+            self._send(pending)
+            sent += 1
+
+        return sent
+
+    def _take_token(self):
+        if not self.rate:
+            return True
+
+        now = time.time()
+        self._tokens = min(
+            self.rate, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        return True
+
+    def _send(self, pending):
+        # Retransmits reuse the original message, so a late response to an
+        # earlier attempt still counts.
+        if pending.message is None:
+            pending.message = self._make_message(pending.domain.name)
+            self._inflight[pending.message.id] = pending
+        else:
+            self.stats['retransmitted'] += 1
+
+        pending.attempts += 1
+
+        try:
+            self.sock.send(pending.message.to_wire())
+            self.stats['sent'] += 1
+        except socket.error as e:
+            LOG.warn(_LW("Socket error sending NOTIFY for '%(zone)s' to "
+                         "'%(host)s:%(port)s': %(err)s") %
+                     {'zone': pending.domain.name, 'host': self.host,
+                      'port': self.port, 'err': e})
+
+        # Check back once the response is overdue, mirroring the timeout
+        # followed by retry interval of the unbatched path.
+        self._wheel.schedule(
+            pending, pending.timeout + pending.retry_interval)
+
+    def _make_message(self, zone_name):
+        message = dns.message.make_query(zone_name, dns.rdatatype.SOA)
+        message.flags = dns.flags.AA
+        message.set_opcode(dns.opcode.NOTIFY)
+
+        # Ensure the ID is unique amongst the in-flight messages
+        while message.id in self._inflight:
+            message.id = random.randint(0, 65535)
+
+        return message
+
+    def _finish(self, pending):
+        pending.done = True
+
+        if pending.message is not None:
+            self._inflight.pop(pending.message.id, None)
+
+        if self._zones.get(pending.domain.name) is pending:
+            del self._zones[pending.domain.name]
+
+    def receive(self, wire):
+        try:
+            response = dns.message.from_wire(wire)
+        except dns.exception.DNSException:
+            LOG.debug('Discarding malformed NOTIFY response from %s:%s',
+                      self.host, self.port)
+            return
+
+        pending = self._inflight.get(response.id)
+        if pending is None or not pending.message.is_response(response):
+            # Most likely a late response to a message we already gave up on,
+            # or one which was superseded.
+            return
+
+        self._finish(pending)
+
+        if not (response.flags & dns.flags.AA) or dns.rcode.from_flags(
+                response.flags, response.ednsflags) != dns.rcode.NOERROR:
+            self.stats['failed'] += 1
+            LOG.warn(_LW("Failed to get expected response while trying to "
+                         "send 'NOTIFY' for '%(zone)s' to '%(server)s:"
+                         "%(port)d'.\nResponse message:\n%(resp)s\n") %
+                     {'zone': pending.domain.name, 'server': self.host,
+                      'port': self.port, 'resp': str(response)})
+        else:
+            self.stats['acknowledged'] += 1
+
+    def receive_forever(self):
+        sock = self.sock
+
+        while True:
+            try:
+                wire = sock.recv(65535)
+            except socket.error as e:
+                if self._sock is not sock:
+                    # We've been closed
+                    return
+                LOG.warn(_LW("Socket error receiving NOTIFY responses from "
+                             "'%(host)s:%(port)s': %(err)s") %
+                         {'host': self.host, 'port': self.port, 'err': e})
+                time.sleep(self.tick)
+                continue
+
+            self.receive(wire)
+
+
+class NotifyDispatcher(object):
+    """
+    Multiplexes NOTIFYs, running one DestinationNotifier per destination.
+
+    The stats of each destination are logged every REPORT_INTERVAL seconds,
+    when they have changed.
+    """
+    def __init__(self, tg):
+        self.tg = tg
+
+        self.rate = CONF['service:mdns'].notify_rate_limit
+        self.tick = CONF['service:mdns'].poll_tick
+
+        self._notifiers = {}
+        self._timers = []
+        self._reported = {}
+
+    def notify(self, domain, host, port, timeout, retry_interval,
+               max_retries, delay):
+        key = (host, port)
+
+        notifier = self._notifiers.get(key)
+        if notifier is None:
+            if not self._timers:
+                self._timers.append(self.tg.add_timer(
+                    REPORT_INTERVAL, self._report, REPORT_INTERVAL))
+
+            notifier = DestinationNotifier(
+                host, port, rate=self.rate, tick=self.tick)
+            self._notifiers[key] = notifier
+
+            LOG.info(_LI("Starting NOTIFY dispatcher for %(host)s:%(port)s") %
+                     {'host': host, 'port': port})
+            self.tg.add_thread(notifier.receive_forever)
+            self._timers.append(
+                self.tg.add_timer(self.tick, self._run, 0, notifier))
+
+        notifier.add(domain, timeout, retry_interval, max_retries, delay)
+
+    def stop(self):
+        for timer in self._timers:
+            timer.stop()
+
+        for notifier in self._notifiers.values():
+            notifier.close()
+
+        self._timers = []
+        self._notifiers = {}
+        self._reported = {}
+
+    def _run(self, notifier):
+        if not len(notifier):
+            return
+
+        try:
+            sent = notifier.run_once()
+            LOG.debug('Sent %(sent)d NOTIFYs to %(host)s:%(port)s, stats: '
+                      '%(stats)s', {'sent': sent, 'host': notifier.host,
+                                    'port': notifier.port,
+                                    'stats': notifier.stats})
+        except Exception:
+            LOG.exception(_LE("Unhandled exception while sending NOTIFYs to "
+                              "%(host)s:%(port)s") %
+                          {'host': notifier.host, 'port': notifier.port})
+
+    def _report(self):
+        for key, notifier in self._notifiers.items():
+            stats = dict(notifier.stats, pending=len(notifier))
+            if self._reported.get(key) == stats:
+                continue
+
+            self._reported[key] = stats
+            LOG.info(_LI("NOTIFYs to %(host)s:%(port)s: %(sent)d sent, "
+                         "%(retransmitted)d retransmitted, %(acknowledged)d "
+                         "acknowledged, %(failed)d failed, %(timed_out)d "
+                         "timed out, %(pending)d pending"),
+                     dict(stats, host=notifier.host, port=notifier.port))
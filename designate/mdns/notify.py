@@ -27,6 +27,8 @@ from oslo_config import cfg
 from oslo_log import log as logging
 
 from designate.mdns import base
+from designate.mdns import dispatcher
+from designate.mdns import poller
 from designate.i18n import _LI
 from designate.i18n import _LW
 
@@ -40,6 +42,31 @@ class NotifyEndpoint(base.BaseEndpoint):
     RPC_API_VERSION = '2.0'
     RPC_API_NAMESPACE = 'notify'
 
+    def __init__(self, tg):
+        super(NotifyEndpoint, self).__init__(tg)
+
+        self._poller = None
+        self._dispatcher = None
+
+    @property
+    def dispatcher(self):
+        if self._dispatcher is None:
+            self._dispatcher = dispatcher.NotifyDispatcher(self.tg)
+        return self._dispatcher
+
+    @property
+    def poller(self):
+        if self._poller is None:
+            self._poller = poller.SerialPoller(self.tg, self.pool_manager_api)
+        return self._poller
+
+    def stop(self):
+        if self._poller is not None:
+            self._poller.stop()
+
+        if self._dispatcher is not None:
+            self._dispatcher.stop()
+
     def notify_zone_changed(self, context, domain, host, port, timeout,
                             retry_interval, max_retries, delay):
         """
@@ -58,7 +85,15 @@ class NotifyEndpoint(base.BaseEndpoint):
             response is the response on success or None on failure.
             current_retry is the current retry number.
             The return value is just used for testing and not by pool manager.
+            When NOTIFYs are batched the NOTIFY is queued and None is
+            returned.
         """
+        mdns_config = CONF['service:mdns']
+        if mdns_config.notify_batching and not mdns_config.all_tcp:
+            self.dispatcher.notify(domain, host, port, timeout,
+                                   retry_interval, max_retries, delay)
+            return
+
         time.sleep(delay)
         return self._make_and_send_dns_message(
             domain, host, port, timeout, retry_interval, max_retries,
@@ -80,6 +115,13 @@ class NotifyEndpoint(base.BaseEndpoint):
         :param delay: The time to wait before sending the first request.
         :return: The pool manager is informed of the status with update_status.
         """
+        if CONF['service:mdns'].poll_batching:
+            # Hand the poll off to the per nameserver poller, which reports
+            # back to the pool manager with update_statuses.
+            self.poller.poll(context, domain, nameserver, timeout,
+                             retry_interval, max_retries, delay)
+            return
+
         (status, actual_serial, retries) = self.get_serial_number(
             context, domain, nameserver.host, nameserver.port, timeout,
             retry_interval, max_retries, delay)
@@ -0,0 +1,363 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import collections
+import socket
+import time
+
+import eventlet
+import dns
+import dns.exception
+import dns.flags
+import dns.message
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from designate.i18n import _LE
+from designate.i18n import _LI
+from designate.i18n import _LW
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+SUCCESS_STATUS = 'SUCCESS'
+ERROR_STATUS = 'ERROR'
+NO_DOMAIN_STATUS = 'NO_DOMAIN'
+
+
+class TimerWheel(object):
+    """
+    A hashed timer wheel.
+
+    Items are dropped into the slot for the tick in which they become due,
+    so scheduling and expiry cost the same regardless of how many items are
+    outstanding. Items due more than one revolution ahead share a slot with
+    nearer ones, and are simply left in place until their deadline passes.
+    """
+    def __init__(self, tick=1.0, size=512):
+        self.tick = float(tick)
+        self.size = size
+
+        self._slots = [[] for _ in range(size)]
+        self._origin = time.time()
+        self._position = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, item, delay):
+        deadline = time.time() + delay
+        index = max(int((deadline - self._origin) / self.tick),
+                    self._position)
+
+        self._slots[index % self.size].append((deadline, item))
+        self._count += 1
+
+    def pop_due(self, now=None):
+        """
+        Advance the wheel up to ``now`` and return every item which is due.
+        """
+        now = now or time.time()
+
+        current = int((now - self._origin) / self.tick)
+        last = min(current, self._position + self.size - 1)
+        due = []
+
+        # The current slot is visited again on the next call, as it may hold
+        # items due later on in this tick.
+        for index in range(self._position, last + 1):
+            slot = index % self.size
+            pending, self._slots[slot] = self._slots[slot], []
+
+            for deadline, item in pending:
+                if deadline <= now:
+                    due.append(item)
+                    self._count -= 1
+                else:
+                    self._slots[slot].append((deadline, item))
+
+        self._position = current
+
+        return due
+
+
+class PollItem(object):
+    """An outstanding serial check for a single zone on a single server"""
+
+    __slots__ = ('context', 'domain', 'nameserver', 'timeout',
+                 'retry_interval', 'retries', 'actual_serial', 'status')
+
+    def __init__(self, context, domain, nameserver, timeout, retry_interval,
+                 max_retries):
+        self.context = context
+        self.domain = domain
+        self.nameserver = nameserver
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.retries = max_retries
+        self.actual_serial = None
+        self.status = ERROR_STATUS
+
+
+class NameserverPoller(object):
+    """
+    Checks the SOA serial of many zones on a single nameserver.
+
+    Every cycle the due checks are sent as individual SOA queries over one
+    shared UDP socket, and responses are matched back to their zone by the
+    DNS message ID. Checks which are not yet satisfied are rescheduled on the
+    timer wheel, while finished checks are handed to the ``report`` callable
+    in one batch.
+    """
+    def __init__(self, host, port, report, batch_size=1000, tick=1.0):
+        self.host = host
+        self.port = port
+        self.report = report
+        self.batch_size = batch_size
+
+        self._wheel = TimerWheel(tick=tick)
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    @staticmethod
+    def _key(item):
+        return (item.domain.id, item.domain.action)
+
+    def add(self, item, delay):
+        key = self._key(item)
+
+        # A newer request for the same zone and action supersedes the older
+        # one, there is no point in waiting on a serial that has already been
+        # replaced.
+        existing = self._pending.get(key)
+        if existing is not None and \
+                existing.domain.serial > item.domain.serial:
+            return
+
+        self._pending[key] = item
+        self._wheel.schedule(item, delay)
+
+    def run_once(self):
+        due = [item for item in self._wheel.pop_due()
+               if self._pending.get(self._key(item)) is item]
+
+        finished = []
+
+        for start in range(0, len(due), self.batch_size):
+            batch = due[start:start + self.batch_size]
+            responses = self._query(batch)
+
+            for item in batch:
+                self._process(item, responses.get(id(item)))
+
+                if item.status == SUCCESS_STATUS or item.retries <= 0:
+                    del self._pending[self._key(item)]
+                    finished.append(item)
+                else:
+                    self._wheel.schedule(item, item.retry_interval)
+
+        if finished:
+            self.report(finished)
+
+        return finished
+
+    def _query(self, items):
+        """
+        Send a SOA query for each item over a single socket, and collect the
+        responses which arrive before the largest timeout in the batch.
+
+        :return: A dict of id(item) to the matching response message.
+        """
+        queries = {}
+        responses = {}
+
+        for item in items:
+            query = dns.message.make_query(item.domain.name, dns.rdatatype.SOA)
+            query.flags = dns.flags.RD
+
+            # Make sure each outstanding query can be told apart by ID
+            while query.id in queries:
+                query.id = (query.id + 1) % 65536
+
+            queries[query.id] = (query, item)
+
+        if not queries:
+            return responses
+
+        timeout = max(item.timeout for item in items) or 1
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        try:
+            for query, _ in queries.values():
+                sock.sendto(query.to_wire(), (self.host, self.port))
+
+            # Matched queries are removed as their responses come in, so
+            # anything left over once the timeout expires has timed out.
+            expiration = time.time() + timeout
+            while queries:
+                remaining = expiration - time.time()
+                if remaining <= 0:
+                    break
+
+                sock.settimeout(remaining)
+                try:
+                    wire, addr = sock.recvfrom(65535)
+                except socket.timeout:
+                    break
+
+                try:
+                    response = dns.message.from_wire(wire)
+                except dns.exception.DNSException:
+                    LOG.debug('Discarding malformed SOA response from %s:%s',
+                              self.host, self.port)
+                    continue
+
+                if response.id not in queries:
+                    continue
+
+                query, item = queries.pop(response.id)
+                if not query.is_response(response):
+                    queries[response.id] = (query, item)
+                    continue
+
+                responses[id(item)] = response
+
+        except socket.error as e:
+            LOG.warn(_LW("Socket error while polling %(host)s:%(port)s: "
+                         "%(err)s") %
+                     {'host': self.host, 'port': self.port, 'err': e})
+        finally:
+            sock.close()
+
+        return responses
+
+    def _process(self, item, response):
+        domain = item.domain
+        item.retries -= 1
+
+        if response is None:
+            LOG.warn(_LW("Got Timeout while polling '%(zone)s' on "
+                         "'%(host)s:%(port)s'. Retries left='%(retries)d'") %
+                     {'zone': domain.name, 'host': self.host,
+                      'port': self.port, 'retries': item.retries})
+            return
+
+        if response.rcode() in (
+                dns.rcode.NXDOMAIN, dns.rcode.REFUSED, dns.rcode.SERVFAIL):
+            # The nameserver may not have loaded a new zone yet, so this is
+            # retried like any other miss, and only reported once the
+            # retries run out.
+            item.status = NO_DOMAIN_STATUS
+            LOG.warn(_LW("Got NO_DOMAIN while polling '%(zone)s' on "
+                         "'%(host)s:%(port)s'. Retries left='%(retries)d'") %
+                     {'zone': domain.name, 'host': self.host,
+                      'port': self.port, 'retries': item.retries})
+            return
+
+        if len(response.answer) == 1 \
+                and str(response.answer[0].name) == str(domain.name) \
+                and response.answer[0].rdclass == dns.rdataclass.IN \
+                and response.answer[0].rdtype == dns.rdatatype.SOA:
+            rrset = response.answer[0]
+            item.actual_serial = rrset.to_rdataset().items[0].serial
+
+        if item.actual_serial is not None and \
+                item.actual_serial >= domain.serial:
+            item.status = SUCCESS_STATUS
+        else:
+            # TODO(vinod): Account for serial number wrap around.
+            item.status = ERROR_STATUS
+            LOG.warn(_LW("Got lower serial for '%(zone)s' to '%(host)s:"
+                         "%(port)s'. Expected:'%(es)d'. Got:'%(as)s'."
+                         "Retries left='%(retries)d'") %
+                     {'zone': domain.name, 'host': self.host,
+                      'port': self.port, 'es': domain.serial,
+                      'as': item.actual_serial, 'retries': item.retries})
+
+
+class SerialPoller(object):
+    """
+    Batches SOA serial polling, running one NameserverPoller per nameserver
+    and reporting finished checks to the Pool Manager in bulk.
+    """
+    def __init__(self, tg, pool_manager_api):
+        self.tg = tg
+        self.pool_manager_api = pool_manager_api
+
+        self.batch_size = CONF['service:mdns'].poll_batch_size
+        self.tick = CONF['service:mdns'].poll_tick
+
+        self._pollers = {}
+        self._timers = []
+
+    def poll(self, context, domain, nameserver, timeout, retry_interval,
+             max_retries, delay):
+        key = (nameserver.host, nameserver.port)
+
+        poller = self._pollers.get(key)
+        if poller is None:
+            poller = NameserverPoller(
+                nameserver.host, nameserver.port, self._report,
+                batch_size=self.batch_size, tick=self.tick)
+            self._pollers[key] = poller
+
+            LOG.info(_LI("Starting SOA serial poller for %(host)s:%(port)s") %
+                     {'host': nameserver.host, 'port': nameserver.port})
+            self._timers.append(
+                self.tg.add_timer(self.tick, self._run, 0, poller))
+
+        poller.add(PollItem(context, domain, nameserver, timeout,
+                            retry_interval, max_retries), delay)
+
+    def stop(self):
+        for timer in self._timers:
+            timer.stop()
+
+        self._timers = []
+        self._pollers = {}
+
+    def _run(self, poller):
+        if not len(poller):
+            return
+
+        try:
+            poller.run_once()
+        except Exception:
+            LOG.exception(_LE("Unhandled exception while polling "
+                              "%(host)s:%(port)s") %
+                          {'host': poller.host, 'port': poller.port})
+
+    def _report(self, items):
+        # The Pool Manager topic is specific to each pool, so group the
+        # results by pool before sending them off.
+        by_pool = collections.defaultdict(list)
+        for item in items:
+            by_pool[item.domain.pool_id].append(item)
+
+        for pool_items in by_pool.values():
+            context = pool_items[0].context
+            statuses = [
+                (item.domain, item.nameserver, item.status,
+                 item.actual_serial)
+                for item in pool_items]
+
+            self.pool_manager_api.update_statuses(context, statuses)
+
+        # Let other greenthreads in before the next batch is processed.
+        eventlet.sleep(0)
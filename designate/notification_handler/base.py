@@ -15,16 +15,20 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import abc
+import collections
+import functools
 
 from oslo_config import cfg
 from oslo_log import log as logging
 
-from designate import exceptions
+from designate.backend import batch
 from designate.central import rpcapi as central_rpcapi
 from designate.context import DesignateContext
 from designate.i18n import _LW
 from designate.objects import Record
+from designate.objects import RecordList
 from designate.objects import RecordSet
+from designate.objects import RecordSetList
 from designate.plugin import ExtensionPlugin
 
 
@@ -64,32 +68,19 @@ class NotificationHandler(ExtensionPlugin):
         context = DesignateContext.get_admin_context(all_tenants=True)
         return self.central_api.get_domain(context, domain_id)
 
-    def _find_or_create_recordset(self, context, domain_id, name, type,
-                                  ttl=None):
-        name = name.encode('idna').decode('utf-8')
-
-        try:
-            # Attempt to create an empty recordset
-            values = {
-                'name': name,
-                'type': type,
-                'ttl': ttl,
-            }
-            recordset = self.central_api.create_recordset(
-                context, domain_id, RecordSet(**values))
-
-        except exceptions.DuplicateRecordSet:
-            # Fetch the existing recordset
-            recordset = self.central_api.find_recordset(context, {
-                'domain_id': domain_id,
-                'name': name,
-                'type': type,
-            })
 
-        return recordset
+class BaseAddressHandler(NotificationHandler):
+    """
+    Creates and deletes records for addresses.
 
+    Changes to the same domain arriving within ``batch_window`` seconds of
+    each other are applied through one central call, so a burst of events
+    increments the domain's serial once rather than once per record.
+    """
+    def __init__(self, *args, **kw):
+        super(BaseAddressHandler, self).__init__(*args, **kw)
+        self._queues = {}
 
-class BaseAddressHandler(NotificationHandler):
     def _get_ip_data(self, addr_dict):
         ip = addr_dict['address']
         version = addr_dict['version']
@@ -131,22 +122,14 @@ class BaseAddressHandler(NotificationHandler):
         LOG.debug('Event data: %s' % data)
         data['domain'] = domain['name']
 
-        context = DesignateContext().elevated()
-        context.all_tenants = True
-        context.edit_managed_records = True
-
+        changes = []
         for addr in addresses:
             event_data = data.copy()
             event_data.update(self._get_ip_data(addr))
 
             for fmt in cfg.CONF[self.name].get('format'):
-                recordset_values = {
-                    'domain_id': domain['id'],
-                    'name': fmt % event_data,
-                    'type': 'A' if addr['version'] == 4 else 'AAAA'}
-
-                recordset = self._find_or_create_recordset(
-                    context, **recordset_values)
+                name = (fmt % event_data).encode('idna').decode('utf-8')
+                type_ = 'A' if addr['version'] == 4 else 'AAAA'
 
                 record_values = {
                     'data': addr['address']}
@@ -159,12 +142,11 @@ class BaseAddressHandler(NotificationHandler):
                         'managed_resource_type': resource_type,
                         'managed_resource_id': resource_id})
 
-                LOG.debug('Creating record in %s / %s with values %r' %
-                          (domain['id'], recordset['id'], record_values))
-                self.central_api.create_record(context,
-                                               domain['id'],
-                                               recordset['id'],
-                                               Record(**record_values))
+                LOG.debug('Creating record in %s / %s %s with values %r' %
+                          (domain['id'], name, type_, record_values))
+                changes.append(('create', name, type_, record_values))
+
+        self._submit(domain['id'], changes)
 
     def _delete(self, domain_id, managed=True, resource_id=None,
                 resource_type='instance', criterion=None):
@@ -180,10 +162,6 @@ class BaseAddressHandler(NotificationHandler):
                 'to remove managed=False'))
         criterion = criterion or {}
 
-        context = DesignateContext().elevated()
-        context.all_tenants = True
-        context.edit_managed_records = True
-
         criterion.update({'domain_id': domain_id})
 
         if managed:
@@ -195,12 +173,79 @@ class BaseAddressHandler(NotificationHandler):
                 'managed_resource_type': resource_type
             })
 
-        records = self.central_api.find_records(context, criterion)
+        LOG.debug('Deleting records in %s matching %r' %
+                  (domain_id, criterion))
+        self._submit(domain_id, [('delete', criterion)])
+
+    def _submit(self, domain_id, changes):
+        """
+        Apply the changes to a domain, together with the changes from any
+        other events for the same domain within the batch window.
+        """
+        window = cfg.CONF['service:sink'].batch_window
+        if not window:
+            return self._apply_changes(domain_id, changes)
+
+        queue = self._queues.get(domain_id)
+        if queue is None:
+            queue = batch.BatchQueue(
+                functools.partial(self._apply_batch, domain_id),
+                window=window, batch_size=cfg.CONF['service:sink'].batch_size)
+            self._queues[domain_id] = queue
+
+        queue.submit(changes)
+
+    def _apply_batch(self, domain_id, items):
+        changes = [change for changes in items for change in changes]
+
+        self._apply_changes(domain_id, changes)
+
+        return [None] * len(items)
+
+    def _apply_changes(self, domain_id, changes):
+        creates = collections.OrderedDict()
+        criteria = []
+
+        for change in changes:
+            if change[0] == 'delete':
+                criterion = change[1]
+
+                # A record created and deleted again within the batch need
+                # never exist.
+                for key, (_, _, values) in list(creates.items()):
+                    if self._matches(values, criterion):
+                        LOG.debug('Create of %r cancelled by a later delete'
+                                  % (values,))
+                        del creates[key]
+
+                if criterion not in criteria:
+                    criteria.append(criterion)
+            else:
+                _, name, type_, values = change
+                creates[name, type_, values['data']] = (name, type_, values)
+
+        recordsets = collections.OrderedDict()
+        for name, type_, values in creates.values():
+            recordset = recordsets.get((name, type_))
+            if recordset is None:
+                recordset = RecordSet(name=name, type=type_, ttl=None,
+                                      records=RecordList())
+                recordsets[name, type_] = recordset
+
+            recordset.records.append(Record(**values))
+
+        if not recordsets and not criteria:
+            return
+
+        context = DesignateContext().elevated()
+        context.all_tenants = True
+        context.edit_managed_records = True
 
-        for record in records:
-            LOG.debug('Deleting record %s' % record['id'])
+        self.central_api.update_managed_records(
+            context, domain_id,
+            RecordSetList(objects=list(recordsets.values())), criteria)
 
-            self.central_api.delete_record(context,
-                                           domain_id,
-                                           record['recordset_id'],
-                                           record['id'])
+    @staticmethod
+    def _matches(values, criterion):
+        return all(values.get(key) == value
+                   for key, value in criterion.items() if key != 'domain_id')
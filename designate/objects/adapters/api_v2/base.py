@@ -14,6 +14,7 @@
 from six.moves.urllib import parse
 from oslo_log import log as logging
 from oslo_config import cfg
+from pecan import jsonify
 
 from designate.objects.adapters import base
 from designate.objects import base as obj_base
@@ -46,13 +47,68 @@ class APIv2Adapter(base.DesignateAdapter):
                 list_object, kwargs['request'])
         # Check if we should include metadata
         if isinstance(list_object, obj_base.PagedListObjectMixin):
-            metadata = {}
-            if list_object.total_count is not None:
-                metadata['total_count'] = list_object.total_count
-            r_list['metadata'] = metadata
+            r_list['metadata'] = cls._get_collection_metadata(list_object)
 
         return r_list
 
+    @classmethod
+    def _get_collection_metadata(cls, list_object):
+        metadata = {}
+        if list_object.total_count is not None:
+            metadata['total_count'] = list_object.total_count
+        return metadata
+
+    @classmethod
+    def render_stream(cls, list_cls, pages, *args, **kwargs):
+        """
+        Render a collection which is read one page (a list_cls object) at a
+        time from the pages iterator, yielding the JSON document in chunks.
+
+        Only one page of objects is held at a time, rather than the whole
+        collection and its rendered output.
+        """
+        adapter = cls.get_object_adapter(
+            cls.ADAPTER_FORMAT, list_cls.obj_name())
+        return adapter._render_list_stream(pages, *args, **kwargs)
+
+    @classmethod
+    def _render_list_stream(cls, pages, *args, **kwargs):
+        yield ('{"%s": [' % cls.MODIFICATIONS['options']['collection_name']
+               ).encode('utf-8')
+
+        first_page = None
+        count = 0
+        last = None
+
+        for page in pages:
+            if first_page is None:
+                first_page = page
+
+            for object in page:
+                chunk = jsonify.encode(cls._get_renderer(
+                    cls.ADAPTER_FORMAT, object)(object, *args, **kwargs))
+
+                yield ((', ' if count else '') + chunk).encode('utf-8')
+
+                count += 1
+                last = object
+
+        envelope = {}
+
+        if cls.MODIFICATIONS['options'].get('links', True)\
+                and 'request' in kwargs:
+            envelope['links'] = cls._get_page_links(
+                kwargs['request'], count, last)
+
+        if isinstance(first_page, obj_base.PagedListObjectMixin):
+            envelope['metadata'] = cls._get_collection_metadata(first_page)
+
+        tail = ''.join(
+            ', %s: %s' % (jsonify.encode(key), jsonify.encode(value))
+            for key, value in envelope.items())
+
+        yield (']%s}' % tail).encode('utf-8')
+
     @classmethod
     def _render_object(cls, object, *args, **kwargs):
         obj = super(APIv2Adapter, cls)._render_object(object, *args, **kwargs)
@@ -78,16 +134,39 @@ class APIv2Adapter(base.DesignateAdapter):
 
     @classmethod
     def _get_resource_links(cls, object, request):
+        return {'self': '%s/%s' %
+                (cls._get_resource_prefix(request), object.id)}
+
+    @classmethod
+    def _get_resource_prefix(cls, request):
+        """
+        Get the URI the resource links for a request start with, which is the
+        same for every item rendered so is only worked out once.
+        """
+        environ = getattr(request, 'environ', None)
+        if not isinstance(environ, dict):
+            return '%s%s' % (cls._get_base_uri(request),
+                             cls._get_path(request))
+
+        prefixes = environ.setdefault('designate.link_prefixes', {})
+
+        try:
+            return prefixes[cls]
+        except KeyError:
+            prefix = '%s%s' % (cls._get_base_uri(request),
+                               cls._get_path(request))
+            prefixes[cls] = prefix
+            return prefix
+
+    @classmethod
+    def _get_base_uri(cls, request):
         if cfg.CONF['service:api'].enable_host_header:
             try:
-                base_uri = request.host_url
+                return request.host_url
             except Exception:
-                base_uri = cls.BASE_URI
+                return cls.BASE_URI
         else:
-            base_uri = cls.BASE_URI
-
-        return {'self': '%s%s/%s' %
-                (base_uri, cls._get_path(request), object.id)}
+            return cls.BASE_URI
 
     @classmethod
     def _get_path(cls, request):
@@ -102,6 +181,11 @@ class APIv2Adapter(base.DesignateAdapter):
 
     @classmethod
     def _get_collection_links(cls, list, request):
+        return cls._get_page_links(
+            request, len(list), list[-1] if len(list) else None)
+
+    @classmethod
+    def _get_page_links(cls, request, count, last):
 
         links = {
             'self': cls._get_collection_href(request)
@@ -116,8 +200,8 @@ class APIv2Adapter(base.DesignateAdapter):
         elif 'limit' in params:
             limit = int(params['limit'])
 
-        if limit is not None and limit == len(list):
-            links['next'] = cls._get_next_href(request, list)
+        if limit is not None and limit == count:
+            links['next'] = cls._get_next_href(request, [last])
 
         return links
 
@@ -128,16 +212,8 @@ class APIv2Adapter(base.DesignateAdapter):
         if extra_params is not None:
             params.update(extra_params)
 
-        if cfg.CONF['service:api'].enable_host_header:
-            try:
-                base_uri = request.host_url
-            except Exception:
-                base_uri = cls.BASE_URI
-        else:
-            base_uri = cls.BASE_URI
-
         href = "%s%s?%s" % (
-            base_uri,
+            cls._get_base_uri(request),
             cls._get_path(request),
             parse.urlencode(params))
 
@@ -65,6 +65,12 @@ class ZoneExportAPIv2Adapter(base.APIv2Adapter):
                 '%s/%s' % \
                 (base_uri, obj['location'].split('://')[1])
 
+        elif obj['location'] and obj['location'].startswith('blob://'):
+            # Exports kept in the blob store are downloaded through the API
+            # once they are complete
+            if obj['status'] == 'COMPLETE':
+                obj['links']['export'] = '%s/export' % obj['links']['self']
+
         return obj
 
 
@@ -26,8 +26,12 @@ LOG = logging.getLogger(__name__)
 class DesignateObjectAdapterMetaclass(type):
 
     def __init__(cls, names, bases, dict_):
+        # Render plans are per adapter class, see _get_render_plan
+        cls._render_plans = {}
+
         if not hasattr(cls, '_adapter_classes'):
             cls._adapter_classes = {}
+            cls._renderers = {}
             return
 
         key = '%s:%s' % (cls.adapter_format(), cls.adapter_object())
@@ -79,43 +83,97 @@ class DesignateAdapter(object):
 
     @classmethod
     def render(cls, format_, object, *args, **kwargs):
+        return cls._get_renderer(format_, object)(object, *args, **kwargs)
+
+    @classmethod
+    def _get_renderer(cls, format_, object):
+        """
+        Get the render method of the adapter for an object, which is looked
+        up once per format and object class.
+        """
+        key = (format_, type(object))
+
+        try:
+            return cls._renderers[key]
+        except KeyError:
+            adapter = cls.get_object_adapter(format_, object)
+
+            if isinstance(object, objects.ListObjectMixin):
+                # type_ = 'list'
+                renderer = adapter._render_list
+            else:
+                # type_ = 'object'
+                renderer = adapter._render_object
+
+            cls._renderers[key] = renderer
+            return renderer
+
+    @classmethod
+    def _get_render_plan(cls, object):
+        """
+        Get the fields to output for an object, compiled from MODIFICATIONS
+        the first time an object of its class is rendered.
+
+        Each entry is (output key, attribute, renamed, nested renderer), with
+        the nested renderer being None for anything but relations.
+        """
+        try:
+            return cls._render_plans[type(object)]
+        except KeyError:
+            pass
+
+        plan = []
+        for key, field_props in cls.MODIFICATIONS['fields'].items():
+            # Check if it has to be renamed, renamed attributes are required
+            renamed = bool(field_props.get('rename', False))
+            obj_key = field_props['rename'] if renamed else key
 
-        if isinstance(object, objects.ListObjectMixin):
-            # type_ = 'list'
-            return cls.get_object_adapter(
-                format_, object)._render_list(object, *args, **kwargs)
+            # Check if this item is a relation (another DesignateObject that
+            # will need to be converted itself
+            nested = None
+            if object.FIELDS.get(obj_key, {}).get('relation'):
+                nested = cls._get_nested_renderer(
+                    object.FIELDS[obj_key].get('relation_cls'))
+
+            plan.append((key, obj_key, renamed, nested))
+
+        cls._render_plans[type(object)] = plan
+        return plan
+
+    @classmethod
+    def _get_nested_renderer(cls, relation_cls):
+        format_ = cls.ADAPTER_FORMAT
+        adapter = cls.get_object_adapter(format_, relation_cls)
+        expected = objects.DesignateObject.obj_cls_from_name(relation_cls)
+
+        if issubclass(expected, objects.ListObjectMixin):
+            renderer = adapter._render_list
         else:
-            # type_ = 'object'
-            return cls.get_object_adapter(
-                format_, object)._render_object(object, *args, **kwargs)
+            renderer = adapter._render_object
+
+        def render_nested(obj, *args, **kwargs):
+            if type(obj) is expected:
+                return renderer(obj, *args, **kwargs)
+
+            # Anything else, such as a subclass or None, goes through the
+            # full lookup
+            return adapter.render(format_, obj, *args, **kwargs)
+
+        return render_nested
 
     @classmethod
     def _render_object(cls, object, *args, **kwargs):
         # The dict we will return to be rendered to JSON / output format
         r_obj = {}
         # Loop over all fields that are supposed to be output
-        for key, value in cls.MODIFICATIONS['fields'].items():
-            # Get properties for this field
-            field_props = cls.MODIFICATIONS['fields'][key]
-            # Check if it has to be renamed
-            if field_props.get('rename', False):
-                obj = getattr(object, field_props.get('rename'))
-                # if rename is specified we need to change the key
-                obj_key = field_props.get('rename')
+        for key, obj_key, renamed, nested in cls._get_render_plan(object):
+            if renamed:
+                obj = getattr(object, obj_key)
             else:
-                # if not, move on
-                obj = getattr(object, key, None)
-                obj_key = key
-            # Check if this item is a relation (another DesignateObject that
-            # will need to be converted itself
-            if object.FIELDS.get(obj_key, {}).get('relation'):
-                # Get a adapter for the nested object
-                # Get the class the object is and get its adapter, then set
-                # the item in the dict to the output
-                r_obj[key] = cls.get_object_adapter(
-                    cls.ADAPTER_FORMAT,
-                    object.FIELDS[obj_key].get('relation_cls')).render(
-                        cls.ADAPTER_FORMAT, obj, *args, **kwargs)
+                obj = getattr(object, obj_key, None)
+
+            if nested is not None:
+                r_obj[key] = nested(obj, *args, **kwargs)
             else:
                 # Just attach the damn item if there is no weird edge cases
                 r_obj[key] = obj
@@ -129,9 +187,8 @@ class DesignateAdapter(object):
         # iterate and convert each DesignateObject in the list, and append to
         # the object we are returning
         for object in list_object:
-            r_list.append(cls.get_object_adapter(
-                cls.ADAPTER_FORMAT,
-                object).render(cls.ADAPTER_FORMAT, object, *args, **kwargs))
+            r_list.append(cls._get_renderer(cls.ADAPTER_FORMAT, object)(
+                object, *args, **kwargs))
         return {cls.MODIFICATIONS['options']['collection_name']: r_list}
 
     #####################
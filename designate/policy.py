@@ -18,7 +18,6 @@ from oslo_log import log as logging
 from oslo_policy import policy
 from oslo_policy import opts
 
-from designate.i18n import _
 from designate.i18n import _LI
 from designate import utils
 from designate import exceptions
@@ -34,12 +33,22 @@ LOG = logging.getLogger(__name__)
 
 _ENFORCER = None
 
+# Bumped whenever the rules change, so decisions cached on contexts under
+# older rules are not used
+_RULES_GENERATION = 0
+
+
+def _rules_changed():
+    global _RULES_GENERATION
+    _RULES_GENERATION += 1
+
 
 def reset():
     global _ENFORCER
     if _ENFORCER:
         _ENFORCER.clear()
     _ENFORCER = None
+    _rules_changed()
 
 
 def set_rules(data, default_rule=None, overwrite=True):
@@ -60,6 +69,7 @@ def set_rules(data, default_rule=None, overwrite=True):
         rules = policy.Rules.load_json(data, default_rule)
 
     _ENFORCER.set_rules(rules, overwrite=overwrite)
+    _rules_changed()
 
 
 def init(default_rule=None):
@@ -81,26 +91,49 @@ def init(default_rule=None):
         _ENFORCER = policy.Enforcer(CONF)
 
     _ENFORCER.set_rules(rules)
+    _rules_changed()
+
+
+def _decision_key(rule, target):
+    try:
+        return (_RULES_GENERATION, rule, frozenset(target.items()))
+    except TypeError:
+        # Targets with unhashable values are not cached
+        return None
 
 
 def check(rule, ctxt, target=None, do_raise=True, exc=exceptions.Forbidden):
-    creds = ctxt.to_dict()
+    """
+    Check a rule for a context and target.
+
+    Decisions are cached on the context for as long as its credentials do
+    not change, so repeating a check within a request, such as for each
+    item of a listing, does not run the rule again.
+    """
+    creds = ctxt.to_policy_values()
     target = target or {}
-    try:
-        result = _ENFORCER.enforce(rule, target, creds, do_raise, exc)
-    except Exception:
-        result = False
-        raise
+
+    decisions = ctxt.policy_decisions
+    key = _decision_key(rule, target)
+
+    result = decisions.get(key) if key is not None else None
+    if result is None:
+        result = _ENFORCER.enforce(rule, target, creds)
+
+        if key is not None:
+            decisions[key] = result
+
+    extra = {'policy': {'rule': rule, 'target': target}}
+
+    if result:
+        LOG.debug("Policy check succeeded for rule '%(rule)s' on target "
+                  "%(target)r", {'rule': rule, 'target': target}, extra=extra)
     else:
-        return result
-    finally:
-        extra = {'policy': {'rule': rule, 'target': target}}
-
-        if result:
-            LOG.info(_("Policy check succeeded for rule '%(rule)s' "
-                       "on target %(target)s") %
-                     {'rule': rule, 'target': repr(target)}, extra=extra)
-        else:
-            LOG.info(_("Policy check failed for rule '%(rule)s' "
-                       "on target %(target)s") %
-                     {'rule': rule, 'target': repr(target)}, extra=extra)
+        LOG.info(_LI("Policy check failed for rule '%(rule)s' on target "
+                     "%(target)r"), {'rule': rule, 'target': target},
+                 extra=extra)
+
+        if do_raise:
+            raise exc()
+
+    return result
@@ -54,6 +54,10 @@ OPTS = [
     cfg.IntOpt('periodic-sync-seconds', default=21600,
                help='Zones Updated within last N seconds will be syncd. Use '
                     'None to sync all zones.'),
+    cfg.BoolOpt('sharded-periodic-tasks', default=True,
+                help='Split the periodic recovery and synchronization work '
+                     'by domain shard across all Pool Manager instances for '
+                     'the pool, rather than running it on the leader only'),
     cfg.StrOpt('cache-driver', default='memcache',
                help='The cache driver to use'),
 ]
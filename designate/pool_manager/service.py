@@ -13,6 +13,7 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import collections
 from contextlib import contextmanager
 from decimal import Decimal
 
@@ -69,8 +70,9 @@ class Service(service.RPCService, coordination.CoordinationMixin,
     API version history:
 
         1.0 - Initial version
+        1.1 - Add update_statuses
     """
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.1'
 
     target = messaging.Target(version=RPC_API_VERSION)
 
@@ -136,6 +138,20 @@ class Service(service.RPCService, coordination.CoordinationMixin,
             self._coordinator, '%s:%s' % (self.service_name, self.pool.id))
         self._pool_election.start()
 
+        # Setup a Partitioner, used to split the periodic tasks by domain
+        # shard across all pool-manager instances for this pool
+        self._pool_group = '%s:%s' % (self.service_name, self.pool.id)
+
+        if self._coordinator is not None:
+            self._coordinator.create_group(self._pool_group)
+            self._coordinator.join_group(self._pool_group)
+
+        self._partitioner = coordination.Partitioner(
+            self._coordinator, self._pool_group, self._coordination_id,
+            range(0, 4096))
+        self._partitioner.start()
+        self._partitioner.watch_partition_change(self._rebalance)
+
         if CONF['service:pool_manager'].enable_recovery_timer:
             LOG.info(_LI('Starting periodic recovery timer'))
             self.tg.add_timer(
@@ -153,6 +169,10 @@ class Service(service.RPCService, coordination.CoordinationMixin,
     def stop(self):
         self._pool_election.stop()
 
+        self._partitioner.unwatch_partition_change(self._rebalance)
+        if self._coordinator is not None:
+            self._coordinator.leave_group(self._pool_group)
+
         super(Service, self).stop()
 
         for target in self.pool.targets:
@@ -166,75 +186,109 @@ class Service(service.RPCService, coordination.CoordinationMixin,
     def mdns_api(self):
         return mdns_api.MdnsAPI.get_instance()
 
+    def _rebalance(self, my_partitions, members, event):
+        if my_partitions:
+            LOG.info(_LI('Handling periodic tasks for shards %(start)s to '
+                         '%(end)s'),
+                     {'start': my_partitions[0], 'end': my_partitions[-1]})
+        else:
+            LOG.info(_LI('Not handling periodic tasks for any shards'))
+
+    def _get_periodic_criterion(self):
+        """
+        Build the criterion limiting periodic tasks to the domains this
+        instance is responsible for.
+
+        :return: A criterion dict, or None if the periodic task should not run
+                 on this instance.
+        """
+        if not CONF['service:pool_manager'].sharded_periodic_tasks:
+            # NOTE(kiall): Only run this periodic task on the pool leader
+            return {} if self._pool_election.is_leader else None
+
+        # The Partitioner hands out contiguous slices of shards.
+        my_partitions = self._partitioner.my_partitions
+        if not my_partitions:
+            return None
+
+        return {'shard': 'BETWEEN %s,%s' % (my_partitions[0],
+                                            my_partitions[-1])}
+
     # Periodioc Tasks
     def periodic_recovery(self):
         """
         :return: None
         """
-        # NOTE(kiall): Only run this periodic task on the pool leader
-        if self._pool_election.is_leader:
-            context = DesignateContext.get_admin_context(all_tenants=True)
+        shard_criterion = self._get_periodic_criterion()
+        if shard_criterion is None:
+            return
 
-            LOG.debug("Starting Periodic Recovery")
+        context = DesignateContext.get_admin_context(all_tenants=True)
 
-            try:
-                # Handle Deletion Failures
-                domains = self._get_failed_domains(context, DELETE_ACTION)
+        LOG.debug("Starting Periodic Recovery")
 
-                for domain in domains:
-                    self.delete_domain(context, domain)
+        try:
+            # Handle Deletion Failures
+            domains = self._get_failed_domains(
+                context, DELETE_ACTION, shard_criterion)
 
-                # Handle Creation Failures
-                domains = self._get_failed_domains(context, CREATE_ACTION)
+            self._delete_domains(context, domains)
 
-                for domain in domains:
-                    self.create_domain(context, domain)
+            # Handle Creation Failures
+            domains = self._get_failed_domains(
+                context, CREATE_ACTION, shard_criterion)
 
-                # Handle Update Failures
-                domains = self._get_failed_domains(context, UPDATE_ACTION)
+            self._create_domains(context, domains)
 
-                for domain in domains:
-                    self.update_domain(context, domain)
+            # Handle Update Failures
+            domains = self._get_failed_domains(
+                context, UPDATE_ACTION, shard_criterion)
 
-            except Exception:
-                LOG.exception(_LE('An unhandled exception in periodic '
-                                  'recovery occurred'))
+            for domain in domains:
+                self.update_domain(context, domain)
+
+        except Exception:
+            LOG.exception(_LE('An unhandled exception in periodic '
+                              'recovery occurred'))
 
     def periodic_sync(self):
         """
         :return: None
         """
-        # NOTE(kiall): Only run this periodic task on the pool leader
-        if self._pool_election.is_leader:
-            context = DesignateContext.get_admin_context(all_tenants=True)
+        shard_criterion = self._get_periodic_criterion()
+        if shard_criterion is None:
+            return
 
-            LOG.debug("Starting Periodic Synchronization")
+        context = DesignateContext.get_admin_context(all_tenants=True)
 
-            criterion = {
-                'pool_id': CONF['service:pool_manager'].pool_id,
-                'status': '!%s' % ERROR_STATUS
-            }
+        LOG.debug("Starting Periodic Synchronization")
 
-            periodic_sync_seconds = \
-                CONF['service:pool_manager'].periodic_sync_seconds
+        criterion = {
+            'pool_id': CONF['service:pool_manager'].pool_id,
+            'status': '!%s' % ERROR_STATUS
+        }
+        criterion.update(shard_criterion)
 
-            if periodic_sync_seconds is not None:
-                # Generate the current serial, will provide a UTC Unix TS.
-                current = utils.increment_serial()
-                criterion['serial'] = ">%s" % (current - periodic_sync_seconds)
+        periodic_sync_seconds = \
+            CONF['service:pool_manager'].periodic_sync_seconds
 
-            domains = self.central_api.find_domains(context, criterion)
+        if periodic_sync_seconds is not None:
+            # Generate the current serial, will provide a UTC Unix TS.
+            current = utils.increment_serial()
+            criterion['serial'] = ">%s" % (current - periodic_sync_seconds)
 
-            try:
-                for domain in domains:
-                    # TODO(kiall): If the domain was created within the last
-                    #              periodic_sync_seconds, attempt to recreate
-                    #              to fill in targets which may have failed.
-                    self.update_domain(context, domain)
+        domains = self.central_api.find_domains(context, criterion)
 
-            except Exception:
-                LOG.exception(_LE('An unhandled exception in periodic '
-                                  'synchronization occurred.'))
+        try:
+            for domain in domains:
+                # TODO(kiall): If the domain was created within the last
+                #              periodic_sync_seconds, attempt to recreate
+                #              to fill in targets which may have failed.
+                self.update_domain(context, domain)
+
+        except Exception:
+            LOG.exception(_LE('An unhandled exception in periodic '
+                              'synchronization occurred.'))
 
     # Standard Create/Update/Delete Methods
 
@@ -253,7 +307,31 @@ class Service(service.RPCService, coordination.CoordinationMixin,
             results.append(
                 self._create_domain_on_target(context, target, domain))
 
-        if self._exceed_or_meet_threshold(results.count(True)):
+        self._create_domain_consensus(context, domain, results.count(True))
+
+    def _create_domains(self, context, domains):
+        """
+        Create many domains, letting each backend write them all at once.
+
+        :param context: Security context information.
+        :param domains: Domains to be created
+        :return: None
+        """
+        counts = self._bulk_on_targets(
+            context, 'create_domains', domains, CREATE_ACTION)
+
+        for domain in domains:
+            LOG.info(_LI("Creating new domain %s"), domain.name)
+            self._create_domain_consensus(context, domain, counts[domain.id])
+
+    def _create_domain_consensus(self, context, domain, success_count):
+        """
+        :param context: Security context information.
+        :param domain: Domain which was created on the Pool Targets
+        :param success_count: Number of Pool Targets the Domain was created on
+        :return: None
+        """
+        if self._exceed_or_meet_threshold(success_count):
             LOG.debug('Consensus reached for creating domain %(domain)s '
                       'on pool targets' % {'domain': domain.name})
 
@@ -394,12 +472,36 @@ class Service(service.RPCService, coordination.CoordinationMixin,
             results.append(
                 self._delete_domain_on_target(context, target, domain))
 
+        self._delete_domain_consensus(context, domain, results.count(True))
+
+    def _delete_domains(self, context, domains):
+        """
+        Delete many domains, letting each backend remove them all at once.
+
+        :param context: Security context information.
+        :param domains: Domains to be deleted
+        :return: None
+        """
+        counts = self._bulk_on_targets(
+            context, 'delete_domains', domains, DELETE_ACTION)
+
+        for domain in domains:
+            LOG.info(_LI("Deleting domain %s"), domain.name)
+            self._delete_domain_consensus(context, domain, counts[domain.id])
+
+    def _delete_domain_consensus(self, context, domain, success_count):
+        """
+        :param context: Security context information.
+        :param domain: Domain which was deleted from the Pool Targets
+        :param success_count: Number of Pool Targets the Domain was deleted
+                              from
+        :return: None
+        """
         # TODO(kiall): We should monitor that the Domain is actually deleted
         #              correctly on each of the nameservers, rather than
         #              assuming a successful delete-on-target is OK as we have
         #              in the past.
-        if self._exceed_or_meet_threshold(
-                results.count(True), MAXIMUM_THRESHOLD):
+        if self._exceed_or_meet_threshold(success_count, MAXIMUM_THRESHOLD):
             LOG.debug('Consensus reached for deleting domain %(domain)s '
                       'on pool targets' % {'domain': domain.name})
 
@@ -434,6 +536,51 @@ class Service(service.RPCService, coordination.CoordinationMixin,
                           {'domain': domain.name, 'target': target.id})
             return False
 
+    def _bulk_on_targets(self, context, method, domains, action):
+        """
+        Call a bulk backend method with every domain, on each Pool Target.
+
+        :param context: Security context information.
+        :param method: Name of the bulk backend method to call
+        :param domains: Domains to pass to the backend method
+        :param action: The action being taken, for logging
+        :return: A Counter of how many targets succeeded for each domain ID
+        """
+        counts = collections.Counter()
+        domains = list(domains)
+
+        if not domains:
+            return counts
+
+        for target in self.pool.targets:
+            LOG.debug("Running %(action)s for %(count)d domains on target "
+                      "%(target)s", {'action': action, 'count': len(domains),
+                                     'target': target.id})
+
+            backend = self.target_backends[target.id]
+
+            try:
+                with wrap_backend_call():
+                    results = getattr(backend, method)(context, domains)
+            except Exception:
+                LOG.exception(_LE("Failed to %(action)s %(count)d domains on "
+                                  "target %(target)s"),
+                              {'action': action.lower(),
+                               'count': len(domains), 'target': target.id})
+                continue
+
+            for domain, error in zip(domains, results):
+                if error is None:
+                    counts[domain.id] += 1
+                else:
+                    LOG.error(_LE("Failed to %(action)s domain %(domain)s on "
+                                  "target %(target)s: %(error)s"),
+                              {'action': action.lower(),
+                               'domain': domain.name, 'target': target.id,
+                               'error': error})
+
+        return counts
+
     def update_status(self, context, domain, nameserver, status,
                       actual_serial):
         """
@@ -504,13 +651,35 @@ class Service(service.RPCService, coordination.CoordinationMixin,
                     MAXIMUM_THRESHOLD):
                 self._clear_cache(context, domain, action)
 
+    def update_statuses(self, context, statuses):
+        """
+        update_statuses is called by mdns when serial polling is batched, and
+        applies many update_status calls in one go.
+        :param context: Security context information.
+        :param statuses: A list of (domain, nameserver, status, actual_serial)
+                         entries.
+        :return: None
+        """
+        LOG.debug("Calling update_statuses for %d statuses" % len(statuses))
+
+        for domain, nameserver, status, actual_serial in statuses:
+            try:
+                self.update_status(
+                    context, domain, nameserver, status, actual_serial)
+            except Exception:
+                LOG.exception(_LE('Failed to update status for domain '
+                                  '%(domain)s on nameserver %(server)s'),
+                              {'domain': domain.name,
+                               'server': self._get_destination(nameserver)})
+
     # Utility Methods
-    def _get_failed_domains(self, context, action):
+    def _get_failed_domains(self, context, action, shard_criterion=None):
         criterion = {
             'pool_id': CONF['service:pool_manager'].pool_id,
             'action': action,
             'status': 'ERROR'
         }
+        criterion.update(shard_criterion or {})
         return self.central_api.find_domains(context, criterion)
 
     @staticmethod
@@ -14,6 +14,7 @@
 
 __all__ = [
     'init',
+    'init_for_process',
     'cleanup',
     'set_defaults',
     'add_extra_exmods',
@@ -26,6 +27,8 @@ __all__ = [
     'TRANSPORT_ALIASES',
 ]
 
+import os
+
 from oslo_config import cfg
 import oslo_messaging as messaging
 from oslo_messaging import server as msg_server
@@ -40,6 +43,8 @@ from designate import objects
 CONF = cfg.CONF
 TRANSPORT = None
 NOTIFIER = None
+# The process the transport was set up in
+_PID = None
 
 
 # NOTE: Additional entries to designate.exceptions goes here.
@@ -71,7 +76,7 @@ TRANSPORT_ALIASES = {
 
 
 def init(conf):
-    global TRANSPORT, NOTIFIER
+    global TRANSPORT, NOTIFIER, _PID
     exmods = get_allowed_exmods()
     TRANSPORT = messaging.get_transport(conf,
                                         allowed_remote_exmods=exmods,
@@ -80,6 +85,28 @@ def init(conf):
     serializer = RequestContextSerializer(JsonPayloadSerializer())
     NOTIFIER = messaging.Notifier(TRANSPORT, serializer=serializer)
 
+    _PID = os.getpid()
+
+
+def init_for_process(conf):
+    """
+    Make sure this process has a transport of its own, returning True if a
+    new one was set up.
+
+    A transport inherited from the process this one was forked from is
+    dropped without being cleaned up, as its connections are shared with
+    that process.
+    """
+    global TRANSPORT, NOTIFIER
+
+    if initialized() and _PID == os.getpid():
+        return False
+
+    TRANSPORT = NOTIFIER = None
+    init(conf)
+
+    return True
+
 
 def initialized():
     return None not in [TRANSPORT, NOTIFIER]
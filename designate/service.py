@@ -18,6 +18,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 import abc
+import os
 import socket
 import struct
 import errno
@@ -164,6 +165,13 @@ class WSGIService(object):
     def __init__(self, *args, **kwargs):
         super(WSGIService, self).__init__(*args, **kwargs)
 
+        # NOTE: The socket is bound before any workers are forked, so they
+        #       all accept on it, and it stays open while workers restart.
+        self._wsgi_socket = self._wsgi_get_socket()
+        self._wsgi_server = None
+        self._wsgi_pool = None
+        self._wsgi_metrics = None
+
     @abc.abstractproperty
     def _wsgi_application(self):
         pass
@@ -171,10 +179,50 @@ class WSGIService(object):
     def start(self):
         super(WSGIService, self).start()
 
-        socket = self._wsgi_get_socket()
-        application = self._wsgi_application
+        # eventlet.wsgi.server closes the socket it is given once it stops,
+        # so each run gets a copy of the listening socket.
+        socket = self._wsgi_socket.dup()
+        if sslutils.is_enabled(CONF):
+            socket = sslutils.wrap(CONF, socket)
+
+        self._wsgi_metrics = WSGIRequestMetrics(self._wsgi_application)
+        self._wsgi_pool = eventlet.GreenPool(self.tg.pool.size)
+
+        self._wsgi_server = self.tg.add_thread(
+            self._wsgi_handle, self._wsgi_metrics, socket)
 
-        self.tg.add_thread(self._wsgi_handle, application, socket)
+        interval = self._service_config.metrics_interval
+        if interval:
+            self.tg.add_timer(interval, self._wsgi_log_metrics, interval)
+
+    def stop(self):
+        # Stop accepting connections, and give the requests already being
+        # handled a chance to finish before going away.
+        if self._wsgi_server:
+            self._wsgi_server.stop()
+            self._wsgi_server = None
+
+        if self._wsgi_pool:
+            timeout = self._service_config.graceful_shutdown_timeout
+            with eventlet.Timeout(timeout, False):
+                self._wsgi_pool.waitall()
+
+            if self._wsgi_pool.running():
+                LOG.warning(_LW("%(count)d requests were still running after "
+                                "%(timeout)d seconds"),
+                            {'count': self._wsgi_pool.running(),
+                             'timeout': timeout})
+            self._wsgi_pool = None
+
+        if self._wsgi_metrics:
+            self._wsgi_log_metrics()
+
+        super(WSGIService, self).stop()
+
+    def _wsgi_log_metrics(self):
+        LOG.info(_LI("API worker %(pid)d: %(requests)d requests, %(active)d "
+                     "active, %(errors)d errors, %(avg_time).3fs average"),
+                 self._wsgi_metrics.get_stats())
 
     def _wsgi_get_socket(self):
         # TODO(dims): eventlet's green dns/socket module does not actually
@@ -196,9 +244,6 @@ class WSGIService(object):
                 sock = eventlet.listen(bind_addr,
                                        backlog=cfg.CONF.backlog,
                                        family=family)
-                if sslutils.is_enabled(CONF):
-                    sock = sslutils.wrap(CONF, sock)
-
             except socket.error as err:
                 if err.args[0] != errno.EADDRINUSE:
                     raise
@@ -227,10 +272,72 @@ class WSGIService(object):
 
         eventlet.wsgi.server(socket,
                              application,
-                             custom_pool=self.tg.pool,
+                             custom_pool=self._wsgi_pool,
                              log=loggers.WritableLogger(logger))
 
 
+class WSGIRequestMetrics(object):
+    """
+    Wraps a WSGI application, keeping count of the requests handled by it in
+    this worker process.
+    """
+    def __init__(self, application):
+        self.application = application
+
+        self.requests = 0
+        self.active = 0
+        self.errors = 0
+        self.total_time = 0.0
+
+    def __call__(self, environ, start_response):
+        started = time.time()
+        self.requests += 1
+        self.active += 1
+
+        def _start_response(status, headers, exc_info=None):
+            if status.startswith('5'):
+                self.errors += 1
+            return start_response(status, headers, exc_info)
+
+        try:
+            result = self.application(environ, _start_response)
+        except Exception:
+            self.errors += 1
+            self._finish(started)
+            raise
+
+        if isinstance(result, (list, tuple)):
+            self._finish(started)
+            return result
+
+        # Streamed bodies are still being handled until they are consumed
+        return self._iterate(result, started)
+
+    def _iterate(self, result, started):
+        try:
+            for chunk in result:
+                yield chunk
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+            self._finish(started)
+
+    def _finish(self, started):
+        self.active -= 1
+        self.total_time += time.time() - started
+
+    def get_stats(self):
+        handled = self.requests - self.active
+
+        return {
+            'pid': os.getpid(),
+            'requests': self.requests,
+            'active': self.active,
+            'errors': self.errors,
+            'avg_time': self.total_time / handled if handled else 0.0,
+        }
+
+
 @six.add_metaclass(abc.ABCMeta)
 class DNSService(object):
     """
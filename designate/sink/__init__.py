@@ -26,4 +26,10 @@ cfg.CONF.register_opts([
                help='Number of sink greenthreads to spawn'),
     cfg.ListOpt('enabled-notification-handlers', default=[],
                 help='Enabled Notification Handlers'),
+    cfg.FloatOpt('batch-window', default=0.1,
+                 help='Seconds to gather record changes for a domain before '
+                      'applying them together, 0 applies every event on '
+                      'its own'),
+    cfg.IntOpt('batch-size', default=100,
+               help='Maximum number of events applied together'),
 ], group='service:sink')
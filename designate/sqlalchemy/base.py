@@ -14,6 +14,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import abc
+import collections
 import operator
 import threading
 
@@ -212,6 +213,39 @@ class SQLAlchemy(object):
 
         return _set_object_from_model(obj, resultproxy.fetchone())
 
+    def _create_many(self, table, objs, exc_dup, skip_values=None,
+                     extra_values=None):
+        """
+        Insert many objects with one executemany per set of changed fields,
+        which the database drivers send as multi-row inserts. Unlike _create,
+        rows are not refetched, so generated columns are not set on the
+        objects. extra_values, if given, is called with each object and
+        returns a dict of extra column values for it.
+        """
+        rows = collections.OrderedDict()
+
+        for obj in objs:
+            values = obj.obj_get_changes()
+
+            if skip_values is not None:
+                for skip_value in skip_values:
+                    values.pop(skip_value, None)
+
+            if extra_values is not None:
+                values.update(extra_values(obj))
+
+            # Every row in an executemany must have the same columns
+            rows.setdefault(frozenset(values), []).append(dict(values))
+
+        query = table.insert()
+
+        try:
+            for values in rows.values():
+                self.session.execute(query, values)
+        except oslo_db_exception.DBDuplicateEntry:
+            msg = "Duplicate %s" % objs[0].obj_name()
+            raise exc_dup(msg)
+
     def _find(self, context, table, cls, list_cls, exc_notfound, criterion,
               one=False, marker=None, limit=None, sort_key=None,
               sort_dir=None, query=None, apply_tenant_criteria=True):
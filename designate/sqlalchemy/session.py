@@ -29,14 +29,16 @@ CONF = cfg.CONF
 _FACADES = {}
 
 
-def _create_facade_lazily(cfg_group, connection=None, discriminator=None):
+def _create_facade_lazily(cfg_group, connection=None, discriminator=None,
+                          engine_options=None):
     connection = connection or cfg.CONF[cfg_group].connection
     cache_name = "%s:%s" % (cfg_group, discriminator)
 
     if cache_name not in _FACADES:
-        _FACADES[cache_name] = session.EngineFacade(
-            connection,
-            **dict(cfg.CONF[cfg_group].items()))
+        options = dict(cfg.CONF[cfg_group].items())
+        options.update(engine_options or {})
+
+        _FACADES[cache_name] = session.EngineFacade(connection, **options)
 
     return _FACADES[cache_name]
 
@@ -46,6 +48,8 @@ def get_engine(cfg_group):
     return facade.get_engine()
 
 
-def get_session(cfg_group, connection=None, discriminator=None, **kwargs):
-    facade = _create_facade_lazily(cfg_group, connection, discriminator)
+def get_session(cfg_group, connection=None, discriminator=None,
+                engine_options=None, **kwargs):
+    facade = _create_facade_lazily(
+        cfg_group, connection, discriminator, engine_options)
     return facade.get_session(**kwargs)
@@ -244,6 +244,16 @@ class Storage(DriverPlugin):
         :param domain_id: ID of the Domain.
         """
 
+    @abc.abstractmethod
+    def get_domain_version(self, context, domain_id):
+        """
+        Get only the id, tenant_id, name, serial and version of a Domain via
+        its ID, without loading the rest of it.
+
+        :param context: RPC Context.
+        :param domain_id: ID of the Domain.
+        """
+
     @abc.abstractmethod
     def find_domains(self, context, criterion=None, marker=None,
                      limit=None, sort_key=None, sort_dir=None):
@@ -260,6 +270,21 @@ class Storage(DriverPlugin):
         :param sort_dir: Direction to sort after using sort_key.
         """
 
+    @abc.abstractmethod
+    def find_domains_summary(self, context, criterion=None, marker=None,
+                             limit=None):
+        """
+        Find Domains, without loading their attributes and masters or
+        counting the total number of matches.
+
+        :param context: RPC Context.
+        :param criterion: Criteria to filter by.
+        :param marker: Resource ID from which after the requested page will
+                       start after
+        :param limit: Integer limit of objects of the page size after the
+                      marker
+        """
+
     @abc.abstractmethod
     def find_domain(self, context, criterion):
         """
@@ -315,6 +340,18 @@ class Storage(DriverPlugin):
         :param recordset: RecordSet object with the values to be created.
         """
 
+    @abc.abstractmethod
+    def create_recordsets(self, context, domain_id, recordsets):
+        """
+        Create many recordsets on a given Domain ID at once, without their
+        records. The created recordsets are not read back, so each must
+        already have its ID set.
+
+        :param context: RPC Context.
+        :param domain_id: Domain ID to create the recordsets in.
+        :param recordsets: RecordSet objects with the values to be created.
+        """
+
     @abc.abstractmethod
     def get_recordset(self, context, recordset_id):
         """
@@ -396,6 +433,17 @@ class Storage(DriverPlugin):
         :param record: Record object with the values to be created.
         """
 
+    @abc.abstractmethod
+    def create_records(self, context, domain_id, records):
+        """
+        Create many records on a given Domain ID at once. Each record must
+        have its recordset_id set, and the created records are not read back.
+
+        :param context: RPC Context.
+        :param domain_id: Domain ID to create the records in.
+        :param records: Record objects with the values to be created.
+        """
+
     @abc.abstractmethod
     def get_record(self, context, record_id):
         """
@@ -766,3 +814,10 @@ class Storage(DriverPlugin):
         return {
             'status': None
         }
+
+    def concurrent_writes(self):
+        """
+        Whether a write from one session can go ahead while another session
+        has a transaction open, rather than waiting for it to end.
+        """
+        return True
@@ -13,6 +13,7 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import collections
 import time
 import hashlib
 
@@ -26,6 +27,7 @@ from designate import exceptions
 from designate import objects
 from designate.i18n import _LI
 from designate.sqlalchemy import base as sqlalchemy_base
+from designate.sqlalchemy import utils as sqlalchemy_utils
 from designate.storage import base as storage_base
 from designate.storage.impl_sqlalchemy import tables
 
@@ -33,6 +35,7 @@ from designate.storage.impl_sqlalchemy import tables
 LOG = logging.getLogger(__name__)
 
 MAXIMUM_SUBDOMAIN_DEPTH = 128
+PURGE_CHUNK_SIZE = 1000
 
 cfg.CONF.register_group(cfg.OptGroup(
     name='storage:sqlalchemy', title="Configuration for SQLAlchemy Storage"
@@ -224,7 +227,8 @@ class SQLAlchemyStorage(sqlalchemy_base.SQLAlchemy, storage_base.Storage):
     # Domain Methods
     ##
     def _find_domains(self, context, criterion, one=False, marker=None,
-                      limit=None, sort_key=None, sort_dir=None):
+                      limit=None, sort_key=None, sort_dir=None,
+                      load_relations=True):
         # Check to see if the criterion can use the reverse_name column
         criterion = self._rname_check(criterion)
 
@@ -247,6 +251,9 @@ class SQLAlchemyStorage(sqlalchemy_base.SQLAlchemy, storage_base.Storage):
 
             domain.obj_reset_changes(['masters', 'attributes'])
 
+        if not load_relations:
+            return domains
+
         if one:
             _load_relations(domains)
         else:
@@ -284,6 +291,24 @@ class SQLAlchemyStorage(sqlalchemy_base.SQLAlchemy, storage_base.Storage):
         domain = self._find_domains(context, {'id': domain_id}, one=True)
         return domain
 
+    def get_domain_version(self, context, domain_id):
+        query = select([tables.domains.c.id, tables.domains.c.tenant_id,
+                        tables.domains.c.name, tables.domains.c.serial,
+                        tables.domains.c.version])
+        query = self._apply_criterion(tables.domains, query, {'id': domain_id})
+        query = self._apply_tenant_criteria(context, tables.domains, query)
+        query = self._apply_deleted_criteria(context, tables.domains, query)
+
+        resultproxy = self.session.execute(query)
+        result = resultproxy.fetchone()
+
+        if result is None:
+            raise exceptions.DomainNotFound("Could not find Domain")
+
+        return objects.Domain(id=result[0], tenant_id=result[1],
+                              name=result[2], serial=result[3],
+                              version=result[4])
+
     def find_domains(self, context, criterion=None, marker=None, limit=None,
                      sort_key=None, sort_dir=None):
         domains = self._find_domains(context, criterion, marker=marker,
@@ -291,6 +316,12 @@ class SQLAlchemyStorage(sqlalchemy_base.SQLAlchemy, storage_base.Storage):
                                      sort_dir=sort_dir)
         return domains
 
+    def find_domains_summary(self, context, criterion=None, marker=None,
+                             limit=None):
+        domains = self._find_domains(context, criterion, marker=marker,
+                                     limit=limit, load_relations=False)
+        return domains
+
     def find_domain(self, context, criterion):
         domain = self._find_domains(context, criterion, one=True)
         return domain
@@ -454,16 +485,38 @@ class SQLAlchemyStorage(sqlalchemy_base.SQLAlchemy, storage_base.Storage):
 
         return current.parent_domain_id
 
+    def _purge_domain_children(self, table, domain_ids):
+        """Hard delete the rows of table belonging to the given domains, in
+        chunks of PURGE_CHUNK_SIZE rows so no single statement has to lock
+        or log an unbounded number of rows.
+        :returns: number of deleted rows
+        """
+        purged = 0
+
+        while True:
+            query = select([table.c.id]).\
+                where(table.c.domain_id.in_(domain_ids)).\
+                limit(PURGE_CHUNK_SIZE)
+
+            ids = [r[0] for r in self.session.execute(query).fetchall()]
+            if not ids:
+                return purged
+
+            query = table.delete().where(table.c.id.in_(ids))
+            purged += self.session.execute(query).rowcount
+
     def purge_domains(self, context, criterion, limit):
         """Purge deleted zones.
         Reparent orphan childrens, if any.
+        Records, recordsets and attributes are removed with chunked, set
+        based DELETEs covering every zone in the batch.
         Transactions/locks are not needed.
         :returns: number of purged domains
         """
         if 'deleted' in criterion:
             context.show_deleted = True
 
-        zones = self.find_domains(
+        zones = self.find_domains_summary(
             context=context,
             criterion=criterion,
             limit=limit,
@@ -476,18 +529,33 @@ class SQLAlchemyStorage(sqlalchemy_base.SQLAlchemy, storage_base.Storage):
 
         zones_by_id = {z.id: z for z in zones}
 
+        # Reparent child zones, if any, with one UPDATE per surviving parent.
+        reparent = {}
         for zone in zones:
-
-            # Reparent child zones, if any.
             surviving_parent_id = self._walk_up_domains(zone, zones_by_id)
+            reparent.setdefault(surviving_parent_id, []).append(zone.id)
+
+        for surviving_parent_id, zone_ids in reparent.items():
             query = tables.domains.update().\
-                where(tables.domains.c.parent_domain_id == zone.id).\
+                where(tables.domains.c.parent_domain_id.in_(zone_ids)).\
                 values(parent_domain_id=surviving_parent_id)
 
             resultproxy = self.session.execute(query)
             LOG.debug(_LI("%d child zones updated"), resultproxy.rowcount)
 
-            self.purge_domain(context, zone)
+        zone_ids = list(zones_by_id.keys())
+
+        # The bulky children go first, so the final DELETE only has small
+        # cascades left to do.
+        for table in (tables.records, tables.recordsets,
+                      tables.domain_attributes):
+            purged = self._purge_domain_children(table, zone_ids)
+            LOG.debug("%(count)d rows purged from %(table)s",
+                      {'count': purged, 'table': table.name})
+
+        query = tables.domains.delete().\
+            where(tables.domains.c.id.in_(zone_ids))
+        self.session.execute(query)
 
         LOG.info(_LI("Purged %d zones"), len(zones))
         return len(zones)
@@ -678,6 +746,49 @@ class SQLAlchemyStorage(sqlalchemy_base.SQLAlchemy, storage_base.Storage):
 
         return raw_rows
 
+    def iter_recordsets_export(self, context, criterion=None,
+                               batch_size=1000):
+        """
+        Yield the same rows as find_recordsets_export, reading batch_size
+        recordsets, and their records, from the database at a time.
+        """
+        marker = None
+
+        while True:
+            query = select([tables.recordsets.c.id,
+                            tables.recordsets.c.created_at,
+                            tables.recordsets.c.name, tables.recordsets.c.ttl,
+                            tables.recordsets.c.type])
+            query = sqlalchemy_utils.paginate_query(
+                query, tables.recordsets, batch_size, ['created_at', 'id'],
+                marker=marker)
+
+            recordsets = self._select_raw(
+                context, tables.recordsets, criterion, query)
+
+            if not recordsets:
+                return
+
+            query = select([tables.records.c.recordset_id,
+                            tables.records.c.data]).where(
+                tables.records.c.recordset_id.in_(
+                    [recordset.id for recordset in recordsets]))
+
+            records = collections.defaultdict(list)
+            for record in self._select_raw(
+                    context, tables.records, None, query):
+                records[record.recordset_id].append(record.data)
+
+            for recordset in recordsets:
+                for data in records[recordset.id]:
+                    yield (recordset.name, recordset.ttl, recordset.type,
+                           data)
+
+            if len(recordsets) < batch_size:
+                return
+
+            marker = recordsets[-1]
+
     def create_recordset(self, context, domain_id, recordset):
         # Fetch the domain as we need the tenant_id
         domain = self._find_domains(context, {'id': domain_id}, one=True)
@@ -705,6 +816,19 @@ class SQLAlchemyStorage(sqlalchemy_base.SQLAlchemy, storage_base.Storage):
 
         return recordset
 
+    def create_recordsets(self, context, domain_id, recordsets):
+        # Fetch the domain as we need the tenant_id
+        domain = self._find_domains(context, {'id': domain_id}, one=True)
+
+        for recordset in recordsets:
+            recordset.tenant_id = domain.tenant_id
+            recordset.domain_id = domain_id
+
+        self._create_many(
+            tables.recordsets, recordsets, exceptions.DuplicateRecordSet,
+            ['records'],
+            extra_values=lambda rs: {"reverse_name": rs.name[::-1]})
+
     def find_recordsets_export(self, context, criterion=None):
         query = None
 
@@ -841,6 +965,17 @@ class SQLAlchemyStorage(sqlalchemy_base.SQLAlchemy, storage_base.Storage):
         return self._create(
             tables.records, record, exceptions.DuplicateRecord)
 
+    def create_records(self, context, domain_id, records):
+        # Fetch the domain as we need the tenant_id
+        domain = self._find_domains(context, {'id': domain_id}, one=True)
+
+        for record in records:
+            record.tenant_id = domain.tenant_id
+            record.domain_id = domain_id
+            record.hash = self._recalculate_record_hash(record)
+
+        self._create_many(tables.records, records, exceptions.DuplicateRecord)
+
     def get_record(self, context, record_id):
         return self._find_records(context, {'id': record_id}, one=True)
 
@@ -1419,6 +1554,11 @@ class SQLAlchemyStorage(sqlalchemy_base.SQLAlchemy, storage_base.Storage):
             'rtt': "%f" % (time.time() - start_time)
         }
 
+    def concurrent_writes(self):
+        # SQLite locks the whole database from the first write of a
+        # transaction until it ends
+        return self.engine.dialect.name != 'sqlite'
+
     # Reverse Name utils
     def _rname_check(self, criterion):
         # If the criterion has 'name' in it, switch it out for reverse_name
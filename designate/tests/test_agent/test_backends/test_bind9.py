@@ -13,6 +13,10 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import os
+import shutil
+import tempfile
+
 import mock
 import dns.zone
 
@@ -60,10 +64,61 @@ class Bind9AgentBackendTestCase(TestCase, BackendTestMixin):
     def test_delete_domain(self, execute, sync):
         self.backend.delete_domain('example.org.')
 
+    @mock.patch(('designate.backend.agent_backend.impl_bind9.Bind9Backend'
+                 '._execute_rndc'))
+    def test_sync_domain_skips_unchanged(self, execute_rndc):
+        zone_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, zone_path)
+        self.config(zone_file_path=zone_path, group='backend:agent:bind9')
+
+        domain = self._create_dnspy_zone('example.org')
+        output_path = os.path.join(zone_path, 'example.org.zone')
+
+        self.backend.create_domain(domain)
+        self.assertEqual('addzone', execute_rndc.call_args[0][0][0])
+        self.assertTrue(os.path.exists(output_path))
+
+        # Only the zone file itself should be left behind
+        self.assertEqual(['example.org.zone'], os.listdir(zone_path))
+
+        # The same serial again is skipped, without a reload
+        self.backend.update_domain(domain)
+        self.assertEqual(1, execute_rndc.call_count)
+
+        # As is an unchanged zone, even with nothing cached
+        self.backend._zone_files = {}
+        self.backend.update_domain(domain)
+        self.assertEqual(1, execute_rndc.call_count)
+
+        domain = self._create_dnspy_zone('example.org', serial=1421777855)
+        self.backend.update_domain(domain)
+        self.assertEqual(2, execute_rndc.call_count)
+        self.assertEqual(['reload', 'example.org'],
+                         execute_rndc.call_args[0][0])
+
+        with open(output_path) as f:
+            self.assertIn('1421777855', f.read())
+
+    @mock.patch(('designate.backend.agent_backend.impl_bind9.Bind9Backend'
+                 '._execute_rndc'))
+    def test_find_domain_serials(self, execute_rndc):
+        zone_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, zone_path)
+        self.config(zone_file_path=zone_path, group='backend:agent:bind9')
+
+        self.backend.create_domain(self._create_dnspy_zone('example.org'))
+        self.backend.create_domain(
+            self._create_dnspy_zone('example.net', serial=1421777855))
+
+        self.assertEqual({'example.org.': 1421777854,
+                          'example.net.': 1421777855},
+                         self.backend.find_domain_serials())
+
     # Helper
-    def _create_dnspy_zone(self, name):
+    def _create_dnspy_zone(self, name, serial=1421777854):
         zone_text = ('$ORIGIN %(name)s\n%(name)s 3600 IN SOA %(ns)s '
-        'email.email.com. 1421777854 3600 600 86400 3600\n%(name)s 3600 IN NS '
-        '%(ns)s\n') % {'name': name, 'ns': 'ns1.designate.com'}
+        'email.email.com. %(serial)d 3600 600 86400 3600\n%(name)s 3600 IN NS '
+        '%(ns)s\n') % {'name': name, 'ns': 'ns1.designate.com',
+                        'serial': serial}
 
         return dns.zone.from_text(zone_text, check_origin=False)
@@ -59,6 +59,101 @@ class AgentRequestHandlerTest(AgentTestCase):
         response = next(self.handler(request)).to_wire()
         self.assertEqual(expected_response, binascii.b2a_hex(response))
 
+    def _build_notify(self):
+        payload = ("1a7220000001000000000000076578616d706c6503636f6d000006"
+                  "0001")
+        request = dns.message.from_wire(binascii.a2b_hex(payload))
+        request.environ = {'addr': ["0.0.0.0", 1234]}
+        return request
+
+    @mock.patch('designate.dnsutils.do_axfr')
+    def test_receive_notify_up_to_date(self, doaxfr):
+        """
+        Get a NOTIFY for a zone which already has the master's serial, and
+        ensure no AXFR is triggered
+        """
+        with mock.patch.object(self.handler, '_get_master_serial',
+                               return_value=0):
+            response = next(self.handler(self._build_notify()))
+
+        self.assertEqual(dns.rcode.NOERROR, response.rcode())
+        self.assertFalse(doaxfr.called)
+
+    @mock.patch('designate.dnsutils.do_axfr')
+    def test_receive_notify_newer_serial(self, doaxfr):
+        with mock.patch.object(self.handler, '_get_master_serial',
+                               return_value=1):
+            next(self.handler(self._build_notify()))
+
+        self.assertEqual(1, doaxfr.call_count)
+        self.assertEqual({}, self.handler._transfers)
+
+    @mock.patch('designate.dnsutils.do_axfr')
+    def test_receive_notify_transfer_in_progress(self, doaxfr):
+        """
+        Get a NOTIFY while a transfer of the zone is in flight, and ensure it
+        is collapsed into that transfer
+        """
+        self.handler._transfers['example.com.'] = False
+
+        response = next(self.handler(self._build_notify()))
+
+        self.assertEqual(dns.rcode.NOERROR, response.rcode())
+        self.assertFalse(doaxfr.called)
+        self.assertTrue(self.handler._transfers['example.com.'])
+
+    @mock.patch('designate.dnsutils.do_axfr')
+    def test_transfer_repeats_for_notify_during_transfer(self, doaxfr):
+        def _notify_during_transfer(*args, **kwargs):
+            if doaxfr.call_count == 1:
+                self.handler._transfers['example.com.'] = True
+
+        doaxfr.side_effect = _notify_during_transfer
+
+        self.handler._transfers['example.com.'] = False
+        self.handler._transfer('example.com.', 0)
+
+        self.assertEqual(2, doaxfr.call_count)
+        self.assertEqual({}, self.handler._transfers)
+
+    @mock.patch('eventlet.spawn_after')
+    @mock.patch('designate.dnsutils.do_axfr')
+    def test_receive_notify_deferred(self, doaxfr, spawn_after):
+        """
+        Get a NOTIFY with a notify delay set, and ensure the AXFR is
+        scheduled rather than waited for
+        """
+        self.handler.notify_delay = 5
+
+        response = next(self.handler(self._build_notify()))
+
+        self.assertEqual(dns.rcode.NOERROR, response.rcode())
+        self.assertFalse(doaxfr.called)
+        spawn_after.assert_called_once_with(
+            5, self.handler._deferred_transfer, 'example.com.', 0)
+
+    def test_find_domain_serial_cached(self):
+        with mock.patch.object(self.handler.backend, 'find_domain_serial',
+                               return_value=5) as find_domain_serial:
+            self.assertEqual(5, self.handler._find_domain_serial('a.com.'))
+            self.assertEqual(5, self.handler._find_domain_serial('a.com.'))
+            self.assertEqual(1, find_domain_serial.call_count)
+
+            # Once the TTL is up, the backend is checked again
+            self.handler.serial_cache_ttl = 0
+            self.assertEqual(5, self.handler._find_domain_serial('a.com.'))
+            self.assertEqual(2, find_domain_serial.call_count)
+
+    def test_load_serials(self):
+        with mock.patch.object(self.handler.backend, 'find_domain_serials',
+                               return_value={'a.com.': 7}):
+            self.handler._load_serials()
+
+        with mock.patch.object(self.handler.backend,
+                               'find_domain_serial') as find_domain_serial:
+            self.assertEqual(7, self.handler._find_domain_serial('a.com.'))
+            self.assertFalse(find_domain_serial.called)
+
     def test_receive_notify_bad_notifier(self):
         """
         Get a NOTIFY from a bad master and refuse it
@@ -14,7 +14,12 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import gzip
+import io
+import zlib
+
 import mock
+import webob
 from oslo_config import cfg
 from oslo_messaging.notify import notifier
 
@@ -245,3 +250,59 @@ class FaultMiddlewareTest(ApiTestCase):
             ctxt,
             'dns.api.fault',
             {"url": None, "status": 409, "exception": ""})
+
+
+class CompressionMiddlewareTest(ApiTestCase):
+    BODY = b'{"recordsets": []}' * 100
+
+    def _app(self, body, content_length=True):
+        def application(environ, start_response):
+            headers = [('Content-Type', 'application/json'),
+                       ('ETag', '"1-1"')]
+            if content_length:
+                headers.append(('Content-Length', str(len(body))))
+            start_response('200 OK', headers)
+            return iter([body])
+
+        return middleware.CompressionMiddleware(application)
+
+    def _get(self, app, accept_encoding='gzip'):
+        request = webob.Request.blank('/')
+        request.headers['Accept-Encoding'] = accept_encoding
+        return request.get_response(app)
+
+    def _gunzip(self, body):
+        return gzip.GzipFile(fileobj=io.BytesIO(body)).read()
+
+    def test_gzip(self):
+        response = self._get(self._app(self.BODY))
+
+        self.assertEqual('gzip', response.content_encoding)
+        self.assertEqual('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual('W/"1-1"', response.headers['ETag'])
+        self.assertEqual(len(response.body), response.content_length)
+        self.assertEqual(self.BODY, self._gunzip(response.body))
+
+    def test_deflate(self):
+        response = self._get(self._app(self.BODY), 'deflate, gzip;q=0')
+
+        self.assertEqual('deflate', response.content_encoding)
+        self.assertEqual(self.BODY, zlib.decompress(response.body))
+
+    def test_streamed(self):
+        response = self._get(self._app(self.BODY, content_length=False))
+
+        self.assertEqual('gzip', response.content_encoding)
+        self.assertEqual(self.BODY, self._gunzip(response.body))
+
+    def test_not_accepted(self):
+        response = self._get(self._app(self.BODY), 'identity')
+
+        self.assertIsNone(response.content_encoding)
+        self.assertEqual(self.BODY, response.body)
+
+    def test_below_threshold(self):
+        response = self._get(self._app(b'{}'))
+
+        self.assertIsNone(response.content_encoding)
+        self.assertEqual(b'{}', response.body)
@@ -466,6 +466,24 @@ class ApiV1RecordsTest(ApiV1Test):
         self.assertIn('records', response.json)
         self.assertEqual(4, len(response.json['records']))
 
+    def test_get_records_streamed(self):
+        self.config(stream_page_size=2, group='service:api')
+
+        self.create_record(self.domain, self.recordset)
+        self.create_record(self.domain, self.recordset, fixture=1)
+
+        response = self.get('domains/%s/records' % self.domain['id'])
+
+        self.assertEqual('application/json', response.content_type)
+        self.assertEqual(4, len(response.json['records']))
+
+        # The streamed listing matches the one rendered in one go
+        self.config(stream_page_size=0, group='service:api')
+
+        self.assertEqual(
+            self.get('domains/%s/records' % self.domain['id']).json,
+            response.json)
+
     @patch.object(central_service.Service, 'find_records',
                   side_effect=messaging.MessagingTimeout())
     def test_get_records_timeout(self, _):
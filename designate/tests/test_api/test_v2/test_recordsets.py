@@ -297,6 +297,56 @@ class ApiV2RecordSetsTest(ApiV2TestCase):
 
         self._assert_invalid_paging(data, url, key='recordsets')
 
+    def test_get_recordsets_streamed(self):
+        self.config(stream_page_size=2, group='service:api')
+        url = '/zones/%s/recordsets' % self.domain['id']
+
+        data = [self.create_recordset(self.domain,
+                name='x-%s.%s' % (i, self.domain['name']))
+                for i in range(0, 10)]
+
+        response = self.client.get(url, {'limit': 5})
+
+        self.assertEqual(200, response.status_int)
+        self.assertEqual('application/json', response.content_type)
+        self.assertEqual(5, len(response.json['recordsets']))
+        self.assertIn('next', response.json['links'])
+        self.assertEqual(12, response.json['metadata']['total_count'])
+
+        # The streamed listing matches the one rendered in one go
+        self.config(stream_page_size=0, group='service:api')
+        self.assertEqual(self.client.get(url, {'limit': 5}).json,
+                         response.json)
+
+        self.config(stream_page_size=2, group='service:api')
+        response = self.client.get(url, {'limit': 'max', 'type': 'A'})
+
+        self.assertEqual([r['id'] for r in data],
+                         [r['id'] for r in response.json['recordsets']])
+        self.assertNotIn('next', response.json['links'])
+
+    def test_get_recordsets_etag(self):
+        url = '/zones/%s/recordsets' % self.domain['id']
+
+        etag = self.client.get(url).headers['ETag']
+
+        # Unchanged recordsets are not loaded or sent again
+        with patch.object(central_service.Service, 'find_recordsets') as find:
+            response = self.client.get(url, headers={'If-None-Match': etag},
+                                       status=304)
+
+            self.assertFalse(find.called)
+            self.assertEqual(etag, response.headers['ETag'])
+
+        # Adding a recordset changes the ETag
+        self.create_recordset(self.domain)
+
+        response = self.client.get(url, headers={'If-None-Match': etag})
+
+        self.assertEqual(200, response.status_int)
+        self.assertEqual(3, len(response.json['recordsets']))
+        self.assertNotEqual(etag, response.headers['ETag'])
+
     def test_get_recordsets_filter(self):
         # Add recordsets for testing
         fixtures = [
@@ -361,7 +411,7 @@ class ApiV2RecordSetsTest(ApiV2TestCase):
     def test_get_recordsets_invalid_id(self):
         self._assert_invalid_uuid(self.client.get, '/zones/%s/recordsets')
 
-    @patch.object(central_service.Service, 'get_domain',
+    @patch.object(central_service.Service, 'get_domain_version',
                   side_effect=messaging.MessagingTimeout())
     def test_get_recordsets_timeout(self, _):
         url = '/zones/ba751950-6193-11e3-949a-0800200c9a66/recordsets'
@@ -273,6 +273,20 @@ class ApiV2ZonesTest(ApiV2TestCase):
 
         self._assert_invalid_paging(data, '/zones', key='zones')
 
+    def test_get_zones_streamed(self):
+        self.config(stream_page_size=2, group='service:api')
+
+        data = [self.create_domain(name='x-%s.com.' % i)
+                for i in 'abcdefghij']
+        self._assert_paging(data, '/zones', key='zones')
+
+        # The streamed listing matches the one rendered in one go
+        streamed = self.client.get('/zones/', {'limit': 5}).json
+        self.config(stream_page_size=0, group='service:api')
+
+        self.assertEqual(self.client.get('/zones/', {'limit': 5}).json,
+                         streamed)
+
     @patch.object(central_service.Service, 'find_domains',
                   side_effect=messaging.MessagingTimeout())
     def test_get_zones_timeout(self, _):
@@ -304,7 +318,7 @@ class ApiV2ZonesTest(ApiV2TestCase):
     def test_get_zone_invalid_id(self):
         self._assert_invalid_uuid(self.client.get, '/zones/%s')
 
-    @patch.object(central_service.Service, 'get_domain',
+    @patch.object(central_service.Service, 'get_domain_version',
                   side_effect=messaging.MessagingTimeout())
     def test_get_zone_timeout(self, _):
         url = '/zones/2fdadfb1-cf96-4259-ac6b-bb7b6d2ff980'
@@ -318,6 +332,33 @@ class ApiV2ZonesTest(ApiV2TestCase):
         self._assert_exception('domain_not_found', 404, self.client.get, url,
                                headers={'Accept': 'application/json'})
 
+    def test_get_zone_etag(self):
+        zone = self.create_domain()
+        url = '/zones/%s' % zone['id']
+
+        response = self.client.get(url)
+        etag = response.headers['ETag']
+
+        self.assertEqual('W/"%s-%s"' % (response.json['serial'],
+                                        response.json['version']), etag)
+
+        # An unchanged zone is not loaded or sent again
+        with patch.object(central_service.Service, 'get_domain') as get:
+            response = self.client.get(url, headers={'If-None-Match': etag},
+                                       status=304)
+
+            self.assertFalse(get.called)
+            self.assertEqual(etag, response.headers['ETag'])
+            self.assertEqual(b'', response.body)
+
+        # Changing the zone changes its ETag
+        self.client.patch_json(url, {'email': 'example@example.org'})
+
+        response = self.client.get(url, headers={'If-None-Match': etag})
+
+        self.assertEqual(200, response.status_int)
+        self.assertNotEqual(etag, response.headers['ETag'])
+
     def test_get_zone_bad_accept(self):
         url = '/zones/6e2146f3-87bc-4f47-adc5-4df0a5c78218'
 
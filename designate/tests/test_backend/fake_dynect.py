@@ -0,0 +1,176 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import itertools
+import json
+import time
+import uuid
+
+import eventlet
+import eventlet.wsgi
+import fixtures
+
+
+class FakeDynECTServer(object):
+    """
+    A local stand in for the parts of the DynECT REST API used by the backend.
+
+    Every response is delayed by ``latency`` seconds, and zone changes run as
+    async jobs which complete ``job_duration`` seconds after being submitted,
+    so the server serves both for tests and for measuring how the backend
+    copes with a slow API.
+    """
+    def __init__(self, latency=0, job_duration=0):
+        self.latency = latency
+        self.job_duration = job_duration
+
+        self.logins = 0
+        self.logouts = 0
+        self.polls = 0
+        self.max_jobs_in_flight = 0
+
+        self.tokens = set()
+        self.zones = {}
+        self.jobs = {}
+        self._job_ids = itertools.count(1)
+
+    @property
+    def endpoint(self):
+        return 'http://127.0.0.1:%d' % self.port
+
+    def start(self):
+        sock = eventlet.listen(('127.0.0.1', 0))
+        self.port = sock.getsockname()[1]
+        self.thread = eventlet.spawn(
+            eventlet.wsgi.server, sock, self, log_output=False)
+
+    def stop(self):
+        self.thread.kill()
+
+    def expire_sessions(self):
+        self.tokens.clear()
+
+    def __call__(self, environ, start_response):
+        if self.latency:
+            eventlet.sleep(self.latency)
+
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+        body = {}
+        if length:
+            body = json.loads(
+                environ['wsgi.input'].read(length).decode('utf-8'))
+
+        # Paths look like /REST/<resource>[/<name>]
+        parts = environ['PATH_INFO'].strip('/').split('/')[1:]
+
+        status, headers, payload = self._dispatch(
+            environ['REQUEST_METHOD'], parts, body,
+            environ.get('HTTP_AUTH_TOKEN'))
+
+        headers.append(('Content-Type', 'application/json'))
+        start_response(status, headers)
+        return [json.dumps(payload).encode('utf-8')]
+
+    def _dispatch(self, method, parts, body, token):
+        resource, name = parts[0], parts[1] if len(parts) > 1 else None
+
+        if resource == 'Session' and method == 'POST':
+            self.logins += 1
+            token = uuid.uuid4().hex
+            self.tokens.add(token)
+            return self._success({'token': token, 'version': '3.5.6'},
+                                 'login: Login successful')
+
+        if token not in self.tokens:
+            return self._failure('400 Bad Request',
+                                 'login: Bad or expired credentials')
+
+        if resource == 'Session' and method == 'DELETE':
+            self.logouts += 1
+            self.tokens.discard(token)
+            return self._success({}, 'logout: Logout successful')
+
+        if resource == 'Job' and method == 'GET':
+            return self._poll(int(name))
+
+        if resource == 'Secondary' and method == 'POST':
+            if name in self.zones:
+                return self._failure('400 Bad Request',
+                                     'name: Name already exists',
+                                     'TARGET_EXISTS')
+            self.zones[name] = {'masters': body['masters'], 'active': 'N'}
+            return self._submit({'zone': name}, 'create: New zone created')
+
+        if resource == 'Secondary' and method == 'PUT' and name in self.zones:
+            if body.get('activate'):
+                self.zones[name]['active'] = 'Y'
+            else:
+                self.zones[name]['masters'] = body['masters']
+            return self._success({'zone': name}, 'update: Zone updated')
+
+        if resource == 'Zone' and method == 'DELETE' and name in self.zones:
+            del self.zones[name]
+            return self._submit({}, 'remove: Zone removed')
+
+        return self._failure('404 Not Found', 'node: Not in zone',
+                             'NOT_FOUND')
+
+    def _submit(self, data, info):
+        if not self.job_duration:
+            return self._success(data, info)
+
+        job_id = next(self._job_ids)
+        self.jobs[job_id] = (time.time() + self.job_duration, data, info)
+        self.max_jobs_in_flight = max(self.max_jobs_in_flight, len(self.jobs))
+
+        return ('307 Temporary Redirect',
+                [('Location', '/REST/Job/%d' % job_id)],
+                self._body('incomplete', {}, job_id, []))
+
+    def _poll(self, job_id):
+        self.polls += 1
+        done_at, data, info = self.jobs[job_id]
+
+        if time.time() < done_at:
+            return '200 OK', [], self._body('incomplete', {}, job_id, [])
+
+        del self.jobs[job_id]
+        return self._success(data, info, job_id)
+
+    def _success(self, data, info, job_id=None):
+        return '200 OK', [], self._body('success', data, job_id, [
+            {'INFO': info, 'SOURCE': 'BLL', 'ERR_CD': None, 'LVL': 'INFO'}])
+
+    def _failure(self, status, info, code=None):
+        return status, [], self._body('failure', {}, None, [
+            {'INFO': info, 'SOURCE': 'BLL', 'ERR_CD': code, 'LVL': 'ERROR'}])
+
+    def _body(self, status, data, job_id, msgs):
+        return {
+            'status': status,
+            'data': data,
+            'job_id': job_id or next(self._job_ids),
+            'msgs': msgs,
+        }
+
+
+class FakeDynECTFixture(fixtures.Fixture):
+    def __init__(self, latency=0, job_duration=0):
+        super(FakeDynECTFixture, self).__init__()
+        self.server = FakeDynECTServer(latency, job_duration)
+
+    def setUp(self):
+        super(FakeDynECTFixture, self).setUp()
+        self.server.start()
+
+        self.addCleanup(self.server.stop)
@@ -0,0 +1,136 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import eventlet
+import mock
+
+from designate import exceptions
+from designate import objects
+from designate.backend import batch
+from designate.backend import impl_akamai
+from designate.tests.test_backend import BackendTestCase
+
+
+class AkamaiBackendTestCase(BackendTestCase):
+    def setUp(self):
+        super(AkamaiBackendTestCase, self).setUp()
+
+        patcher = mock.patch.object(impl_akamai, 'EnhancedDNSClient')
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+        self.client.buildZone.side_effect = \
+            lambda name, *args: mock.Mock(zoneName=name)
+
+        self.target = objects.PoolTarget.from_dict({
+            'id': '4588652b-50e7-46b9-b688-a9bad40a873e',
+            'type': 'akamai',
+            'masters': [{'host': '192.0.2.1', 'port': 53}],
+            'options': [
+                {'key': 'username', 'value': 'example'},
+                {'key': 'password', 'value': 'secret'},
+                {'key': 'batch_window', 'value': '0.01'}],
+        })
+
+        self.backend = impl_akamai.AkamaiBackend(self.target)
+
+    def _domains(self, count):
+        return [objects.Domain(
+            id='a86dba58-0043-4cc6-a1bb-69d5e86f3ca%d' % i,
+            name=self.get_domain_fixture(fixture=i)['name'])
+            for i in range(count)]
+
+    def _zone_names(self, call):
+        return [zone.zoneName for zone in call[1]['zones']]
+
+    def test_create_domain_batches(self):
+        context = self.get_context()
+        domains = self._domains(3)
+
+        pool = eventlet.GreenPool()
+        for domain in domains:
+            pool.spawn(self.backend.create_domain, context, domain)
+        pool.waitall()
+
+        self.client.setZones.assert_called_once_with(zones=mock.ANY)
+        self.assertEqual([d.name for d in domains],
+                         self._zone_names(self.client.setZones.call_args))
+        self.assertFalse(self.client.setZone.called)
+        self.assertEqual(3, self.backend.set_queue.get_stats()['items'])
+
+    def test_batch_stats_logged(self):
+        self.backend.set_queue.report_interval = 0
+
+        with mock.patch.object(batch.LOG, 'info') as info:
+            self.backend.create_domain(
+                self.get_context(), self._domains(1)[0])
+
+        stats = info.call_args[0][1]
+        self.assertEqual('Akamai setZones', stats['name'])
+        self.assertEqual(1, stats['items'])
+        self.assertEqual(0, stats['depth'])
+
+    def test_delete_domain_batches(self):
+        context = self.get_context()
+        domains = self._domains(2)
+
+        pool = eventlet.GreenPool()
+        for domain in domains:
+            pool.spawn(self.backend.delete_domain, context, domain)
+        pool.waitall()
+
+        self.client.deleteZones.assert_called_once_with(
+            zoneNames=[d.name for d in domains])
+
+    def test_create_domain_batch_failure_is_attributed(self):
+        def set_zones(zones):
+            if 'example.net.' in [zone.zoneName for zone in zones]:
+                raise impl_akamai.Forbidden()
+
+        self.client.setZones.side_effect = set_zones
+        context = self.get_context()
+        domains = self._domains(3)
+
+        pool = eventlet.GreenPool()
+        threads = [pool.spawn(self.backend.create_domain, context, domain)
+                   for domain in domains]
+
+        threads[0].wait()
+        self.assertRaises(impl_akamai.Forbidden, threads[1].wait)
+        threads[2].wait()
+
+        # The whole batch, then each zone on its own
+        self.assertEqual(4, self.client.setZones.call_count)
+
+    def test_create_domains_bad_credentials(self):
+        self.client.setZones.side_effect = exceptions.ConfigurationError()
+
+        results = self.backend.create_domains(
+            self.get_context(), self._domains(2))
+
+        self.assertEqual(2, len(results))
+        for result in results:
+            self.assertIsInstance(result, exceptions.ConfigurationError)
+        self.assertEqual(1, self.client.setZones.call_count)
+
+    def test_delete_domains_chunks(self):
+        self.backend.batch_size = 2
+        domains = self._domains(3)
+
+        results = self.backend.delete_domains(self.get_context(), domains)
+
+        self.assertEqual([None, None, None], results)
+        self.assertEqual(
+            [mock.call(zoneNames=[d.name for d in domains[:2]]),
+             mock.call(zoneNames=[domains[2].name])],
+            self.client.deleteZones.call_args_list)
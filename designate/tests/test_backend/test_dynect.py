@@ -14,13 +14,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import json as json_
+import uuid
 
+import mock
 from requests_mock.contrib import fixture as req_fixture
 import testtools
 
 from designate import objects
 from designate.backend import impl_dynect
 from designate.tests.test_backend import BackendTestCase
+from designate.tests.test_backend import fake_dynect
 
 MASTERS = ["10.0.0.1"]
 CONTACT = 'jdoe@myco.biz'
@@ -185,3 +188,104 @@ class DynECTTestsCase(BackendTestCase):
         self.backend.create_domain(context, domain)
 
         self.assertTrue(update.called)
+
+    @mock.patch.object(impl_dynect.eventlet, 'sleep')
+    def test_poll_response_backoff(self, sleep):
+        self._stub_login()
+
+        self.stub_url('POST', ['/Secondary/example.com'], status_code=307,
+                      headers={'Location': '/REST/Job/1'})
+        self.requests.register_uri(
+            'GET', 'https://api.dynect.net:443/REST/Job/1', [
+                {'text': json_.dumps({'status': 'incomplete'})},
+                {'text': json_.dumps({'status': 'incomplete'})},
+                {'text': json_.dumps(ACTIVATE_SUCCESS)},
+            ])
+
+        client = self.backend.get_client()
+        response = client.post('/Secondary/example.com', data={})
+
+        self.assertEqual(ACTIVATE_SUCCESS, response)
+        self.assertEqual([mock.call(0.5), mock.call(1.0), mock.call(2.0)],
+                         sleep.call_args_list)
+
+
+class DynECTFakeServerTestCase(BackendTestCase):
+    def setUp(self):
+        super(DynECTFakeServerTestCase, self).setUp()
+
+        self.config(job_poll_interval=0.01, group='backend:dynect')
+
+        self.server = self.useFixture(
+            fake_dynect.FakeDynECTFixture(job_duration=0.05)).server
+
+        self.target = objects.PoolTarget.from_dict({
+            'id': '4588652b-50e7-46b9-b688-a9bad40a873e',
+            'type': 'dyndns',
+            'masters': [{'host': '192.0.2.1', 'port': 53}],
+            'options': [
+                {'key': 'username', 'value': 'example'},
+                {'key': 'password', 'value': 'secret'},
+                {'key': 'customer_name', 'value': 'customer'},
+                {'key': 'endpoint', 'value': self.server.endpoint}],
+        })
+
+        self.backend = impl_dynect.DynECTBackend(self.target)
+
+    def _domain(self, fixture=0):
+        return self.get_domain_fixture(
+            fixture=fixture, values={'id': str(uuid.uuid4())})
+
+    def test_session_is_reused(self):
+        context = self.get_context()
+        domains = [self._domain(i) for i in range(2)]
+
+        for domain in domains:
+            self.backend.create_domain(context, domain)
+        self.backend.delete_domain(context, domains[0])
+
+        self.assertEqual(1, self.server.logins)
+        self.assertEqual(0, self.server.logouts)
+        self.assertEqual([domains[1]['name'].rstrip('.')],
+                         list(self.server.zones))
+
+        self.backend.stop()
+        self.assertEqual(1, self.server.logouts)
+
+    def test_expired_session_logs_in_again(self):
+        context = self.get_context()
+
+        self.backend.create_domain(context, self._domain())
+        self.server.expire_sessions()
+        self.backend.create_domain(context, self._domain(1))
+
+        self.assertEqual(2, self.server.logins)
+        self.assertEqual(2, len(self.server.zones))
+
+    def test_create_domain_polls_job(self):
+        context = self.get_context()
+        domain = self._domain()
+
+        self.backend.create_domain(context, domain)
+
+        self.assertTrue(self.server.polls > 0)
+        self.assertEqual(
+            'Y', self.server.zones[domain['name'].rstrip('.')]['active'])
+
+    def test_job_timeout(self):
+        self.server.job_duration = 10
+        self.config(job_timeout=1, group='backend:dynect')
+
+        self.assertRaises(impl_dynect.DynTimeoutError,
+                          self.backend.create_domain, self.get_context(),
+                          self._domain())
+
+    def test_create_domains_polls_concurrently(self):
+        context = self.get_context()
+        domains = [self._domain(i) for i in range(3)]
+
+        results = self.backend.create_domains(context, domains)
+
+        self.assertEqual([None, None, None], results)
+        self.assertEqual(3, self.server.max_jobs_in_flight)
+        self.assertEqual(3, len(self.server.zones))
@@ -158,3 +158,69 @@ class PowerDNSBackendTestCase(BackendTestCase):
 
         # Ensure the _delete method was not called
         self.assertFalse(delete_mock.called)
+
+    @mock.patch.object(impl_powerdns.PowerDNSBackend, 'session',
+                       new_callable=mock.MagicMock)
+    def test_create_domains(self, session_mock):
+        session_mock.get_bind.return_value.dialect.\
+            supports_multivalues_insert = True
+        session_mock.execute.return_value = []
+
+        domains = [self.domain, objects.Domain(
+            id='8a6fa3b2-9d01-11e4-89d3-123b93f75cba', name='example.net.',
+            email='example@example.net')]
+
+        with mock.patch.object(self.backend, 'mdns_api') as mdns_mock:
+            results = self.backend.create_domains(self.get_context(), domains)
+
+        self.assertEqual([None, None], results)
+        self.assertEqual(2, mdns_mock.notify_zone_changed.call_count)
+
+        self.assertSessionTransactionCalls(
+            session_mock, begin=1, commit=1, rollback=0)
+
+        # Ensure we have two queries, a SELECT for domains which are already
+        # present and one multi-row INSERT
+        self.assertEqual(2, session_mock.execute.call_count)
+
+        self.assertIsInstance(
+            session_mock.execute.call_args_list[0][0][0],
+            sqlalchemy.sql.selectable.Select)
+
+        self.assertIsInstance(
+            session_mock.execute.call_args_list[1][0][0],
+            sqlalchemy.sql.dml.Insert)
+
+    @mock.patch.object(impl_powerdns.PowerDNSBackend, 'session',
+                       new_callable=mock.MagicMock)
+    @mock.patch.object(impl_powerdns.PowerDNSBackend, '_create_domains',
+                       side_effect=Exception)
+    @mock.patch.object(impl_powerdns.PowerDNSBackend, 'create_domain',
+                       side_effect=[None, exceptions.Backend])
+    def test_create_domains_failure_falls_back(self, create_mock, bulk_mock,
+                                               session_mock):
+        domains = [self.domain, self.domain]
+
+        results = self.backend.create_domains(self.get_context(), domains)
+
+        self.assertEqual(2, create_mock.call_count)
+        self.assertEqual(None, results[0])
+        self.assertIsInstance(results[1], exceptions.Backend)
+
+    @mock.patch.object(impl_powerdns.PowerDNSBackend, 'session',
+                       new_callable=mock.MagicMock)
+    def test_delete_domains(self, session_mock):
+        session_mock.get_bind.return_value.dialect.implicit_returning = False
+        session_mock.execute.return_value.rowcount = 1
+
+        results = self.backend.delete_domains(
+            self.get_context(), [self.domain])
+
+        self.assertEqual([None], results)
+
+        # Ensure we have one query, a DELETE
+        self.assertEqual(1, session_mock.execute.call_count)
+
+        self.assertIsInstance(
+            session_mock.execute.call_args_list[0][0][0],
+            sqlalchemy.sql.dml.Delete)
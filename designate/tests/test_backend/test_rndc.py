@@ -0,0 +1,308 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import base64
+import collections
+import hashlib
+import hmac
+import os
+import struct
+import tempfile
+
+import eventlet
+import fixtures
+import mock
+
+from designate import exceptions
+from designate import objects
+from designate.backend import impl_bind9
+from designate.backend import rndc
+from designate.tests.test_backend import BackendTestCase
+
+SECRET = base64.b64encode(b'designate-rndc-test-secret')
+
+
+class RndcServerStub(object):
+    """Speaks just enough of the control channel protocol to test against"""
+
+    def __init__(self):
+        self.commands = []
+        self.connections = 0
+        self.failures = {}
+        self.nonce = b'123456'
+
+    def _sign(self, table):
+        mac = hmac.new(base64.b64decode(SECRET), rndc.serialize(table),
+                       hashlib.md5)
+        return base64.b64encode(mac.digest())
+
+    def _recv(self, sock, length):
+        data = b''
+        while len(data) < length:
+            chunk = sock.recv(length - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def handle(self, sock, addr):
+        self.connections += 1
+
+        try:
+            self._serve(sock)
+        finally:
+            sock.close()
+
+    def _serve(self, sock):
+        while True:
+            header = self._recv(sock, 8)
+            if header is None:
+                return
+
+            length, _ = struct.unpack('>II', header)
+            request = rndc.parse(self._recv(sock, length - 4))
+
+            auth = request.pop('_auth')
+            if auth['hmd5'] != self._sign(request)[:22]:
+                return
+
+            command = request['_data']['type'].decode('ascii')
+            self.commands.append(command)
+
+            ctrl = collections.OrderedDict()
+            ctrl['_ser'] = request['_ctrl']['_ser']
+            ctrl['_rpl'] = b'1'
+            ctrl['_nonce'] = self.nonce
+
+            data = collections.OrderedDict()
+            data['type'] = command
+            data['result'] = b'0'
+            for prefix, error in self.failures.items():
+                if command.startswith(prefix):
+                    data['result'] = b'1'
+                    data['err'] = error
+
+            response = collections.OrderedDict()
+            response['_auth'] = {'hmd5': self._sign(
+                collections.OrderedDict([('_ctrl', ctrl), ('_data', data)]))
+                [:22]}
+            response['_ctrl'] = ctrl
+            response['_data'] = data
+
+            body = rndc.serialize(response)
+            sock.sendall(struct.pack('>II', len(body) + 4, 1) + body)
+
+    def start(self):
+        server = eventlet.listen(('127.0.0.1', 0))
+        self.port = server.getsockname()[1]
+        self.thread = eventlet.spawn(eventlet.serve, server, self.handle)
+
+    def stop(self):
+        self.thread.kill()
+
+
+class RndcFixture(fixtures.Fixture):
+    def setUp(self):
+        super(RndcFixture, self).setUp()
+        self.server = RndcServerStub()
+        self.server.start()
+
+        self.addCleanup(self.server.stop)
+
+
+class RndcTestCase(BackendTestCase):
+    def setUp(self):
+        super(RndcTestCase, self).setUp()
+
+        self.server = self.useFixture(RndcFixture()).server
+        self.client = rndc.RndcClient(
+            '127.0.0.1', self.server.port, 'hmac-md5', SECRET)
+        self.addCleanup(self.client.close)
+
+    def test_serialize_parse(self):
+        table = collections.OrderedDict()
+        table['_ctrl'] = collections.OrderedDict([('_ser', b'1')])
+        table['_data'] = collections.OrderedDict([('type', b'status')])
+
+        self.assertEqual(table, rndc.parse(rndc.serialize(table)))
+
+    def test_load_key(self):
+        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+            f.write('key "other" {\n\talgorithm hmac-sha256;\n'
+                    '\tsecret "b3RoZXI=";\n};\n'
+                    'key "rndc-key" {\n\talgorithm hmac-md5;\n'
+                    '\tsecret "c2VjcmV0";\n};\n'
+                    'options {\n\tdefault-key "rndc-key";\n};\n')
+        self.addCleanup(os.unlink, f.name)
+
+        self.assertEqual(('hmac-md5', 'c2VjcmV0'),
+                         rndc.load_key(config_file=f.name))
+
+    def test_call(self):
+        self.client.call('reload example.com')
+
+        self.assertEqual(['null', 'reload example.com'],
+                         self.server.commands)
+
+    def test_connection_is_reused(self):
+        self.client.call('reload example.com')
+        self.client.call('reload example.net')
+
+        self.assertEqual(1, self.server.connections)
+        self.assertEqual(['null', 'reload example.com', 'reload example.net'],
+                         self.server.commands)
+
+    def test_call_many_pipelines(self):
+        self.client.call_many(['reload example.com', 'reload example.net'])
+
+        self.assertEqual(1, self.server.connections)
+        self.assertEqual(['null', 'reload example.com', 'reload example.net'],
+                         self.server.commands)
+
+    def test_call_failure(self):
+        self.server.failures['addzone'] = b'already exists'
+
+        e = self.assertRaises(exceptions.Backend, self.client.call,
+                              'addzone example.com { type master; };')
+
+        self.assertIn('already exists', str(e))
+
+        # A failed command leaves the connection usable
+        self.client.call('reload example.com')
+        self.assertEqual(1, self.server.connections)
+
+    def test_bad_key(self):
+        client = rndc.RndcClient(
+            '127.0.0.1', self.server.port, 'hmac-md5',
+            base64.b64encode(b'wrong'))
+
+        self.assertRaises(exceptions.RndcProtocolError,
+                          client.call, 'reload example.com')
+
+
+class RndcCommandQueueTestCase(BackendTestCase):
+    def _execute(self, commands):
+        return [exceptions.Backend('not found') if c == 'fail' else c.upper()
+                for c in commands]
+
+    def test_submit_batches(self):
+        execute = mock.Mock(side_effect=self._execute)
+        queue = rndc.RndcCommandQueue(execute, window=0.01, batch_size=10)
+
+        pool = eventlet.GreenPool()
+        results = list(pool.imap(queue.submit, ['a', 'b', 'c']))
+
+        self.assertEqual(['A', 'B', 'C'], results)
+        execute.assert_called_once_with(['a', 'b', 'c'])
+
+        stats = queue.get_stats()
+        self.assertEqual(1, stats['batches'])
+        self.assertEqual(3, stats['items'])
+        self.assertEqual(3, stats['max_batch_size'])
+        self.assertEqual(0, stats['depth'])
+
+    def test_submit_batch_size(self):
+        execute = mock.Mock(side_effect=self._execute)
+        queue = rndc.RndcCommandQueue(execute, window=0.01, batch_size=2)
+
+        pool = eventlet.GreenPool()
+        list(pool.imap(queue.submit, ['a', 'b', 'c']))
+
+        self.assertEqual([mock.call(['a', 'b']), mock.call(['c'])],
+                         execute.call_args_list)
+
+    def test_submit_failure(self):
+        queue = rndc.RndcCommandQueue(self._execute, window=0.01)
+
+        pool = eventlet.GreenPool()
+        succeeded = pool.spawn(queue.submit, 'a')
+        failed = pool.spawn(queue.submit, 'fail')
+
+        self.assertEqual('A', succeeded.wait())
+        self.assertRaises(exceptions.Backend, failed.wait)
+
+
+class Bind9RndcBackendTestCase(BackendTestCase):
+    def setUp(self):
+        super(Bind9RndcBackendTestCase, self).setUp()
+
+        self.server = self.useFixture(RndcFixture()).server
+
+        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+            f.write('key "rndc-key" {\n\talgorithm hmac-md5;\n'
+                    '\tsecret "%s";\n};\n' % SECRET.decode('ascii'))
+        self.addCleanup(os.unlink, f.name)
+
+        self.target = objects.PoolTarget.from_dict({
+            'id': '4588652b-50e7-46b9-b688-a9bad40a873e',
+            'type': 'bind9',
+            'masters': [{'host': '192.0.2.1', 'port': 53}],
+            'options': [
+                {'key': 'rndc_port', 'value': self.server.port},
+                {'key': 'rndc_key_file', 'value': f.name},
+                {'key': 'rndc_native', 'value': 'true'},
+            ],
+        })
+
+        self.backend = impl_bind9.Bind9Backend(self.target)
+
+    @mock.patch('designate.utils.execute')
+    def test_delete_domain(self, execute):
+        context = self.get_context()
+        domain = self.get_domain_fixture()
+
+        self.backend.delete_domain(context, domain)
+
+        self.assertEqual(['null', 'delzone %s' % domain['name'].rstrip('.')],
+                         self.server.commands)
+        self.assertFalse(execute.called)
+
+    @mock.patch('designate.utils.execute')
+    def test_delete_domain_not_found(self, execute):
+        self.server.failures['delzone'] = b'not found'
+        context = self.get_context()
+        domain = self.get_domain_fixture()
+
+        self.backend.delete_domain(context, domain)
+
+        self.assertFalse(execute.called)
+
+    @mock.patch('designate.utils.execute')
+    def test_fallback_to_command(self, execute):
+        self.server.stop()
+        self.backend.rndc_client.port = 1
+
+        context = self.get_context()
+        domain = self.get_domain_fixture()
+
+        self.backend.delete_domain(context, domain)
+
+        self.assertTrue(execute.called)
+        self.assertEqual('delzone', execute.call_args[0][-2])
+
+    def test_batched_deletes(self):
+        self.backend.rndc_batch_window = 0.01
+        context = self.get_context()
+        domains = [self.get_domain_fixture(fixture=i) for i in range(2)]
+
+        pool = eventlet.GreenPool()
+        for domain in domains:
+            pool.spawn(self.backend.delete_domain, context, domain)
+        pool.waitall()
+
+        self.assertEqual(
+            ['null'] + ['delzone %s' % d['name'].rstrip('.') for d in domains],
+            self.server.commands)
+        stats = self.backend.rndc_queue.get_stats()
+        self.assertEqual(1, stats['batches'])
+        self.assertEqual(2, stats['last_batch_size'])
@@ -0,0 +1,53 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import testtools
+
+from designate import exceptions
+from designate.blob_store.base import BlobStore
+
+
+class BlobStoreTestCase(object):
+    KEY = 'zone_exports/a86dba58-0043-4cc6-a1bb-69d5e86f3ca3'
+
+    def test_interface(self):
+        self._ensure_interface(BlobStore, self.store.__class__)
+
+    def test_create_and_read(self):
+        self.store.create(self.admin_context, self.KEY, [b'0123', b'4567'])
+
+        self.assertEqual(8, self.store.get_size(self.admin_context, self.KEY))
+        self.assertEqual(b'01234567', b''.join(
+            self.store.read(self.admin_context, self.KEY)))
+
+    def test_read_range(self):
+        self.store.create(self.admin_context, self.KEY, [b'0123', b'4567'])
+
+        self.assertEqual(b'2345', b''.join(
+            self.store.read(self.admin_context, self.KEY, 2, 6)))
+        self.assertEqual(b'67', b''.join(
+            self.store.read(self.admin_context, self.KEY, 6)))
+
+    def test_delete(self):
+        self.store.create(self.admin_context, self.KEY, [b'0123'])
+        self.store.delete(self.admin_context, self.KEY)
+
+        with testtools.ExpectedException(exceptions.BlobNotFound):
+            self.store.read(self.admin_context, self.KEY)
+
+        # Deleting a missing blob is not an error
+        self.store.delete(self.admin_context, self.KEY)
+
+    def test_get_size_missing(self):
+        with testtools.ExpectedException(exceptions.BlobNotFound):
+            self.store.get_size(self.admin_context, self.KEY)
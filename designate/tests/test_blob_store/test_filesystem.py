@@ -0,0 +1,37 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import shutil
+import tempfile
+
+import testtools
+
+from designate import exceptions
+from designate.blob_store import impl_filesystem
+from designate.tests import TestCase
+from designate.tests.test_blob_store import BlobStoreTestCase
+
+
+class FilesystemBlobStoreTest(BlobStoreTestCase, TestCase):
+    def setUp(self):
+        super(FilesystemBlobStoreTest, self).setUp()
+
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        self.config(path=path, group='blob_store:filesystem')
+
+        self.store = impl_filesystem.FilesystemBlobStore()
+
+    def test_key_outside_path(self):
+        with testtools.ExpectedException(exceptions.BadRequest):
+            self.store.create(self.admin_context, '../outside', [b'0123'])
@@ -18,11 +18,14 @@
 import datetime
 import copy
 import random
+import time
 from collections import namedtuple
 
 import mock
 import testtools
 from testtools.matchers import GreaterThan
+from testtools.matchers import MatchesRegex
+from oslo_concurrency import lockutils
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_db import exception as db_exception
@@ -774,6 +777,32 @@ class CentralServiceTest(CentralTestCase):
         self.assertEqual(domain['name'], expected_domain['name'])
         self.assertEqual(domain['email'], expected_domain['email'])
 
+    def test_get_domain_version(self):
+        expected_domain = self.create_domain()
+
+        domain = self.central_service.get_domain_version(
+            self.admin_context, expected_domain['id'])
+
+        self.assertEqual(expected_domain['serial'], domain['serial'])
+        self.assertEqual(expected_domain['version'], domain['version'])
+
+        # Changing a recordset changes the serial and version
+        self.create_recordset(expected_domain)
+
+        updated = self.central_service.get_domain_version(
+            self.admin_context, expected_domain['id'])
+
+        self.assertGreater(updated['serial'], domain['serial'])
+        self.assertGreater(updated['version'], domain['version'])
+
+    def test_get_domain_version_other_tenant(self):
+        domain = self.create_domain()
+
+        context = self.get_context(tenant='2')
+
+        with testtools.ExpectedException(exceptions.DomainNotFound):
+            self.central_service.get_domain_version(context, domain['id'])
+
     def test_get_domain_servers(self):
         # Create a domain
         domain = self.create_domain()
@@ -2205,6 +2234,94 @@ class CentralServiceTest(CentralTestCase):
                 self.admin_context, domain['id'], other_recordset['id'],
                 record['id'])
 
+    def _managed_recordsets(self, domain, *data):
+        return objects.RecordSetList(objects=[objects.RecordSet(
+            name='www.%s' % domain['name'], type='A', ttl=None,
+            records=objects.RecordList(objects=[
+                objects.Record(data=d, managed=True) for d in data]))])
+
+    @mock.patch.object(notifier.Notifier, "info")
+    def test_update_managed_records_recreate(self, mock_notifier):
+        domain = self.create_domain()
+        recordset = self.create_recordset(domain, fixture=1)
+        record = self.create_record(domain, recordset)
+
+        mock_notifier.reset_mock()
+
+        # Delete the record, and create it again in the same call
+        self.central_service.update_managed_records(
+            self.admin_context, domain['id'],
+            self._managed_recordsets(domain, record.data),
+            [{'data': record.data}])
+
+        new_domain_serial = self.central_service.get_domain(
+            self.admin_context, domain['id']).serial
+
+        # The deleted record is taken back, rather than a new one created
+        updated_record = self.central_service.get_record(
+            self.admin_context, domain['id'], recordset['id'], record['id'])
+        self.assertEqual('UPDATE', updated_record.action)
+        self.assertEqual('PENDING', updated_record.status)
+        self.assertEqual(new_domain_serial, updated_record.serial)
+
+        self.assertEqual(
+            ['dns.domain.update', 'dns.record.delete', 'dns.record.update'],
+            sorted(c[0][1] for c in mock_notifier.call_args_list))
+
+    @mock.patch.object(notifier.Notifier, "info")
+    def test_update_managed_records_no_change(self, mock_notifier):
+        domain = self.create_domain()
+
+        mock_notifier.reset_mock()
+
+        # Nothing matches the criterion, and there are no records to create
+        self.central_service.update_managed_records(
+            self.admin_context, domain['id'],
+            self._managed_recordsets(domain), [{'data': '192.0.2.9'}])
+
+        new_domain_serial = self.central_service.get_domain(
+            self.admin_context, domain['id']).serial
+        self.assertEqual(domain.serial, new_domain_serial)
+
+        self.assertEqual(
+            ['dns.domain.update'],
+            [c[0][1] for c in mock_notifier.call_args_list])
+
+    @mock.patch.object(notifier.Notifier, "info")
+    def test_update_managed_records_rollback(self, mock_notifier):
+        domain = self.create_domain()
+        recordset = self.create_recordset(domain, fixture=1)
+        record = self.create_record(domain, recordset)
+
+        mock_notifier.reset_mock()
+
+        with mock.patch.object(self.central_service.storage, 'create_record',
+                               side_effect=exceptions.DuplicateRecord):
+            with testtools.ExpectedException(exceptions.DuplicateRecord):
+                self.central_service.update_managed_records(
+                    self.admin_context, domain['id'],
+                    self._managed_recordsets(domain, '192.0.2.2'),
+                    [{'data': record.data}])
+
+        # The delete was rolled back, so must not have been notified
+        self.assertFalse(mock_notifier.called)
+
+        record = self.central_service.get_record(
+            self.admin_context, domain['id'], recordset['id'], record['id'])
+        self.assertNotEqual('DELETE', record.action)
+
+    def test_update_managed_records_policy_check(self):
+        domain = self.create_domain()
+
+        for rule in ('create_record', 'delete_record'):
+            # Set the policy to reject the authz
+            self.policy({rule: '!'})
+
+            with testtools.ExpectedException(exceptions.Forbidden):
+                self.central_service.update_managed_records(
+                    self.get_context(), domain['id'],
+                    self._managed_recordsets(domain, '192.0.2.1'), [])
+
     def test_count_records(self):
         # in the beginning, there should be nothing
         records = self.central_service.count_records(self.admin_context)
@@ -2547,6 +2664,67 @@ class CentralServiceTest(CentralTestCase):
         self.central_service.get_floatingip(
             context, fip['region'], fip['id'])
 
+    def test_list_floatingips_finds_only_tenant_addresses(self):
+        context_a = self.get_context(tenant='a')
+        context_b = self.get_context(tenant='b')
+
+        fixture = self.get_ptr_fixture()
+
+        fip_a = self.network_api.fake.allocate_floatingip(context_a.tenant)
+        fip_b = self.network_api.fake.allocate_floatingip(context_b.tenant)
+
+        for context, fip in [(context_a, fip_a), (context_b, fip_b)]:
+            self.central_service.update_floatingip(
+                context, fip['region'], fip['id'], fixture)
+
+        with mock.patch.object(self.central_service, 'find_records',
+                               wraps=self.central_service.find_records) as f:
+            fips = self.central_service.list_floatingips(context_a)
+
+        self.assertEqual(1, len(fips))
+        self.assertEqual(fixture['ptrdname'], fips[0]['ptrdname'])
+        self.assertEqual([fip_a['address']],
+                         f.call_args[0][1]['managed_extra'])
+
+    def test_set_floatingip_caches_reverse_zone(self):
+        context = self.get_context(tenant='a')
+
+        fixture = self.get_ptr_fixture()
+
+        fips = [self.network_api.fake.allocate_floatingip(context.tenant)
+                for _ in range(2)]
+
+        self.central_service.update_floatingip(
+            context, fips[0]['region'], fips[0]['id'], fixture)
+
+        with mock.patch.object(self.central_service.storage,
+                               'find_domain') as find_domain:
+            fip_ptr = self.central_service.update_floatingip(
+                context, fips[1]['region'], fips[1]['id'], fixture)
+
+        self.assertFalse(find_domain.called)
+        self.assertEqual(fixture['ptrdname'], fip_ptr['ptrdname'])
+
+    def test_set_floatingip_reverse_zone_stale(self):
+        context = self.get_context(tenant='a')
+
+        fixture = self.get_ptr_fixture()
+
+        fip = self.network_api.fake.allocate_floatingip(context.tenant)
+
+        # A zone deleted behind the cache's back, as through another central
+        zone_name = self.central_service.network_api.address_zone(
+            fip['address'])
+        stale_id = 'a86dba58-0043-4cc6-a1bb-69d5e86f3ca3'
+        self.central_service._reverse_zone_ids[zone_name] = stale_id
+
+        fip_ptr = self.central_service.update_floatingip(
+            context, fip['region'], fip['id'], fixture)
+
+        self.assertEqual(fixture['ptrdname'], fip_ptr['ptrdname'])
+        self.assertNotEqual(
+            stale_id, self.central_service._reverse_zone_ids[zone_name])
+
     # Blacklist Tests
     def test_create_blacklist(self):
         values = self.get_blacklist_fixture(fixture=0)
@@ -3226,6 +3404,185 @@ class CentralServiceTest(CentralTestCase):
 
         self.wait_for_import(zone_import.id)
 
+    def test_create_zone_import_merges_recordsets(self):
+        # Import in batches small enough that the records of www end up in
+        # different batches
+        self.config(import_batch_size=2, group='service:central')
+
+        context = self.get_context()
+        request_body = (
+            "$ORIGIN example.com.\n"
+            "example.com. 600 IN SOA ns1.example.com. nsadmin.example.com. "
+            "2013091101 7200 3600 2419200 10800\n"
+            "www.example.com. 600 IN A 192.0.2.1\n"
+            "mail.example.com. 600 IN A 192.0.2.10\n"
+            "ftp.example.com. 600 IN A 192.0.2.20\n"
+            "www.example.com. 300 IN A 192.0.2.2\n"
+            "www.example.com. 600 IN A 192.0.2.1\n")
+
+        zone_import = self.central_service.create_zone_import(context,
+                                                              request_body)
+        self.wait_for_import(zone_import.id)
+
+        zone_import = self.central_service.get_zone_import(
+            context, zone_import.id)
+        self.assertEqual('example.com. imported', zone_import.message)
+
+        recordset = self.central_service.find_recordset(
+            context, criterion={'domain_id': zone_import.domain_id,
+                                'name': 'www.example.com.', 'type': 'A'})
+
+        # The recordset takes the lowest TTL, and the duplicate is skipped
+        self.assertEqual(300, recordset.ttl)
+        self.assertEqual(['192.0.2.1', '192.0.2.2'],
+                         sorted(r.data for r in recordset.records))
+
+    def test_create_zone_import_cname_conflict(self):
+        context = self.get_context()
+        request_body = (
+            "$ORIGIN example.com.\n"
+            "example.com. 600 IN SOA ns1.example.com. nsadmin.example.com. "
+            "2013091101 7200 3600 2419200 10800\n"
+            "www.example.com. 600 IN CNAME example.com.\n"
+            "www.example.com. 600 IN A 192.0.2.1\n")
+
+        zone_import = self.central_service.create_zone_import(context,
+                                                              request_body)
+        self.wait_for_import(zone_import.id, errorok=True)
+
+        zone_import = self.central_service.get_zone_import(
+            context, zone_import.id)
+        self.assertEqual('ERROR', zone_import.status)
+
+        # Nothing of the import is left behind
+        domains = self.central_service.find_domains(self.admin_context)
+        self.assertEqual(0, len(domains))
+
+    def _progress_zonefile(self):
+        return (
+            "$ORIGIN example.com.\n"
+            "example.com. 600 IN SOA ns1.example.com. nsadmin.example.com. "
+            "2013091101 7200 3600 2419200 10800\n" +
+            "".join("host%d.example.com. 600 IN A 192.0.2.%d\n" % (i, i)
+                    for i in range(1, 9)))
+
+    def test_create_zone_import_progress(self):
+        self.config(import_batch_size=2, import_progress_interval=0,
+                    group='service:central')
+
+        storage = self.central_service.storage
+        update_zone_import = storage.update_zone_import
+        messages = []
+
+        def record_update(context, zone_import):
+            messages.append(zone_import.message)
+
+            # SQLite can't take the progress write while the import's
+            # transaction is open, so only the result is stored
+            if zone_import.message.startswith('Imported '):
+                return zone_import
+            return update_zone_import(context, zone_import)
+
+        with mock.patch.object(storage, 'concurrent_writes',
+                               return_value=True), \
+                mock.patch.object(storage, 'update_zone_import',
+                                  side_effect=record_update):
+            zone_import = self.central_service.create_zone_import(
+                self.get_context(), self._progress_zonefile())
+            self.wait_for_import(zone_import.id)
+
+        progress = [m for m in messages if m.startswith('Imported ')]
+        self.assertNotEqual([], progress)
+        for message in progress:
+            self.assertThat(
+                message, MatchesRegex(r'Imported \d+ of 11 lines$'))
+
+        # The result is written last, and isn't overwritten by progress
+        self.assertEqual('example.com. imported', messages[-1])
+
+        zone_import = self.central_service.get_zone_import(
+            self.admin_context, zone_import.id)
+        self.assertEqual('COMPLETE', zone_import.status)
+        self.assertEqual('example.com. imported', zone_import.message)
+
+    def test_create_zone_import_progress_after_failure(self):
+        self.config(import_batch_size=2, import_progress_interval=0,
+                    group='service:central')
+
+        storage = self.central_service.storage
+        update_zone_import = storage.update_zone_import
+        progress = []
+
+        def slow_update(context, zone_import):
+            if not zone_import.message.startswith('Imported '):
+                return update_zone_import(context, zone_import)
+
+            # Stand in for a progress write, which SQLite can't take while
+            # the import's transaction is open. It is still running when the
+            # import fails, and refreshes the object from the row as storage
+            # does.
+            time.sleep(0.5)
+            zone_import.status = 'PENDING'
+            zone_import.obj_reset_changes()
+            progress.append(zone_import.message)
+            return zone_import
+
+        # The CNAME clashes with a recordset from an earlier batch
+        request_body = (self._progress_zonefile() +
+                        "host1.example.com. 600 IN CNAME example.com.\n")
+
+        with mock.patch.object(storage, 'concurrent_writes',
+                               return_value=True), \
+                mock.patch.object(storage, 'update_zone_import',
+                                  side_effect=slow_update):
+            zone_import = self.central_service.create_zone_import(
+                self.get_context(), request_body)
+            self.wait_for_import(zone_import.id, errorok=True)
+
+        self.assertNotEqual([], progress)
+
+        zone_import = self.central_service.get_zone_import(
+            self.admin_context, zone_import.id)
+        self.assertEqual('ERROR', zone_import.status)
+        self.assertEqual('An undefined error occured.', zone_import.message)
+
+    def test_create_zone_import_progress_sqlite(self):
+        self.config(import_batch_size=2, import_progress_interval=0,
+                    group='service:central')
+
+        storage = self.central_service.storage
+        self.assertFalse(storage.concurrent_writes())
+
+        with mock.patch.object(storage, 'update_zone_import',
+                               wraps=storage.update_zone_import) as update:
+            zone_import = self.central_service.create_zone_import(
+                self.get_context(), self._progress_zonefile())
+            self.wait_for_import(zone_import.id)
+
+        # No progress is written, as it would wait on the import's
+        # transaction, only the result
+        self.assertEqual(1, update.call_count)
+
+        zone_import = self.central_service.get_zone_import(
+            self.admin_context, zone_import.id)
+        self.assertEqual('example.com. imported', zone_import.message)
+
+    def test_create_zone_import_locks_new_domain(self):
+        lock = lockutils.lock
+        held = []
+
+        def record_lock(name):
+            held.append(name)
+            return lock(name)
+
+        with mock.patch.object(lockutils, 'lock', side_effect=record_lock):
+            zone_import = self.central_service.create_zone_import(
+                self.get_context(), self._progress_zonefile())
+            self.wait_for_import(zone_import.id)
+
+        # The same lock as create_domain takes for a new domain
+        self.assertIn('domain-None', held)
+
     def test_find_zone_imports(self):
         context = self.get_context()
 
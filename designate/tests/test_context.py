@@ -30,6 +30,56 @@ class TestDesignateContext(TestCase):
 
         self.assertEqual(orig.to_dict(), copy.to_dict())
 
+    def test_deepcopy_shares_catalog(self):
+        catalog = [{'type': 'network', 'endpoints': []}]
+        orig = context.DesignateContext(user='12345', tenant='54321',
+                                        roles=['member'],
+                                        service_catalog=catalog)
+        copy = orig.deepcopy()
+
+        self.assertIs(catalog, copy.service_catalog)
+
+        copy.roles.append('admin')
+        copy.tenant = '67890'
+
+        self.assertEqual(['member'], orig.roles)
+        self.assertEqual('54321', orig.tenant)
+
+    def test_to_dict_roles(self):
+        ctxt = context.DesignateContext(user='12345', tenant='54321',
+                                        roles=['member'])
+
+        ctxt.to_dict()['roles'].append('admin')
+
+        self.assertEqual(['member'], ctxt.roles)
+
+    def test_to_policy_values(self):
+        ctxt = context.DesignateContext(user='12345', tenant='54321',
+                                        roles=['member'])
+
+        values = ctxt.to_policy_values()
+
+        self.assertEqual(ctxt.to_dict(), values)
+        self.assertIs(values, ctxt.to_policy_values())
+
+        # Changing the context, or its roles in place, rebuilds them
+        ctxt.tenant = '67890'
+        self.assertEqual('67890', ctxt.to_policy_values()['tenant'])
+
+        ctxt.roles.append('admin')
+        self.assertEqual(['member', 'admin'],
+                         ctxt.to_policy_values()['roles'])
+
+    def test_elevated_policy_values(self):
+        ctxt = context.DesignateContext(user='12345', tenant='54321')
+        ctxt.to_policy_values()
+
+        admin_ctxt = ctxt.elevated()
+
+        self.assertTrue(admin_ctxt.to_policy_values()['is_admin'])
+        self.assertIn('admin', admin_ctxt.to_policy_values()['roles'])
+        self.assertFalse(ctxt.to_policy_values()['is_admin'])
+
     def test_elevated(self):
         ctxt = context.DesignateContext(user='12345', tenant='54321')
         admin_ctxt = ctxt.elevated()
@@ -100,6 +100,29 @@ class TestUtils(TestCase):
         self.assertEqual(len(SAMPLES), len(zone.recordsets))
         self.assertEqual('example.com.', zone.name)
 
+    def test_zone_file_reader(self):
+        reader = dnsutils.ZoneFileReader(self.get_zonefile_fixture())
+
+        rrsets = {}
+        for name, ttl, rdtype, rdata in reader:
+            k = (name, rdtype)
+            self.assertIn(k, SAMPLES)
+            self.assertEqual(SAMPLES[k].get('ttl', 0), ttl)
+
+            rrsets.setdefault(k, []).append(rdata.to_text())
+
+        for k, records in rrsets.items():
+            self.assertEqual(sorted(SAMPLES[k]['records']), sorted(records))
+
+        self.assertEqual(len(SAMPLES), len(rrsets))
+        self.assertEqual('example.com.', reader.origin.to_text())
+
+    def test_zone_file_reader_unknown_origin(self):
+        reader = dnsutils.ZoneFileReader(
+            self.get_zonefile_fixture(variant='noorigin'))
+
+        self.assertRaises(dnszone.UnknownOrigin, list, reader)
+
     def test_zone_lock(self):
         # Initialize a ZoneLock
         lock = dnsutils.ZoneLock(0.1)
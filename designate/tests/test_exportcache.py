@@ -0,0 +1,62 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import os
+import shutil
+import tempfile
+
+from designate import exportcache
+from designate.tests import TestCase
+
+ZONE_ID = 'a86dba58-0043-4cc6-a1bb-69d5e86f3ca3'
+
+
+class ExportCacheTest(TestCase):
+    def setUp(self):
+        super(ExportCacheTest, self).setUp()
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.cache = exportcache.ExportCache(
+            os.path.join(self.directory, 'exports'))
+
+    def test_open_missing(self):
+        self.assertIsNone(self.cache.open(ZONE_ID, '1-1'))
+
+    def test_store(self):
+        self.cache.store(ZONE_ID, '1-1', [b'$ORIGIN example.com.\n', b'@ '])
+
+        f = self.cache.open(ZONE_ID, '1-1')
+        self.assertEqual(b'$ORIGIN example.com.\n@ ', b''.join(
+            exportcache.decompress(exportcache.iter_file(f))))
+
+    def test_store_compressed(self):
+        path = self.cache.store(ZONE_ID, '1-1', [b'zone'])
+        with open(path, 'rb') as f:
+            compressed = f.read()
+
+        self.cache.store(ZONE_ID, '2-2', [compressed[:5], compressed[5:]],
+                         compressed=True)
+
+        f = self.cache.open(ZONE_ID, '2-2')
+        self.assertEqual(b'zone', b''.join(
+            exportcache.decompress(exportcache.iter_file(f))))
+
+    def test_store_replaces_older(self):
+        self.cache.store(ZONE_ID, '1-1', [b'old'])
+        self.cache.store(ZONE_ID, '2-2', [b'new'])
+
+        self.assertIsNone(self.cache.open(ZONE_ID, '1-1'))
+        self.assertEqual(['%s-2-2.gz' % ZONE_ID],
+                         os.listdir(self.cache.directory))
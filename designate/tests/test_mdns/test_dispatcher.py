@@ -0,0 +1,130 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import dns.flags
+import dns.message
+import dns.rcode
+import mock
+
+from designate.tests.test_mdns import MdnsTestCase
+from designate.mdns import dispatcher
+from designate import objects
+
+
+class DestinationNotifierTest(MdnsTestCase):
+
+    def setUp(self):
+        super(DestinationNotifierTest, self).setUp()
+
+        self.notifier = dispatcher.DestinationNotifier('127.0.0.1', 65255)
+        self.notifier._sock = mock.Mock()
+
+    def _build_domain(self, name='example.com.'):
+        return objects.Domain.from_dict({
+            'name': name,
+            'email': 'example@example.com',
+            'serial': 100,
+        })
+
+    def _sent_messages(self):
+        return [dns.message.from_wire(c[0][0])
+                for c in self.notifier._sock.send.call_args_list]
+
+    def _respond(self, message, rcode=dns.rcode.NOERROR, aa=True):
+        response = dns.message.make_response(message)
+        response.set_rcode(rcode)
+        if aa:
+            response.flags |= dns.flags.AA
+        self.notifier.receive(response.to_wire())
+
+    def test_send_and_acknowledge(self):
+        self.notifier.add(self._build_domain(), 0, 0, 2, 0)
+        self.notifier.add(self._build_domain('example.net.'), 0, 0, 2, 0)
+
+        self.assertEqual(2, self.notifier.run_once())
+
+        messages = self._sent_messages()
+        self.assertEqual(2, len(messages))
+        self.assertNotEqual(messages[0].id, messages[1].id)
+
+        for message in messages:
+            self._respond(message)
+
+        self.assertEqual(0, len(self.notifier))
+        self.assertEqual(2, self.notifier.stats['sent'])
+        self.assertEqual(2, self.notifier.stats['acknowledged'])
+
+    def test_non_auth_response(self):
+        self.notifier.add(self._build_domain(), 0, 0, 2, 0)
+        self.notifier.run_once()
+
+        self._respond(self._sent_messages()[0], dns.rcode.NOTAUTH, aa=False)
+
+        self.assertEqual(0, len(self.notifier))
+        self.assertEqual(1, self.notifier.stats['failed'])
+
+    def test_retransmit_and_time_out(self):
+        self.notifier.add(self._build_domain(), 0, 0, 2, 0)
+
+        self.assertEqual(1, self.notifier.run_once())
+        self.assertEqual(1, self.notifier.run_once())
+        self.assertEqual(0, self.notifier.run_once())
+
+        # Retransmits reuse the message ID
+        messages = self._sent_messages()
+        self.assertEqual(messages[0].id, messages[1].id)
+
+        self.assertEqual(0, len(self.notifier))
+        self.assertEqual(1, self.notifier.stats['retransmitted'])
+        self.assertEqual(1, self.notifier.stats['timed_out'])
+
+    def test_newer_notify_supersedes(self):
+        self.notifier.add(self._build_domain(), 0, 0, 2, 0)
+        self.notifier.add(self._build_domain(), 0, 0, 2, 0)
+
+        self.assertEqual(1, len(self.notifier))
+        self.assertEqual(1, self.notifier.run_once())
+
+    def test_rate_limit(self):
+        self.notifier.rate = 1
+        self.notifier._tokens = 1
+
+        self.notifier.add(self._build_domain(), 0, 0, 2, 0)
+        self.notifier.add(self._build_domain('example.net.'), 0, 0, 2, 0)
+
+        self.assertEqual(1, self.notifier.run_once())
+        self.assertEqual(1, len(self.notifier._outbound))
+
+
+class NotifyDispatcherTest(MdnsTestCase):
+
+    def test_report(self):
+        notify_dispatcher = dispatcher.NotifyDispatcher(mock.Mock())
+
+        domain = objects.Domain.from_dict({
+            'name': 'example.com.',
+            'email': 'example@example.com',
+            'serial': 100,
+        })
+        notify_dispatcher.notify(domain, '127.0.0.1', 65255, 0, 0, 2, 0)
+
+        with mock.patch.object(dispatcher.LOG, 'info') as info:
+            notify_dispatcher._report()
+            # Unchanged stats aren't logged again
+            notify_dispatcher._report()
+
+        self.assertEqual(1, info.call_count)
+        stats = info.call_args[0][1]
+        self.assertEqual('127.0.0.1', stats['host'])
+        self.assertEqual(0, stats['sent'])
+        self.assertEqual(1, stats['pending'])
@@ -0,0 +1,255 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import binascii
+import socket
+import threading
+import time
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+import mock
+
+from designate.tests.test_mdns import MdnsTestCase
+from designate.mdns import poller
+from designate import objects
+
+# example.com. 3600 IN SOA example-ns.com. admin.example.com. 100 3600 600
+#  86400 3600
+SOA_100 = ("271184000001000100000000076578616d706c6503636f6d0000060001c00c0006"
+           "000100000e1000290a6578616d706c652d6e73c0140561646d696ec00c00000064"
+           "00000e10000002580001518000000e10")
+
+# example.com. 3600 IN SOA example-ns.com. admin.example.com. 99 3600 600
+#  86400 3600
+SOA_99 = ("271184000001000100000000076578616d706c6503636f6d0000060001c00c00060"
+          "00100000e1000290a6578616d706c652d6e73c0140561646d696ec00c0000006300"
+          "000e10000002580001518000000e10")
+
+
+class TimerWheelTest(MdnsTestCase):
+    def test_pop_due(self):
+        wheel = poller.TimerWheel(tick=1.0, size=8)
+
+        wheel.schedule('now', 0)
+        wheel.schedule('later', 3)
+        wheel.schedule('much-later', 20)
+        now = time.time()
+
+        self.assertEqual(3, len(wheel))
+        self.assertEqual(['now'], wheel.pop_due(now))
+        self.assertEqual([], wheel.pop_due(now + 1))
+        self.assertEqual(['later'], wheel.pop_due(now + 4))
+
+        # Items more than a revolution ahead stay put until they are due
+        self.assertEqual([], wheel.pop_due(now + 10))
+        self.assertEqual(['much-later'], wheel.pop_due(now + 21))
+        self.assertEqual(0, len(wheel))
+
+
+class NameserverPollerTest(MdnsTestCase):
+
+    def setUp(self):
+        super(NameserverPollerTest, self).setUp()
+
+        self.report = mock.Mock()
+        self.poller = poller.NameserverPoller(
+            '127.0.0.1', 65255, self.report, batch_size=10)
+
+    def _build_item(self, name='example.com.', serial=100, max_retries=2):
+        domain = objects.Domain.from_dict({
+            'id': 'a86dba58-0043-4cc6-a1bb-69d5e86f3ca3',
+            'name': name,
+            'serial': serial,
+            'action': 'UPDATE',
+            'pool_id': '794ccc2c-d751-44fe-b57f-8894c9f5c842',
+        })
+        nameserver = objects.PoolNameserver.from_dict({
+            'host': '127.0.0.1',
+            'port': 65255,
+        })
+        return poller.PollItem(
+            self.get_context(), domain, nameserver, 0, 0, max_retries)
+
+    def _respond_with(self, hex_response):
+        def _query(items):
+            return dict(
+                (id(item), dns.message.from_wire(
+                    binascii.a2b_hex(hex_response)))
+                for item in items)
+        return _query
+
+    def test_run_once_success(self):
+        item = self._build_item()
+        self.poller.add(item, 0)
+
+        with mock.patch.object(self.poller, '_query',
+                               side_effect=self._respond_with(SOA_100)):
+            finished = self.poller.run_once()
+
+        self.assertEqual([item], finished)
+        self.assertEqual('SUCCESS', item.status)
+        self.assertEqual(100, item.actual_serial)
+        self.report.assert_called_once_with([item])
+        self.assertEqual(0, len(self.poller))
+
+    def test_run_once_lower_serial_retries(self):
+        item = self._build_item()
+        self.poller.add(item, 0)
+
+        with mock.patch.object(self.poller, '_query',
+                               side_effect=self._respond_with(SOA_99)):
+            self.assertEqual([], self.poller.run_once())
+            self.assertEqual(1, len(self.poller))
+            self.assertFalse(self.report.called)
+
+            finished = self.poller.run_once()
+
+        self.assertEqual([item], finished)
+        self.assertEqual('ERROR', item.status)
+        self.assertEqual(99, item.actual_serial)
+        self.assertEqual(0, item.retries)
+
+    def test_run_once_timeout(self):
+        item = self._build_item(max_retries=1)
+        self.poller.add(item, 0)
+
+        with mock.patch.object(self.poller, '_query', return_value={}):
+            finished = self.poller.run_once()
+
+        self.assertEqual([item], finished)
+        self.assertEqual('ERROR', item.status)
+        self.assertEqual(None, item.actual_serial)
+
+    def test_run_once_no_domain_retries(self):
+        item = self._build_item()
+        self.poller.add(item, 0)
+
+        def _query(items):
+            responses = {}
+            for item in items:
+                response = dns.message.make_response(dns.message.make_query(
+                    item.domain.name, dns.rdatatype.SOA))
+                response.set_rcode(dns.rcode.NXDOMAIN)
+                responses[id(item)] = response
+            return responses
+
+        with mock.patch.object(self.poller, '_query', side_effect=_query):
+            # A new zone may not be loaded yet, so keep trying
+            self.assertEqual([], self.poller.run_once())
+            self.assertEqual(1, len(self.poller))
+            self.assertFalse(self.report.called)
+
+            finished = self.poller.run_once()
+
+        self.assertEqual([item], finished)
+        self.assertEqual('NO_DOMAIN', item.status)
+        self.assertEqual(0, item.retries)
+
+    def _start_responder(self, serials, expected_queries):
+        """
+        Answer SOA queries on a local UDP socket, with the serial for each
+        zone in ``serials``, after sending a malformed message, a response
+        with an unknown ID and a response for another zone under the ID of
+        one of the queries.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(('127.0.0.1', 0))
+        sock.settimeout(5)
+        self.addCleanup(sock.close)
+
+        def respond():
+            queries = []
+            for _ in range(expected_queries):
+                wire, addr = sock.recvfrom(65535)
+                queries.append(dns.message.from_wire(wire))
+
+            sock.sendto(b'not a dns message', addr)
+
+            ids = set(query.id for query in queries)
+            stray = dns.message.make_response(queries[0])
+            stray.id = next(i for i in range(65536) if i not in ids)
+            sock.sendto(stray.to_wire(), addr)
+
+            foreign = dns.message.make_query(
+                'example.org.', dns.rdatatype.SOA)
+            foreign.id = queries[0].id
+            sock.sendto(dns.message.make_response(foreign).to_wire(), addr)
+
+            for query in queries:
+                name = query.question[0].name
+                if name.to_text() not in serials:
+                    continue
+
+                response = dns.message.make_response(query)
+                response.answer.append(dns.rrset.from_text(
+                    name, 3600, 'IN', 'SOA',
+                    'ns.example.com. admin.example.com. %d 3600 600 86400 '
+                    '3600' % serials[name.to_text()]))
+                sock.sendto(response.to_wire(), addr)
+
+        thread = threading.Thread(target=respond)
+        thread.start()
+        self.addCleanup(thread.join)
+
+        return sock.getsockname()[1]
+
+    def test_query(self):
+        port = self._start_responder({'example.com.': 100}, 2)
+        nameserver_poller = poller.NameserverPoller(
+            '127.0.0.1', port, self.report)
+
+        answered = self._build_item()
+        unanswered = self._build_item(name='example.net.')
+
+        responses = nameserver_poller._query([answered, unanswered])
+
+        # Only the real response is matched, the others are ignored
+        self.assertEqual([id(answered)], list(responses))
+
+        nameserver_poller._process(answered, responses[id(answered)])
+        self.assertEqual('SUCCESS', answered.status)
+        self.assertEqual(100, answered.actual_serial)
+
+    def test_add_newer_serial_supersedes(self):
+        old = self._build_item(serial=99)
+        new = self._build_item(serial=100)
+        self.poller.add(old, 0)
+        self.poller.add(new, 0)
+
+        self.assertEqual(1, len(self.poller))
+
+        with mock.patch.object(self.poller, '_query',
+                               side_effect=self._respond_with(SOA_100)) as q:
+            finished = self.poller.run_once()
+
+        self.assertEqual([new], finished)
+        self.assertEqual([new], q.call_args[0][0])
+
+    def test_serial_poller_reports_in_bulk(self):
+        pool_manager_api = mock.Mock()
+        serial_poller = poller.SerialPoller(mock.Mock(), pool_manager_api)
+
+        items = [self._build_item(), self._build_item(name='example.net.')]
+        for item in items:
+            item.status = 'SUCCESS'
+            item.actual_serial = 100
+
+        serial_poller._report(items)
+
+        pool_manager_api.update_statuses.assert_called_once_with(
+            items[0].context,
+            [(item.domain, item.nameserver, 'SUCCESS', 100)
+             for item in items])
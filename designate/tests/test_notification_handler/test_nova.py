@@ -14,8 +14,12 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import copy
+
+import eventlet
 import mock
 from oslo_log import log as logging
+from testtools.matchers import GreaterThan
 
 from designate.tests import TestCase
 from designate.notification_handler.nova import NovaFixedHandler
@@ -142,13 +146,67 @@ class NovaFixedHandlerTest(TestCase, NotificationHandlerMixin):
         self.config(format=['%(label)s.example.com'],
                     group='handler:nova_fixed')
         fixture = self.get_notification_fixture('nova', event_type)
-        with mock.patch.object(self.plugin, '_find_or_create_recordset')\
-                as finder:
-                with mock.patch.object(self.plugin.central_api,
-                                       'create_record'):
-                    finder.return_value = {'id': 'fakeid'}
-                    self.plugin.process_notification(
-                        self.admin_context, event_type, fixture['payload'])
-                    finder.assert_called_once_with(
-                        mock.ANY, type='A', domain_id=self.domain_id,
-                        name='private.example.com')
+        with mock.patch.object(self.plugin.central_api,
+                               'update_managed_records') as update:
+            self.plugin.process_notification(
+                self.admin_context, event_type, fixture['payload'])
+
+        update.assert_called_once_with(
+            mock.ANY, self.domain_id, mock.ANY, [])
+        recordsets = update.call_args[0][2]
+        self.assertEqual(['private.example.com'],
+                         [rs.name for rs in recordsets])
+        self.assertEqual(['A'], [rs.type for rs in recordsets])
+
+    def _process_concurrently(self, events):
+        pool = eventlet.GreenPool()
+        for event_type, payload in events:
+            pool.spawn(self.plugin.process_notification,
+                       self.admin_context, event_type, payload)
+        pool.waitall()
+
+    def test_events_batched(self):
+        event_type = 'compute.instance.create.end'
+        fixture = self.get_notification_fixture('nova', event_type)
+
+        other = copy.deepcopy(fixture['payload'])
+        other['instance_id'] = '9f7b0f5e-9e1b-4c62-b04e-93a0a5e23ef6'
+        other['host'] = 'other'
+        other['fixed_ips'][0]['address'] = '192.0.2.200'
+
+        serial = self.central_service.get_domain(
+            self.admin_context, self.domain_id).serial
+
+        central = self.central_service
+        with mock.patch.object(self.plugin.central_api,
+                               'update_managed_records',
+                               wraps=central.update_managed_records) as update:
+            self._process_concurrently(
+                [(event_type, fixture['payload']), (event_type, other)])
+
+        self.assertEqual(1, update.call_count)
+
+        # Two instances, each with a record in two formats
+        records = self.central_service.find_records(
+            self.admin_context, {'domain_id': self.domain_id})
+        self.assertEqual(6, len(records))
+
+        domain = self.central_service.get_domain(
+            self.admin_context, self.domain_id)
+        self.assertThat(domain.serial, GreaterThan(serial))
+
+    def test_create_cancelled_by_delete(self):
+        create_type = 'compute.instance.create.end'
+        create = self.get_notification_fixture('nova', create_type)
+        delete_type = 'compute.instance.delete.start'
+        delete = self.get_notification_fixture('nova', delete_type)
+
+        with mock.patch.object(self.plugin.central_api,
+                               'update_managed_records') as update:
+            self._process_concurrently([
+                (create_type, create['payload']),
+                (delete_type, delete['payload'])])
+
+        update.assert_called_once_with(
+            mock.ANY, self.domain_id, mock.ANY, [mock.ANY])
+        self.assertEqual(0, len(update.call_args[0][2]))
@@ -0,0 +1,93 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import mock
+import testtools
+from oslo_log import log as logging
+
+from designate.tests import TestCase
+from designate import context
+from designate import exceptions
+from designate import policy
+
+LOG = logging.getLogger(__name__)
+
+
+class TestPolicy(TestCase):
+    def setUp(self):
+        super(TestPolicy, self).setUp()
+        self.policy({'member_only': 'role:member'})
+
+        self.ctxt = context.DesignateContext(
+            user='12345', tenant='54321', roles=['member'])
+
+    def test_check_cached(self):
+        with mock.patch.object(policy._ENFORCER, 'enforce',
+                               wraps=policy._ENFORCER.enforce) as enforce:
+            for _ in range(3):
+                self.assertTrue(policy.check(
+                    'member_only', self.ctxt, {'tenant_id': '54321'}))
+
+            self.assertEqual(1, enforce.call_count)
+
+            # A different target is checked on its own
+            policy.check('member_only', self.ctxt, {'tenant_id': '67890'})
+
+            self.assertEqual(2, enforce.call_count)
+
+    def test_check_failure_cached(self):
+        self.ctxt.roles = ['reader']
+
+        with mock.patch.object(policy._ENFORCER, 'enforce',
+                               wraps=policy._ENFORCER.enforce) as enforce:
+            for _ in range(2):
+                with testtools.ExpectedException(exceptions.Forbidden):
+                    policy.check('member_only', self.ctxt)
+
+            self.assertFalse(
+                policy.check('member_only', self.ctxt, do_raise=False))
+            self.assertEqual(1, enforce.call_count)
+
+    def test_check_context_changed(self):
+        self.assertTrue(policy.check('member_only', self.ctxt))
+
+        self.ctxt.roles.remove('member')
+
+        self.assertFalse(
+            policy.check('member_only', self.ctxt, do_raise=False))
+
+    def test_check_elevated_not_shared(self):
+        self.ctxt.roles = ['reader']
+        self.assertFalse(
+            policy.check('member_only', self.ctxt, do_raise=False))
+
+        admin_ctxt = self.ctxt.elevated()
+        admin_ctxt.roles.append('member')
+
+        self.assertTrue(policy.check('member_only', admin_ctxt))
+        self.assertFalse(
+            policy.check('member_only', self.ctxt, do_raise=False))
+
+    def test_check_rules_changed(self):
+        self.assertTrue(policy.check('member_only', self.ctxt))
+
+        self.policy({'member_only': '!'})
+
+        self.assertFalse(
+            policy.check('member_only', self.ctxt, do_raise=False))
+
+    def test_check_unhashable_target(self):
+        target = {'tenant_id': '54321', 'ids': ['a', 'b']}
+
+        self.assertTrue(policy.check('member_only', self.ctxt, target))
+        self.assertEqual({}, self.ctxt.policy_decisions)
@@ -102,3 +102,28 @@ class PoolManagerAPITest(PoolManagerTestCase):
         mock_prepare.return_value.cast.assert_called_once_with(
             self.admin_context, 'update_status', domain=domain,
             nameserver=nameserver, status='SUCCESS', actual_serial=1)
+
+    @patch.object(messaging.RPCClient, 'prepare')
+    def test_update_statuses(self, mock_prepare):
+        inner_mock = mock.Mock()
+        inner_mock.cast = mock.Mock(return_value=None)
+        mock_prepare.return_value = inner_mock
+
+        values = {
+            'name': 'example.org.',
+            'pool_id': '794ccc2c-d751-44fe-b57f-8894c9f5c842'
+        }
+        domain = objects.Domain.from_dict(values)
+        values = {
+            'host': '127.0.0.1',
+            'port': '53'
+        }
+        nameserver = objects.PoolNameserver.from_dict(values)
+        statuses = [(domain, nameserver, 'SUCCESS', 1)]
+        PoolManagerAPI.get_instance().update_statuses(
+            self.admin_context, statuses)
+
+        mock_prepare.assert_called_once_with(
+            topic='pool_manager.%s' % domain.pool_id, version='1.1')
+        mock_prepare.return_value.cast.assert_called_once_with(
+            self.admin_context, 'update_statuses', statuses=statuses)
@@ -417,3 +417,74 @@ class PoolManagerServiceNoopTest(PoolManagerTestCase):
 
         mock_update_status.assert_called_once_with(
             self.admin_context, domain.id, 'ERROR', 0)
+
+    @patch.object(mdns_rpcapi.MdnsAPI, 'get_serial_number',
+                  side_effect=messaging.MessagingException)
+    @patch.object(central_rpcapi.CentralAPI, 'update_status')
+    def test_update_statuses(self, mock_update_status, _):
+        domain = self._build_domain('example.org.', 'UPDATE', 'PENDING')
+
+        self.service.update_statuses(self.admin_context, [
+            (domain, self.service.pool.nameservers[0], 'ERROR',
+             domain.serial),
+            (domain, self.service.pool.nameservers[1], 'ERROR',
+             domain.serial),
+        ])
+
+        self.assertEqual(
+            [call(self.admin_context, domain.id, 'ERROR', 0),
+             call(self.admin_context, domain.id, 'ERROR', 0)],
+            mock_update_status.call_args_list)
+
+    @patch.object(central_rpcapi.CentralAPI, 'find_domains', return_value=[])
+    def test_periodic_sync_sharded(self, mock_find_domains):
+        self.service._partitioner._my_partitions = range(0, 2048)
+
+        self.service.periodic_sync()
+
+        criterion = mock_find_domains.call_args[0][1]
+        self.assertEqual('BETWEEN 0,2047', criterion['shard'])
+        self.assertEqual(self.service.pool.id, criterion['pool_id'])
+
+    @patch.object(central_rpcapi.CentralAPI, 'find_domains', return_value=[])
+    def test_periodic_sync_no_shards(self, mock_find_domains):
+        self.service._partitioner._my_partitions = []
+
+        self.service.periodic_sync()
+
+        self.assertFalse(mock_find_domains.called)
+
+    @patch.object(central_rpcapi.CentralAPI, 'find_domains', return_value=[])
+    def test_periodic_recovery_leader_only(self, mock_find_domains):
+        self.config(sharded_periodic_tasks=False,
+                    group='service:pool_manager')
+
+        self.service._pool_election._leader = False
+        self.service.periodic_recovery()
+        self.assertFalse(mock_find_domains.called)
+
+        self.service._pool_election._leader = True
+        self.service.periodic_recovery()
+        self.assertEqual(3, mock_find_domains.call_count)
+        self.assertNotIn('shard', mock_find_domains.call_args[0][1])
+
+    @patch.object(central_rpcapi.CentralAPI, 'update_status')
+    @patch.object(impl_fake.FakeBackend, 'delete_domains')
+    def test_periodic_recovery_bulk_delete(self, mock_delete_domains,
+                                           mock_update_status):
+        domains = [self._build_domain('example.org.', 'DELETE', 'ERROR')]
+        mock_delete_domains.side_effect = [[None], [exceptions.Backend()]]
+        self.service._partitioner._my_partitions = range(0, 4096)
+
+        with patch.object(self.service, '_get_failed_domains',
+                          side_effect=[domains, [], []]):
+            self.service.periodic_recovery()
+
+        # Each target is sent every domain in one call
+        self.assertEqual(2, mock_delete_domains.call_count)
+        self.assertEqual(domains, mock_delete_domains.call_args[0][1])
+
+        # Deletes need every target to succeed
+        self.assertEqual(1, mock_update_status.call_count)
+        self.assertEqual((domains[0].id, 'ERROR', domains[0].serial),
+                         mock_update_status.call_args[0][1:])
@@ -0,0 +1,76 @@
+# Copyright 2015 Hewlett-Packard Development Company, L.P.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import os
+
+import mock
+from oslo_config import cfg
+
+from designate import rpc
+from designate import service
+from designate.tests import TestCase
+
+
+class RPCProcessTest(TestCase):
+    def test_init_for_process_same_process(self):
+        transport = rpc.TRANSPORT
+
+        self.assertFalse(rpc.init_for_process(cfg.CONF))
+        self.assertIs(transport, rpc.TRANSPORT)
+
+    def test_init_for_process_forked(self):
+        transport = rpc.TRANSPORT
+
+        with mock.patch.object(os, 'getpid', return_value=-1):
+            self.assertTrue(rpc.init_for_process(cfg.CONF))
+            self.assertFalse(rpc.init_for_process(cfg.CONF))
+
+        self.assertIsNot(transport, rpc.TRANSPORT)
+
+
+class WSGIRequestMetricsTest(TestCase):
+    def _app(self, status, body):
+        def application(environ, start_response):
+            start_response(status, [])
+            return body
+        return application
+
+    def test_counts_requests(self):
+        metrics = service.WSGIRequestMetrics(self._app('200 OK', [b'ok']))
+
+        self.assertEqual([b'ok'], metrics({}, mock.Mock()))
+        self.assertEqual([b'ok'], metrics({}, mock.Mock()))
+
+        stats = metrics.get_stats()
+        self.assertEqual(2, stats['requests'])
+        self.assertEqual(0, stats['active'])
+        self.assertEqual(0, stats['errors'])
+        self.assertEqual(os.getpid(), stats['pid'])
+
+    def test_counts_errors(self):
+        metrics = service.WSGIRequestMetrics(
+            self._app('500 Internal Server Error', [b'']))
+
+        metrics({}, mock.Mock())
+
+        self.assertEqual(1, metrics.get_stats()['errors'])
+
+    def test_streamed_response_is_active_until_consumed(self):
+        metrics = service.WSGIRequestMetrics(
+            self._app('200 OK', iter([b'a', b'b'])))
+
+        result = metrics({}, mock.Mock())
+        self.assertEqual(1, metrics.get_stats()['active'])
+
+        self.assertEqual([b'a', b'b'], list(result))
+        self.assertEqual(0, metrics.get_stats()['active'])
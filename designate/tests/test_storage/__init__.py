@@ -548,6 +548,27 @@ class StorageTestCase(object):
         # Ensure we can page through the results.
         self._ensure_paging(created, self.storage.find_domains)
 
+    def test_find_domains_summary(self):
+        domain = self.create_domain()
+
+        actual = self.storage.find_domains_summary(self.admin_context)
+        self.assertEqual(1, len(actual))
+
+        self.assertEqual(domain['name'], actual[0]['name'])
+        self.assertEqual(domain['serial'], actual[0]['serial'])
+
+        # Relations are not loaded
+        self.assertFalse(actual[0].obj_attr_is_set('attributes'))
+        self.assertFalse(actual[0].obj_attr_is_set('masters'))
+
+    def test_find_domains_summary_paging(self):
+        # Create 10 Domains
+        created = [self.create_domain(name='example-%d.org.' % i)
+                   for i in range(10)]
+
+        # Ensure we can page through the results.
+        self._ensure_paging(created, self.storage.find_domains_summary)
+
     def test_find_domains_criterion(self):
         domain_one = self.create_domain()
         domain_two = self.create_domain(fixture=1)
@@ -622,6 +643,29 @@ class StorageTestCase(object):
             uuid = 'caf771fc-6b05-4891-bee1-c2a48621f57b'
             self.storage.get_domain(self.admin_context, uuid)
 
+    def test_get_domain_version(self):
+        expected = self.create_domain()
+        actual = self.storage.get_domain_version(
+            self.admin_context, expected['id'])
+
+        self.assertEqual(expected['serial'], actual['serial'])
+        self.assertEqual(expected['version'], actual['version'])
+        self.assertFalse(actual.obj_attr_is_set('email'))
+
+        # Updating the domain changes the version
+        expected.email = 'example@example.org'
+        self.storage.update_domain(self.admin_context, expected)
+
+        updated = self.storage.get_domain_version(
+            self.admin_context, expected['id'])
+
+        self.assertEqual(actual['version'] + 1, updated['version'])
+
+    def test_get_domain_version_missing(self):
+        with testtools.ExpectedException(exceptions.DomainNotFound):
+            uuid = 'caf771fc-6b05-4891-bee1-c2a48621f57b'
+            self.storage.get_domain_version(self.admin_context, uuid)
+
     def test_get_deleted_domain(self):
         context = self.get_admin_context()
         context.show_deleted = True
@@ -807,6 +851,42 @@ class StorageTestCase(object):
             # Attempt to create the second/duplicate recordset
             self.create_recordset(domain)
 
+    def test_create_recordsets(self):
+        domain = self.create_domain()
+
+        recordsets = [objects.RecordSet(
+            id=str(uuid.uuid4()), name='r-%d.%s' % (i, domain['name']),
+            type='A', ttl=None) for i in range(3)]
+
+        self.storage.create_recordsets(
+            self.admin_context, domain['id'], recordsets)
+
+        records = [objects.Record(data='192.0.2.%d' % i, recordset_id=rs.id)
+                   for i, rs in enumerate(recordsets)]
+
+        self.storage.create_records(
+            self.admin_context, domain['id'], records)
+
+        for i, recordset in enumerate(recordsets):
+            result = self.storage.get_recordset(
+                self.admin_context, recordset.id)
+
+            self.assertEqual(recordset.name, result['name'])
+            self.assertEqual(domain['tenant_id'], result['tenant_id'])
+            self.assertEqual(['192.0.2.%d' % i],
+                             [r.data for r in result.records])
+
+    def test_create_records_duplicate(self):
+        domain = self.create_domain()
+        recordset = self.create_recordset(domain)
+
+        records = [objects.Record(data='192.0.2.1', recordset_id=recordset.id)
+                   for i in range(2)]
+
+        with testtools.ExpectedException(exceptions.DuplicateRecord):
+            self.storage.create_records(
+                self.admin_context, domain['id'], records)
+
     def test_create_recordset_with_records(self):
         domain = self.create_domain()
 
@@ -871,6 +951,24 @@ class StorageTestCase(object):
         # Ensure we can page through the results.
         self._ensure_paging(created, self.storage.find_recordsets)
 
+    def test_iter_recordsets_export(self):
+        domain = self.create_domain(name='example.org.')
+
+        for i in range(5):
+            recordset = self.create_recordset(
+                domain, name='r-%d.example.org.' % i)
+            self.create_record(domain, recordset)
+
+        criterion = {'domain_id': domain['id']}
+
+        expected = self.storage.find_recordsets_export(
+            self.admin_context, criterion)
+        actual = self.storage.iter_recordsets_export(
+            self.admin_context, criterion, batch_size=2)
+
+        self.assertEqual(sorted(tuple(row) for row in expected),
+                         sorted(actual))
+
     def test_find_recordsets_criterion(self):
         domain = self.create_domain()
 
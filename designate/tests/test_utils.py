@@ -128,3 +128,14 @@ class TestUtils(TestCase):
     def test_get_paging_params_invalid_sort_key(self):
         with testtools.ExpectedException(exceptions.InvalidSortKey):
             utils.get_paging_params({'sort_key': "dsc"}, ['asc', 'desc'])
+
+    def test_get_accepted_encoding(self):
+        encodings = ['gzip', 'deflate']
+
+        self.assertEqual('gzip', utils.get_accepted_encoding(
+            'deflate, gzip', encodings))
+        self.assertEqual('deflate', utils.get_accepted_encoding(
+            'gzip;q=0, deflate', encodings))
+        self.assertEqual('gzip', utils.get_accepted_encoding('*', encodings))
+        self.assertIsNone(utils.get_accepted_encoding('identity', encodings))
+        self.assertIsNone(utils.get_accepted_encoding(None, encodings))
@@ -13,15 +13,114 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import base64
+import shutil
+import tempfile
+import zlib
+
+import mock
 from oslo_log import log as logging
 
+from designate import objects
+from designate.blob_store import impl_filesystem  # noqa
 from designate.tests import TestCase
 
 LOG = logging.getLogger(__name__)
 
+EXPORT_ID = 'a86dba58-0043-4cc6-a1bb-69d5e86f3ca3'
+
 
 class ZoneManagerServiceTest(TestCase):
     def test_stop(self):
         # Test stopping the service
         service = self.start_service("zone_manager")
         service.stop()
+
+    def _start_with_export_cache(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.config(export_cache_dir=directory, group='service:zone_manager',
+                    export_chunk_size=64)
+
+        return self.start_service('zone_manager')
+
+    def _read_export(self, service, domain, location):
+        chunks = []
+        while True:
+            chunk = base64.b64decode(service.get_zone_export_chunk(
+                self.admin_context, domain.id, location['serial'],
+                sum(len(c) for c in chunks)))
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        return zlib.decompress(
+            b''.join(chunks), 16 + zlib.MAX_WBITS).decode('utf-8')
+
+    def test_export_zone(self):
+        service = self._start_with_export_cache()
+        domain = self.create_domain()
+        self.create_recordset(domain)
+
+        location = service.export_zone(self.admin_context, domain.id)
+
+        domain = self.central_service.get_domain(self.admin_context, domain.id)
+        self.assertEqual(str(domain.serial), location['serial'])
+        self.assertEqual(service._export_zone(self.admin_context, domain.id),
+                         self._read_export(service, domain, location))
+
+    def test_export_zone_cached(self):
+        service = self._start_with_export_cache()
+        domain = self.create_domain()
+
+        with mock.patch.object(
+                service.storage, 'iter_recordsets_export',
+                wraps=service.storage.iter_recordsets_export) as iter_export:
+            service.export_zone(self.admin_context, domain.id)
+            service.export_zone(self.admin_context, domain.id)
+
+        self.assertEqual(1, iter_export.call_count)
+
+    def test_determine_export_method_asynchronous(self):
+        self.config(quota_api_export_size=1)
+        self.config(export_asynchronous=True, group='service:zone_manager')
+        service = self.start_service('zone_manager')
+
+        export = service._determine_export_method(
+            self.admin_context, objects.ZoneExport(id=EXPORT_ID), 2)
+
+        self.assertEqual('ACTIVE', export.status)
+        self.assertEqual('blob://zone_exports/%s' % EXPORT_ID,
+                         export.location)
+
+    def test_determine_export_method_too_large(self):
+        self.config(quota_api_export_size=1)
+        service = self.start_service('zone_manager')
+
+        export = service._determine_export_method(
+            self.admin_context, objects.ZoneExport(id=EXPORT_ID), 2)
+
+        self.assertEqual('ERROR', export.status)
+
+    def test_export_to_blob_store(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        self.config(path=path, group='blob_store:filesystem')
+
+        service = self.start_service('zone_manager')
+        domain = self.create_domain()
+        export = objects.ZoneExport(
+            id=EXPORT_ID, status='ACTIVE',
+            location='blob://zone_exports/%s' % EXPORT_ID)
+
+        with mock.patch.object(service.central_api,
+                               'update_zone_export') as update_zone_export:
+            service._export_to_blob_store(self.admin_context, domain, export)
+
+        self.assertEqual('COMPLETE',
+                         update_zone_export.call_args[0][1].status)
+
+        blob = b''.join(service.blob_store.read(
+            self.admin_context, 'zone_exports/%s' % EXPORT_ID))
+        self.assertEqual(service._export_zone(self.admin_context, domain.id),
+                         blob.decode('utf-8'))
@@ -45,6 +45,7 @@ class DeletedDomainPurgeTest(TaskTest):
             interval=3600,
             time_threshold=604800,
             batch_size=100,
+            time_budget=300,
             group="zone_manager_task:domain_purge"
         )
 
@@ -105,3 +106,46 @@ class DeletedDomainPurgeTest(TaskTest):
         zones = self._fetch_all_domains()
         LOG.info("Number of zones: %d", len(zones))
         self.assertEqual(len(zones), 7)
+        self.assertEqual(11, self.purge_task_fixture.task.last_run['purged'])
+        self.assertEqual(0, self.purge_task_fixture.task.last_run['backlog'])
+
+    def test_purge_zones_in_batches(self):
+        """Purge 11 zones in batches of 2 within a single run
+        """
+        self.config(quota_domains=1000)
+        self.config(batch_size=2, group="zone_manager_task:domain_purge")
+        self._create_deleted_zones()
+
+        self.purge_task_fixture.task()
+
+        zones = self._fetch_all_domains()
+        self.assertEqual(len(zones), 7)
+
+    def test_purge_zones_time_budget(self):
+        """A run stops once the time budget is used up, leaving a backlog
+        """
+        self.config(quota_domains=1000)
+        self.config(batch_size=2, time_budget=0,
+                    group="zone_manager_task:domain_purge")
+        self._create_deleted_zones()
+
+        self.purge_task_fixture.task()
+
+        zones = self._fetch_all_domains()
+        self.assertEqual(len(zones), 16)
+        self.assertEqual(9, self.purge_task_fixture.task.last_run['backlog'])
+
+    def test_purge_zones_removes_records(self):
+        self.config(quota_domains=1000)
+        domain = self.create_domain(name='example.org.')
+        self.create_recordset(domain)
+
+        now = timeutils.utcnow()
+        self._delete_domain(domain, now - datetime.timedelta(days=30))
+
+        self.purge_task_fixture.task()
+
+        query = tables.recordsets.select()
+        recordsets = self.central_service.storage.session.execute(
+            query).fetchall()
+        self.assertEqual(0, len(recordsets))
@@ -1847,6 +1847,7 @@ class CentralZoneExportTests(CentralBasic):
                 task_type='EXPORT',
                 status='PENDING',
                 message=None,
+                location=None,
                 tenant_id='t'
             )
         )
@@ -1865,3 +1866,25 @@ class CentralZoneExportTests(CentralBasic):
         pcheck, ctx, target = \
             designate.central.service.policy.check.call_args[0]
         self.assertEqual(pcheck, 'delete_zone_export')
+
+    def test_delete_zone_export_blob(self):
+        self.context = Mock()
+        self.context.tenant = 't'
+
+        self.service.storage.delete_zone_export = Mock(
+            return_value=RoObject(
+                domain_id='123',
+                task_type='EXPORT',
+                status='COMPLETE',
+                message=None,
+                location='blob://zone_exports/1',
+                tenant_id='t'
+            )
+        )
+        self.service.zone_manager_api.delete_export_blob = Mock()
+
+        self.service.delete_zone_export(self.context, '1')
+
+        delete_export_blob = self.service.zone_manager_api.delete_export_blob
+        delete_export_blob.assert_called_once_with(
+            self.context, 'blob://zone_exports/1')
@@ -14,6 +14,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
 from oslo_log import log as logging
 import oslotest.base
 
@@ -41,3 +43,81 @@ class DesignateAdapterTest(oslotest.base.BaseTestCase):
 
     def test_object_render(self):
         adapters.DesignateAdapter.render('TEST_API', objects.DesignateObject())
+
+
+class FakeRequest(object):
+    def __init__(self, path, GET=None):
+        self.path = path
+        self.GET = GET or {}
+        self.environ = {}
+        self.host_url = 'http://example.com:9001'
+
+
+ZONE_ID = 'a86dba58-0043-4cc6-a1bb-69d5e86f3ca3'
+RECORDSETS_URI = 'http://127.0.0.1:9001/v2/zones/%s/recordsets' % ZONE_ID
+
+
+class APIv2RenderTest(oslotest.base.BaseTestCase):
+    def _recordset(self, id_, name, records):
+        return objects.RecordSet(
+            id=id_, domain_id=ZONE_ID, name=name, type='A', ttl=3600,
+            description=None, status='ACTIVE', action='NONE', version=1,
+            created_at=datetime.datetime(2015, 1, 1, 0, 0),
+            updated_at=None,
+            records=objects.RecordList(objects=[
+                objects.Record(data=data) for data in records]))
+
+    def _expected(self, id_, name, records):
+        return {
+            'id': id_,
+            'zone_id': ZONE_ID,
+            'name': name,
+            'type': 'A',
+            'records': records,
+            'description': None,
+            'ttl': 3600,
+            'status': 'ACTIVE',
+            'action': 'NONE',
+            'version': 1,
+            'created_at': datetime.datetime(2015, 1, 1, 0, 0),
+            'updated_at': None,
+            'links': {'self': '%s/%s' % (RECORDSETS_URI, id_)},
+        }
+
+    def test_render_recordset_list(self):
+        recordsets = objects.RecordSetList(objects=[
+            self._recordset('0f3c5cd6-8b5b-4a6b-a1c6-0b3c5a0d8d01',
+                            'www.example.com.', ['192.0.2.1', '192.0.2.2']),
+            self._recordset('0f3c5cd6-8b5b-4a6b-a1c6-0b3c5a0d8d02',
+                            'mail.example.com.', ['192.0.2.3']),
+        ])
+        request = FakeRequest('/v2/zones/%s/recordsets' % ZONE_ID)
+
+        expected = {
+            'recordsets': [
+                self._expected('0f3c5cd6-8b5b-4a6b-a1c6-0b3c5a0d8d01',
+                               'www.example.com.',
+                               ['192.0.2.1', '192.0.2.2']),
+                self._expected('0f3c5cd6-8b5b-4a6b-a1c6-0b3c5a0d8d02',
+                               'mail.example.com.', ['192.0.2.3']),
+            ],
+            'links': {'self': RECORDSETS_URI},
+            'metadata': {},
+        }
+
+        # Rendering again uses the compiled plans and cached link prefix
+        for _ in range(2):
+            self.assertEqual(expected, adapters.DesignateAdapter.render(
+                'API_v2', recordsets, request=request))
+
+    def test_render_recordset(self):
+        recordset = self._recordset(
+            '0f3c5cd6-8b5b-4a6b-a1c6-0b3c5a0d8d01', 'www.example.com.',
+            ['192.0.2.1'])
+        request = FakeRequest(
+            '/v2/zones/%s/recordsets/%s' % (ZONE_ID, recordset.id))
+
+        self.assertEqual(
+            self._expected(recordset.id, 'www.example.com.', ['192.0.2.1']),
+            adapters.DesignateAdapter.render(
+                'API_v2', recordset, request=request))
@@ -145,7 +145,8 @@ class PeriodicExistsTest(TaskTest):
         opts = {
             "zone_manager_task:periodic_exists": RoObject({
                 "per_page": 100,
-                "interval": 5
+                "interval": 5,
+                "concurrency": 10
             })
         }
         self.setup_opts(opts)
@@ -210,3 +211,15 @@ class PeriodicExistsTest(TaskTest):
             data.update(self.period_data)
             self.mock_notifier.info.assert_called_with(
                 self.ctxt, "dns.domain.exists", data)
+
+        self.assertEqual(10, self.task.last_run['zones'])
+
+    def test_iter_zones_uses_summary(self):
+        storage = mock.Mock()
+        storage.find_domains_summary.return_value = []
+
+        with mock.patch.object(tasks.PeriodicExistsTask, 'storage', storage):
+            self.assertEqual([], list(self.task._iter_zones(self.ctxt)))
+
+        storage.find_domains_summary.assert_called_once_with(
+            self.ctxt, {"shard": "BETWEEN 0,9"}, limit=100)
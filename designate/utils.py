@@ -453,3 +453,33 @@ def get_paging_params(params, sort_keys):
         raise exceptions.InvalidSortKey(msg)
 
     return marker, limit, sort_key, sort_dir
+
+
+def get_accepted_encoding(accept_encoding, encodings):
+    """
+    Pick the first of encodings an Accept-Encoding header allows, or None if
+    it allows none of them.
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for item in accept_encoding.split(','):
+        params = item.split(';')
+        qvalue = 1.0
+
+        for param in params[1:]:
+            name, _sep, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    qvalue = float(value)
+                except ValueError:
+                    qvalue = 0.0
+
+        accepted[params[0].strip().lower()] = qvalue
+
+    for encoding in encodings:
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+
+    return None
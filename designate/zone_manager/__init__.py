@@ -32,6 +32,19 @@ OPTS = [
                help='The storage driver to use'),
     cfg.BoolOpt('export-synchronous', default=True,
                 help='Whether to allow synchronous zone exports'),
+    cfg.BoolOpt('export-asynchronous', default=False,
+                help='Whether to export zones too large to export '
+                     'synchronously in the background, into the blob '
+                     'store'),
+    cfg.StrOpt('export-cache-dir', default='$state_path/zone_exports',
+               help='Directory to keep rendered zone exports in, so they '
+                    'are only rendered once for each serial of a zone'),
+    cfg.IntOpt('export-batch-size', default=1000,
+               help='How many recordsets to read from storage at a time '
+                    'while rendering a zone export'),
+    cfg.IntOpt('export-chunk-size', default=524288,
+               help='How many bytes of a compressed zone export to send in '
+                    'each RPC response'),
 ]
 
 CONF.register_opts(OPTS, group='service:zone_manager')
@@ -33,14 +33,16 @@ class ZoneManagerAPI(object):
     API version history:
 
         1.0 - Initial version
+        1.1 - Add export_zone and get_zone_export_chunk
+        1.2 - Add delete_export_blob
     """
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.2'
 
     def __init__(self, topic=None):
         topic = topic if topic else cfg.CONF.zone_manager_topic
 
         target = messaging.Target(topic=topic, version=self.RPC_API_VERSION)
-        self.client = rpc.get_client(target, version_cap='1.0')
+        self.client = rpc.get_client(target, version_cap='1.2')
 
     @classmethod
     def get_instance(cls):
@@ -56,6 +58,15 @@ class ZoneManagerAPI(object):
             ZONE_MANAGER_API = cls()
         return ZONE_MANAGER_API
 
+    @classmethod
+    def reset_instance(cls):
+        """
+        Drop the shared instance, so the next one is created on the current
+        transport.
+        """
+        global ZONE_MANAGER_API
+        ZONE_MANAGER_API = None
+
     # Zone Export
     def start_zone_export(self, context, domain, export):
         LOG.info(_LI("start_zone_export: "
@@ -70,3 +81,26 @@ class ZoneManagerAPI(object):
 
         return self.client.call(context, 'render_zone',
                                 zone_id=zone_id)
+
+    def delete_export_blob(self, context, location):
+        LOG.info(_LI("delete_export_blob: "
+                     "Calling zone_manager's delete_export_blob."))
+
+        cctxt = self.client.prepare(version='1.2')
+        return cctxt.cast(context, 'delete_export_blob', location=location)
+
+    def export_zone(self, context, zone_id):
+        LOG.info(_LI("export_zone: "
+                     "Calling zone_manager's export_zone."))
+
+        cctxt = self.client.prepare(version='1.1')
+        return cctxt.call(context, 'export_zone', zone_id=zone_id)
+
+    def get_zone_export_chunk(self, context, zone_id, serial, offset, host):
+        LOG.debug("get_zone_export_chunk: "
+                  "Calling zone_manager's get_zone_export_chunk.")
+
+        # The export is only kept by the zone manager that rendered it
+        cctxt = self.client.prepare(server=host, version='1.1')
+        return cctxt.call(context, 'get_zone_export_chunk', zone_id=zone_id,
+                          serial=serial, offset=offset)
@@ -13,13 +13,18 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import base64
+
 from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging as messaging
 
+from designate.i18n import _LE
 from designate.i18n import _LI
+from designate import blob_store
 from designate import coordination
 from designate import exceptions
+from designate import exportcache
 from designate import quota
 from designate import service
 from designate import storage
@@ -36,7 +41,7 @@ NS = 'designate.periodic_tasks'
 
 class Service(service.RPCService, coordination.CoordinationMixin,
               service.Service):
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.2'
 
     target = messaging.Target(version=RPC_API_VERSION)
 
@@ -49,6 +54,9 @@ class Service(service.RPCService, coordination.CoordinationMixin,
         # Get a quota manager instance
         self.quota = quota.get_quota()
 
+        self.export_cache = exportcache.ExportCache(
+            cfg.CONF['service:zone_manager'].export_cache_dir)
+
     @property
     def service_name(self):
         return 'zone_manager'
@@ -57,6 +65,11 @@ class Service(service.RPCService, coordination.CoordinationMixin,
     def central_api(self):
         return rpcapi.CentralAPI.get_instance()
 
+    @property
+    @utils.cache_result
+    def blob_store(self):
+        return blob_store.get_blob_store(cfg.CONF.blob_store_driver)
+
     def start(self):
         super(Service, self).start()
 
@@ -93,44 +106,92 @@ class Service(service.RPCService, coordination.CoordinationMixin,
 
         export = self._determine_export_method(context, export, count)
 
-        self.central_api.update_zone_export(context, export)
+        export = self.central_api.update_zone_export(context, export)
+
+        if export.status == 'ACTIVE':
+            # Large zones are rendered in the background, rather than tying
+            # up the thread handling this message.
+            self.tg.add_thread(self._export_to_blob_store, context, domain,
+                               export)
 
     def render_zone(self, context, zone_id):
         return self._export_zone(context, zone_id)
 
+    def delete_export_blob(self, context, location):
+        self.blob_store.delete(context, self._get_blob_key(location))
+
+    def export_zone(self, context, zone_id):
+        """
+        Render the zone into the export cache, unless the current serial of
+        it is already there, and return where to read it from with
+        get_zone_export_chunk.
+        """
+        domain = self.central_api.get_domain(context, zone_id)
+        serial = str(domain.serial)
+
+        f = self.export_cache.open(zone_id, serial)
+        if f is None:
+            LOG.debug("Rendering export of zone %(zone)s at serial "
+                      "%(serial)s", {'zone': zone_id, 'serial': serial})
+            self.export_cache.store(
+                zone_id, serial, self._render_zone(context, domain))
+        else:
+            f.close()
+
+        return {'host': self._host, 'serial': serial}
+
+    def get_zone_export_chunk(self, context, zone_id, serial, offset):
+        """
+        Read a base64 encoded chunk of a cached, gzip compressed, zone export
+        from offset. An empty chunk marks the end of the export.
+        """
+        f = self.export_cache.open(zone_id, serial)
+        if f is None:
+            raise exceptions.ZoneExportNotFound(
+                'The export of serial %s of the zone is no longer cached' %
+                serial)
+
+        chunk_size = cfg.CONF['service:zone_manager'].export_chunk_size
+        try:
+            f.seek(offset)
+            chunk = f.read(chunk_size)
+        finally:
+            f.close()
+
+        return base64.b64encode(chunk).decode('ascii')
+
     def _determine_export_method(self, context, export, size):
         synchronous = CONF['service:zone_manager'].export_synchronous
+        asynchronous = CONF['service:zone_manager'].export_asynchronous
 
-        # NOTE(timsim):
-        # The logic here with swift will work like this:
-        #     cfg.CONF.export_swift_enabled:
-        #         An export will land in their swift container, even if it's
-        #         small, but the link that comes back will be the synchronous
-        #         link (unless export_syncronous is False, in which case it
-        #         will behave like the next option)
-        #     cfg.CONF.export_swift_preffered:
-        #         The link that the user gets back will always be the swift
-        #         container, and status of the export resource will depend
-        #         on the Swift process.
-        #     If the export is too large for synchronous, or synchronous is not
-        #     enabled and swift is not enabled, it will fall through to ERROR
-        # swift = False
-
+        # NOTE: Zones within the api_export_size quota are rendered whenever
+        #       the export is downloaded. Anything larger is rendered once,
+        #       in the background, into the blob store, with the export
+        #       going from ACTIVE to COMPLETE, or ERROR, as it is.
         if synchronous:
             try:
                 self.quota.limit_check(
                         context, context.tenant, api_export_size=size)
-            except exceptions.OverQuota():
+            except exceptions.OverQuota:
                 LOG.debug('Zone Export too large to perform synchronously')
+            else:
+                export['location'] = \
+                    "designate://v2/zones/tasks/exports/%(eid)s/export" % \
+                    {'eid': export['id']}
+
+                export['status'] = 'COMPLETE'
+                return export
+
+            if not asynchronous:
                 export['status'] = 'ERROR'
                 export['message'] = 'Zone is too large to export'
                 return export
 
-            export['location'] = \
-                "designate://v2/zones/tasks/exports/%(eid)s/export" % \
+        if asynchronous:
+            export['location'] = 'blob://zone_exports/%(eid)s' % \
                 {'eid': export['id']}
 
-            export['status'] = 'COMPLETE'
+            export['status'] = 'ACTIVE'
         else:
             LOG.debug('No method found to export zone')
             export['status'] = 'ERROR'
@@ -138,12 +199,40 @@ class Service(service.RPCService, coordination.CoordinationMixin,
 
         return export
 
+    def _get_blob_key(self, location):
+        return location.split('://', 1)[1]
+
+    def _export_to_blob_store(self, context, domain, export):
+        LOG.info(_LI("Exporting zone %(zone)s to %(location)s"),
+                 {'zone': domain.id, 'location': export.location})
+
+        try:
+            self.blob_store.create(context,
+                                   self._get_blob_key(export.location),
+                                   self._render_zone(context, domain))
+        except Exception:
+            LOG.exception(_LE("Failed to export zone %s"), domain.id)
+            export.status = 'ERROR'
+            export.message = 'Zone export failed'
+        else:
+            export.status = 'COMPLETE'
+
+        self.central_api.update_zone_export(context, export)
+
     def _export_zone(self, context, zone_id):
         domain = self.central_api.get_domain(context, zone_id)
 
-        criterion = {'domain_id': zone_id}
-        recordsets = self.storage.find_recordsets_export(context, criterion)
+        return b''.join(self._render_zone(context, domain)).decode('utf-8')
+
+    def _render_zone(self, context, domain):
+        """
+        Render an export of the zone as it is read from storage, a batch of
+        recordsets at a time, yielding it in UTF-8 encoded pieces.
+        """
+        batch_size = cfg.CONF['service:zone_manager'].export_batch_size
+        recordsets = self.storage.iter_recordsets_export(
+            context, {'domain_id': domain.id}, batch_size)
 
-        return utils.render_template('export-zone.jinja2',
-                                     domain=domain,
-                                     recordsets=recordsets)
+        template = utils.load_template('export-zone.jinja2')
+        for text in template.generate(domain=domain, recordsets=recordsets):
+            yield text.encode('utf-8')
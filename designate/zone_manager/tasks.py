@@ -14,10 +14,15 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import datetime
+import time
+
+import eventlet
 
 from designate import context
 from designate import plugin
 from designate import rpc
+from designate import storage
+from designate import utils
 from designate.central import rpcapi
 from designate.i18n import _LI
 
@@ -55,6 +60,12 @@ class PeriodicTask(plugin.ExtensionPlugin):
     def central_api(self):
         return rpcapi.CentralAPI.get_instance()
 
+    @property
+    @utils.cache_result
+    def storage(self):
+        storage_driver = cfg.CONF['service:zone_manager'].storage_driver
+        return storage.get_storage(storage_driver)
+
     def on_partition_change(self, my_partitions, members, event):
         """Refresh partitions attribute
         """
@@ -98,10 +109,19 @@ class PeriodicExistsTask(PeriodicTask):
         super(PeriodicExistsTask, self).__init__()
         self.notifier = rpc.get_notifier('zone_manager')
 
+        # Statistics for the most recent run
+        self.last_run = {}
+
     @classmethod
     def get_cfg_opts(cls):
         group = cfg.OptGroup(cls.get_canonical_name())
-        options = cls.get_base_opts()
+        options = cls.get_base_opts() + [
+            cfg.IntOpt(
+                'concurrency',
+                default=10,
+                help='Maximum number of exists events being emitted at once'
+            ),
+        ]
         return [(group, options)]
 
     @staticmethod
@@ -110,6 +130,18 @@ class PeriodicExistsTask(PeriodicTask):
         end = timeutils.utcnow()
         return end - interval, end
 
+    def _iter_zones(self, ctxt, criterion=None):
+        # The exists events only need the zone itself, so skip the RPC round
+        # trip to central and the per zone attributes and masters queries.
+        criterion = criterion or {}
+        criterion.update(self._filter_between('shard'))
+        return self._iter(self.storage.find_domains_summary, ctxt, criterion)
+
+    def _emit(self, ctxt, zone, data):
+        zone_data = dict(zone)
+        zone_data.update(data)
+        self.notifier.info(ctxt, 'dns.domain.exists', zone_data)
+
     def __call__(self):
         pstart, pend = self._my_range()
         msg = _LI("Emitting zone exist events for %(start)s to %(end)s")
@@ -125,12 +157,33 @@ class PeriodicExistsTask(PeriodicTask):
             "audit_period_ending": str(end)
         }
 
+        started = time.time()
+        count = 0
+
+        pool = eventlet.GreenPool(self.options.concurrency)
+
         for zone in self._iter_zones(ctxt):
-            zone_data = dict(zone)
-            zone_data.update(data)
-            self.notifier.info(ctxt, 'dns.domain.exists', zone_data)
+            # spawn_n blocks once the pool is full, bounding the number of
+            # events in flight.
+            pool.spawn_n(self._emit, ctxt, zone, data)
+            count += 1
+
+            # Drain the pool between pages, so a slow broker can't let the
+            # zones pile up in memory.
+            if count % self.options.per_page == 0:
+                pool.waitall()
+
+        pool.waitall()
+
+        duration = time.time() - started
+        self.last_run = {
+            'zones': count,
+            'duration': duration,
+            'rate': count / duration if duration else float(count),
+        }
 
-        LOG.info(_LI("Finished emitting events."))
+        LOG.info(_LI("Finished emitting %(zones)d events in %(duration).2f "
+                     "seconds (%(rate).2f events/s)."), self.last_run)
 
 
 class DeletedDomainPurgeTask(PeriodicTask):
@@ -145,6 +198,9 @@ class DeletedDomainPurgeTask(PeriodicTask):
     def __init__(self):
         super(DeletedDomainPurgeTask, self).__init__()
 
+        # Statistics for the most recent run
+        self.last_run = {}
+
     @classmethod
     def get_cfg_opts(cls):
         group = cfg.OptGroup(cls.get_canonical_name())
@@ -158,14 +214,21 @@ class DeletedDomainPurgeTask(PeriodicTask):
             cfg.IntOpt(
                 'batch_size',
                 default=100,
-                help='How many domains to be purged on each run'
+                help='How many domains to be purged in each batch'
+            ),
+            cfg.IntOpt(
+                'time_budget',
+                default=300,
+                help='How long a run may keep purging batches of domains, in '
+                'seconds'
             ),
         ]
         return [(group, options)]
 
     def __call__(self):
         """Call the Central API to perform a purge of deleted zones based on
-        expiration time and sharding range.
+        expiration time and sharding range. Batches are purged until the
+        backlog is empty or the time budget is used up.
         """
         pstart, pend = self._my_range()
         msg = _LI("Performing deleted domain purging for %(start)s to %(end)s")
@@ -181,9 +244,38 @@ class DeletedDomainPurgeTask(PeriodicTask):
 
         ctxt = context.DesignateContext.get_admin_context()
         ctxt.all_tenants = True
+        ctxt.show_deleted = True
+
+        started = time.time()
+        purged = 0
+
+        while True:
+            count = self.central_api.purge_domains(
+                ctxt,
+                criterion=criterion,
+                limit=self.options.batch_size,
+            )
+            purged += count or 0
+
+            # A short batch means there's nothing left to purge
+            if not count or count < self.options.batch_size:
+                break
+
+            if time.time() - started >= self.options.time_budget:
+                LOG.info(_LI("Domain purge time budget of %d seconds used "
+                             "up"), self.options.time_budget)
+                break
+
+        duration = time.time() - started
+        backlog = self.central_api.count_domains(ctxt, criterion)
+
+        self.last_run = {
+            'purged': purged,
+            'backlog': backlog,
+            'duration': duration,
+            'rate': purged / duration if duration else float(purged),
+        }
 
-        self.central_api.purge_domains(
-            ctxt,
-            criterion=criterion,
-            limit=self.options.batch_size,
-        )
+        LOG.info(_LI("Purged %(purged)d deleted domains in %(duration).2f "
+                     "seconds (%(rate).2f domains/s), %(backlog)d remaining"),
+                 self.last_run)